@@ -0,0 +1,53 @@
+"""
+Bulk value generation with the plantangenet factories.
+
+    python benchmarks/factory_generation.py [n ...]
+
+Uses the references from examples/tictactoe/factories.yaml with their
+shell variables unset, so every value is generated. "per-call" calls
+generate() once per value; "generate_many" produces the whole column in
+one call. FreshId is timed both with ULIDs and in sample mode.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plantangenet.factories import ArgumentValueFactory, FreshIdFactory, RandomSlugFactory  # noqa: E402
+
+REFERENCES = {
+    "RandomSlug": (RandomSlugFactory(), {"session_name": {"chunks": 2, "shellVar": "TICTACTOE_SESSION_NAME"}}),
+    "ArgumentValue": (ArgumentValueFactory(), {
+        "concurrent_games": {"default": 100, "shellVar": "TICTACTOE_CONCURRENT_GAMES"},
+        "concurrent_players": {"default": 1800, "shellVar": "TICTACTOE_CONCURRENT_PLAYERS"},
+        "token": {"shellVar": "TICTACTOE_TOKEN"},
+    }),
+    "FreshId": (FreshIdFactory(), {"session_id": {"prefix": "SES-", "shellVar": "TICTACTOE_SESSION_ID"}}),
+}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(*sizes):
+    for name in ("TICTACTOE_SESSION_NAME", "TICTACTOE_CONCURRENT_GAMES", "TICTACTOE_CONCURRENT_PLAYERS",
+                 "TICTACTOE_TOKEN", "TICTACTOE_SESSION_ID"):
+        os.environ.pop(name, None)
+    for n in sizes or (1_800, 100_000):
+        print(f"n = {n}")
+        for kind, (factory, references) in REFERENCES.items():
+            for sample in (False, True) if kind != "RandomSlug" else (False,):
+                per_call = timed(lambda: [factory.generate(references, sample) for _ in range(n)])
+                bulk = timed(lambda: factory.generate_many(references, n, sample))
+                label = f"{kind}{' (sample)' if sample else ''}"
+                print(f"  {label:<24} per-call {n / per_call:>10.0f}/s  generate_many {n / bulk:>11.0f}/s"
+                      f"  {per_call / bulk:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""
+Membership churn and has_role() checks for a session with 1800 players.
+
+    python benchmarks/membership_churn.py [operations]
+
+Players hold a per-game role nested in "player", which is nested in
+"participant", so every check goes through two levels of nesting. The churn
+mix is players leaving and rejoining and games being reassigned, with ten
+has_role() checks per change. "rebuild" is the same workload recomputing
+every identity's closure after each change, for comparison.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plantangenet.policy import Identity, MembershipGraph  # noqa: E402
+
+PLAYERS = 1800
+GAMES = PLAYERS // 2
+
+
+def build():
+    graph = MembershipGraph()
+    graph.add_parent("player", "participant")
+    for g in range(GAMES):
+        graph.add_parent(f"game-{g}", "player")
+    players = [Identity(f"player-{i}", roles=[f"game-{i // 2}"]) for i in range(PLAYERS)]
+    for player in players:
+        graph.add_identity(player)
+    return graph, players
+
+
+def churn(graph, players, operations, after_change=None, seed=1):
+    rng = random.Random(seed)
+    checks = 0
+    for _ in range(operations):
+        player = players[rng.randrange(PLAYERS)]
+        if player._membership is None:
+            graph.add_identity(player)
+        elif rng.random() < 0.3:
+            graph.remove_identity(player)
+        else:
+            game = player.roles[0]
+            player.remove_role(game)
+            player.add_role(f"game-{rng.randrange(GAMES)}")
+        if after_change:
+            after_change()
+        for _ in range(10):
+            checks += players[rng.randrange(PLAYERS)].has_role("participant")
+    return checks
+
+
+def timed(label, operations, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {operations / elapsed:>10.0f} changes/s  {operations * 10 / elapsed:>10.0f} checks/s")
+
+
+def main(operations=100_000):
+    print(f"{PLAYERS} players, {GAMES} nested game roles")
+    graph, players = build()
+    timed("bitsets", operations, lambda: churn(graph, players, operations))
+
+    graph, players = build()
+
+    def rebuild():
+        for index, direct in enumerate(graph._direct):
+            graph._set_effective(index, graph._closure(direct))
+    rebuild_ops = max(operations // 100, 1)
+    timed("rebuild", rebuild_ops, lambda: churn(graph, players, rebuild_ops, after_change=rebuild))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
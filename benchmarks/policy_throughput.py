@@ -0,0 +1,81 @@
+"""
+Authorization checks per second for a tictactoe session with 1800 players.
+
+    python benchmarks/policy_throughput.py [checks]
+
+Loads the example statements, gives every player the owner role for their
+own game and replays a mix of play/create/delete/access checks against 900
+games; the second scenario adds a 40-game deny blocklist to
+tictactoe.play. "compiled" evaluates every check against the action index,
+"cached" puts every action behind the decision LRU, and "default" caches
+only actions with enough predicates to be worth it. tictactoe.update runs
+a scriptMatch condition, so it is reported separately and never cached.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from plantangenet.policy import Identity, PolicyEngine, Statement  # noqa: E402
+
+PLAYERS = 1800
+GAMES = PLAYERS // 2
+ACTIONS = ("tictactoe.play", "tictactoe.play", "tictactoe.play", "tictactoe.create",
+           "tictactoe.delete", "tictactoe.access")
+
+
+def load_statements():
+    with open(ROOT / "examples" / "tictactoe" / "statements.yaml") as f:
+        return [Statement.from_resource(doc) for doc in yaml.safe_load_all(f) if doc]
+
+
+def blocklist(count=40):
+    return [Statement(f"deny-blocked-{g}", action="tictactoe.play", effect="deny",
+                      condition=[{"valueMatch": {"key": "target.game", "operator": "equals",
+                                                 "value": f"game-{g}"}}])
+            for g in range(0, GAMES, GAMES // count)][:count]
+
+
+def workload(count, actions, seed=1):
+    rng = random.Random(seed)
+    players = [Identity(f"player-{i}", name=f"player-{i}", roles=["player", "owner"]) for i in range(PLAYERS)]
+    games = [{"game": f"game-{g}", "status": ("active", "inactive")[g % 2]} for g in range(GAMES)]
+    checks = []
+    for _ in range(count):
+        i = rng.randrange(PLAYERS)
+        game = games[i // 2] if rng.random() < 0.8 else games[rng.randrange(GAMES)]
+        context = {"target": game, "self": {"resource": games[i // 2]["game"]}}
+        checks.append((players[i], rng.choice(actions), context))
+    return checks
+
+
+def run(label, engine, checks):
+    start = time.perf_counter()
+    allowed = 0
+    for identity, action, context in checks:
+        if engine.is_allowed(identity, action, context):
+            allowed += 1
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {len(checks) / elapsed:>10.0f} checks/s  "
+          f"allowed {allowed / len(checks):.0%}  cache hits {engine.hits}")
+
+
+def main(count=500_000):
+    checks = workload(count, ACTIONS)
+    for label, statements in (("example", load_statements()), ("blocklist", load_statements() + blocklist())):
+        print(f"{label}: {len(statements)} statements, {PLAYERS} players, {count} checks")
+        run("compiled", PolicyEngine(statements, cache_size=0), checks)
+        run("cached", PolicyEngine(statements), checks)
+        run("min 8", PolicyEngine(statements, cache_min_predicates=8), checks)
+    print(f"scriptMatch: tictactoe.update, {count // 10} checks")
+    run("compiled", PolicyEngine(load_statements(), allow_scripts=True),
+        workload(count // 10, ("tictactoe.update",)))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
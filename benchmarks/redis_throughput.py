@@ -0,0 +1,121 @@
+"""
+Throughput of RedisConnector access patterns for plan state and render caches.
+
+    python benchmarks/redis_throughput.py [count] [--url redis://localhost:6379/15]
+
+Without --url the in-process FakeRedisServer is used, which measures the
+client and protocol overhead; against a real server round trips dominate
+and the gap between the rows widens with network latency. Keys are
+written under a random ``bench:<run>:`` prefix and only those keys are
+deleted afterwards, so the rest of the database is left alone. "single" issues one command per key,
+"pipelined" sends them in batches in one write, "mset/mget" uses the bulk
+commands, and "cached get" repeats reads of hot keys with client-side
+caching enabled.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plantangenet.storage import FakeRedisServer, RedisConnector  # noqa: E402
+
+BATCH = 1000
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {elapsed:>7.3f}s  {count / elapsed:>10.0f} ops/s")
+
+
+def delete_keys(redis, keys):
+    for start in range(0, len(keys), BATCH):
+        redis.delete(*keys[start:start + BATCH])
+
+
+def run(connect, count):
+    prefix = f"bench:{os.urandom(4).hex()}:"
+    keys = [f"{prefix}{i}" for i in range(count)]
+    value = b"x" * 256
+
+    with connect() as redis:
+
+        def single_set():
+            for key in keys:
+                redis.set(key, value)
+
+        def single_get():
+            for key in keys:
+                redis.get(key)
+
+        def pipelined_set():
+            for start in range(0, count, BATCH):
+                with redis.pipeline() as pipe:
+                    for key in keys[start:start + BATCH]:
+                        pipe.set(key, value)
+                    pipe.execute()
+
+        def pipelined_get():
+            for start in range(0, count, BATCH):
+                with redis.pipeline() as pipe:
+                    for key in keys[start:start + BATCH]:
+                        pipe.get(key)
+                    pipe.execute()
+
+        def bulk_set():
+            for start in range(0, count, BATCH):
+                redis.mset({key: value for key in keys[start:start + BATCH]})
+
+        def bulk_get():
+            for start in range(0, count, BATCH):
+                redis.mget(keys[start:start + BATCH])
+
+        try:
+            timed("single set", count, single_set)
+            timed("single get", count, single_get)
+            timed("pipelined set", count, pipelined_set)
+            timed("pipelined get", count, pipelined_get)
+            timed("mset", count, bulk_set)
+            timed("mget", count, bulk_get)
+        finally:
+            delete_keys(redis, keys)
+
+    hot = keys[:100]
+    with connect(client_cache=True) as redis:
+        def cached_get():
+            for i in range(count):
+                redis.get(hot[i % len(hot)])
+
+        try:
+            redis.mset({key: value for key in hot})
+            timed("cached get", count, cached_get)
+        finally:
+            delete_keys(redis, hot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("count", nargs="?", type=int, default=20_000)
+    parser.add_argument("--url", help="Redis server to use instead of the in-process fake; only the "
+                                      "benchmark's own keys are written and deleted")
+    args = parser.parse_args()
+
+    server = None if args.url else FakeRedisServer()
+
+    def connect(**kwargs):
+        if server is not None:
+            return RedisConnector(connection_factory=server.connect, **kwargs)
+        return RedisConnector(url=args.url, **kwargs)
+
+    print(f"{args.count} keys against {args.url or 'FakeRedisServer'}")
+    run(connect, args.count)
+    if server is not None:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Memory held by 100k plan resources, before and after the compact model.
+
+    python benchmarks/resource_memory.py [count]
+
+"dict-backed" replays the previous PhaseResource (instance __dict__, full
+spec decoded, label strings not shared); "slots" is the current class built
+from decoded specs; "slots, lazy" is what the state store hands out, where
+specs stay encoded until read.
+"""
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from janet.phase_resource import PhaseResource  # noqa: E402
+
+
+class DictPhaseResource:
+    def __init__(self, spec):
+        self.kind = spec.get("kind", "Phase")
+        self.id = spec.get("id") or spec.get("name")
+        self.spec = spec
+        self.phase = spec.get("phase")
+        self.name = spec.get("name")
+        self.metadata = spec.get("metadata", {})
+
+
+def bodies(count):
+    for i in range(count):
+        yield json.dumps({
+            "kind": "Squad",
+            "name": f"squad-{i}",
+            "phase": "setup",
+            "metadata": {"labels": {"session": "tictactoe", "squad": ("arena", "player", "referee")[i % 3],
+                                    "tier": "gold"}},
+            "spec": {"maxMembers": 2, "className": "TicTacToePlayer"},
+        })
+
+
+def measure(label, build, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # Bodies are produced inside the window so a lazy resource pays for the one it keeps
+    resources = [build(body) for body in bodies(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{label:<14} {size / 2 ** 20:>8.1f} MiB  {size / count:>7.0f} B/resource")
+    del resources
+    return size
+
+
+def main(count=100_000):
+    print(f"{count} resources")
+    baseline = measure("dict-backed", lambda body: DictPhaseResource(json.loads(body)), count)
+    slots = measure("slots", lambda body: PhaseResource(json.loads(body)), count)
+    lazy = measure("slots, lazy", lambda body: PhaseResource.from_json("Squad", None, body, "0" * 32), count)
+    print(f"reduction: {1 - slots / baseline:.0%} eager, {1 - lazy / baseline:.0%} lazy")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,73 @@
+"""
+Assigning players to squads at the tictactoe example's scale and beyond.
+
+    python benchmarks/squad_assignment.py
+
+Each scenario builds ``games`` player squads selected by the session's
+players selector (plus as many arena and referee squads, which the selector
+must skip), then times assigning every player with assign_members(), the
+same with one add_member() call per player, has_member() checks, and
+removing half the players with remove_members().
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plantangenet.policy import Identity  # noqa: E402
+from plantangenet.session import Session, Squad  # noqa: E402
+
+# concurrent_players / concurrent_games from examples/tictactoe/factories.yaml, then larger
+SCALES = ((1_800, 100), (100_000, 5_000), (1_000_000, 20_000))
+
+
+def squads(games, players):
+    capacity = -(-players // games)
+    built = []
+    for kind in ("player", "arena", "referee"):
+        for g in range(games):
+            labels = {"session": "ttt", "squad": kind}
+            built.append(Squad(f"{kind}-{g}", name=f"{kind}-{g}", max_members=capacity,
+                               metadata={"labels": labels}))
+    return built
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<16} {elapsed * 1000:>9.1f} ms  {count / elapsed:>12.0f} players/s")
+
+
+def main():
+    session = Session("ttt", "ttt", None, None, {"labels": {"session": "ttt"}},
+                      {"players": {"selector": {"matchLabels": {"session": "ttt", "squad": "player"}}}})
+    for players, games in SCALES:
+        print(f"{players} players, {games} games")
+        members = [Identity(f"player-{i}") for i in range(players)]
+
+        targets = squads(games, players)
+        timed("assign", players, lambda: session.assign("players", members, targets))
+
+        targets = session.select_squads("players", squads(games, players))
+
+        def one_by_one():
+            squad = 0
+            for member in members:
+                while targets[squad].is_full():
+                    squad += 1
+                targets[squad].add_member(member)
+        timed("add_member loop", players, one_by_one)
+
+        timed("has_member", players, lambda: [t.has_member(m) for t, m in zip(targets * (players // games), members)])
+
+        def remove_half():
+            per_squad = -(-players // games)
+            for g, squad in enumerate(targets):
+                squad.remove_members(members[g * per_squad:g * per_squad + per_squad // 2])
+        timed("remove_members", players // 2, remove_half)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .helpers import atomic_write_bytes
+
+
+# Per-worker JanetCLI, built once by the pool initializer so imports,
+# Meatball start-up and argument handling are paid once per process
+_worker_cli = None
+
+
+def expand_plan_dirs(patterns, plan_file="plan.yaml"):
+    """
+    Expand directory names and glob patterns into plan directories.
+
+    Returns:
+        list: Sorted, de-duplicated directories that contain ``plan_file``
+    """
+    plan_dirs = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if os.path.isfile(os.path.join(match, plan_file)):
+                plan_dirs.add(os.path.normpath(match))
+    return sorted(plan_dirs)
+
+
+def output_name(plan_dir, output_format):
+    """Derive a flat, unique output file name from a plan directory path."""
+    relative = os.path.relpath(os.path.abspath(plan_dir))
+    if relative.startswith(os.pardir):
+        relative = os.path.abspath(plan_dir).lstrip(os.sep)
+    stem = relative.replace(os.sep, "__") if relative != os.curdir else "plan"
+    extension = output_format if output_format in ("yaml", "ndjson") else "json"
+    return f"{stem}.{extension}"
+
+
+def output_names(plan_dirs, output_format):
+    """
+    Map each plan directory to its output file name.
+
+    Raises:
+        ValueError: If two directories flatten to the same name (e.g. ``a/b``
+            and ``a__b``), or to names differing only in case, so one render
+            would overwrite another
+    """
+    names = {}
+    seen = {}
+    for plan_dir in plan_dirs:
+        name = output_name(plan_dir, output_format)
+        other = seen.setdefault(name.casefold(), plan_dir)
+        if other != plan_dir:
+            raise ValueError(f"Plan directories {other} and {plan_dir} would both be rendered to {name}")
+        names[plan_dir] = name
+    return names
+
+
+def _init_worker(args):
+    global _worker_cli
+    from .cli import JanetCLI, preload_command
+    preload_command("render")
+    _worker_cli = JanetCLI(args)
+
+
+def _render_one(plan_dir, output_path):
+    cli = _worker_cli
+    started = time.perf_counter()
+    output_format = cli.args.get("format", "json")
+    try:
+        plan_path = os.path.join(plan_dir, cli.args.get("file") or "plan.yaml")
+        rendered_plan = cli.render_plan_file(plan_path)
+        atomic_write_bytes(output_path, cli.format_rendered_plan(rendered_plan, output_format))
+    except Exception as e:
+        return plan_dir, False, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+    return plan_dir, True, time.perf_counter() - started, output_path
+
+
+def render_batch(plan_dirs, output_dir, args, jobs=None):
+    """
+    Render many plan directories across a process pool.
+
+    Args:
+        plan_dirs (list): Plan directories to render
+        output_dir (str): Directory receiving one output file per plan
+        args (dict): CLI arguments shared by every render
+        jobs (Optional[int]): Worker processes (default: CPU count)
+
+    Returns:
+        list: ``(plan_dir, success, seconds, output_path_or_error)`` tuples in input order
+
+    Raises:
+        ValueError: If two plan directories would write the same output file
+    """
+    names = output_names(plan_dirs, args.get("format", "json"))
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(plan_dirs) or 1))
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(args,)) as pool:
+        futures = {pool.submit(_render_one, plan_dir, os.path.join(output_dir, names[plan_dir])): plan_dir
+                   for plan_dir in plan_dirs}
+        for future in as_completed(futures):
+            plan_dir = futures[future]
+            try:
+                results[plan_dir] = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool)
+                results[plan_dir] = (plan_dir, False, 0.0, f"{type(e).__name__}: {e}")
+    return [results[plan_dir] for plan_dir in plan_dirs]
@@ -2,19 +2,44 @@ import argparse
 import json
 import os
 import sys
-import yaml
-import requests
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
-from jsonschema import validate, ValidationError
-from meatball import preprocess_yaml_string
 
-from .plan_transformer import PlanTransformer
 from .plan_renderer import PlanRenderer
-from .phase_executor import PhaseExecutor
-from .phase_resource import PhaseResource
+from .profiling import span
 from .version import __version__
 
+# Heavy dependencies (yaml, requests, jsonschema, meatball, ...) are imported
+# inside the commands that use them, so `janet --help` and local commands
+# never pay for them. COMMAND_IMPORTS lists what each command pulls in on
+# first use; --startup-profile and batch workers use it to warm up.
+COMMAND_IMPORTS = {
+    "render": ["yaml", "meatball", "orjson", "janet.plan_loader", "janet.render_cache", "janet.helpers", "janet.serializers"],
+    "validate": ["yaml", "meatball", "janet.plan_loader", "janet.schema_registry"],
+    "submit": ["yaml", "meatball", "orjson", "requests", "janet.plan_loader", "janet.render_cache",
+               "janet.serializers", "janet.transport", "janet.fanout"],
+    "cache": ["janet.render_cache"],
+    "status": ["requests", "janet.status", "plantangenet.messaging"],
+}
+
+
+def preload_command(command):
+    """Import everything a command needs ahead of first use.
+
+    Returns:
+        list: Modules that could not be imported
+    """
+    import importlib
+
+    missing = []
+    for module in COMMAND_IMPORTS.get(command, []):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            missing.append(module)
+    return missing
+
 
 class JanetCLI:
     """Main Janet CLI class for plan operations."""
@@ -26,14 +51,40 @@ class JanetCLI:
             args (Optional[Dict[str, Any]]): Command-line arguments as a dictionary.
         """
         self.args = args or {}
+        # Opened on first use and shared by every render in this run
+        self._render_cache = None
+        self._render_cache_opened = False
         self.parser = argparse.ArgumentParser(
             description="Janet CLI for plan operations"
         )
+        self.parser.add_argument(
+            "--startup-profile", action="store_true",
+            help="Measure cold-start time of each command in fresh interpreters and exit"
+        )
+        self.parser.add_argument(
+            "--startup-repeat", type=int, default=5,
+            help="Interpreter launches per command for --startup-profile (default: 5)"
+        )
+        self.parser.add_argument(
+            "--startup-budget", type=float, default=None,
+            help="Exit non-zero if a command's median cold start exceeds this many ms"
+        )
         self.subparsers = self.parser.add_subparsers(dest="command")
 
+        # Options every command accepts
+        profile_options = argparse.ArgumentParser(add_help=False)
+        profile_options.add_argument(
+            "--profile", action="store_true",
+            help="Time each stage and its peak memory, write a Chrome trace and print a one-line summary"
+        )
+        profile_options.add_argument(
+            "--profile-output", type=str, default="janet-profile.json",
+            help="Trace file written by --profile (default: janet-profile.json)"
+        )
+
         # Define the 'render' command
         render_parser = self.subparsers.add_parser(
-            "render", help="Render a plan")
+            "render", help="Render a plan", parents=[profile_options])
         render_parser.add_argument(
             "-d", "--directory", type=str, default=None, help="Directory containing the plan file (default: current directory)"
         )
@@ -44,13 +95,47 @@ class JanetCLI:
             "--output", type=str, help="The output file for the rendered plan"
         )
         render_parser.add_argument(
-            "--format", type=str, choices=["json", "yaml"], default="json", 
-            help="Output format (default: json for PMP compatibility)"
+            "--format", type=str, choices=["json", "canonical", "yaml", "ndjson"], default="json",
+            help="Output format: json (default, for PMP compatibility), canonical "
+                 "(sorted keys, no whitespace, byte-stable), yaml or ndjson "
+                 "(one document per line, streamed as it renders)"
+        )
+        render_parser.add_argument(
+            "--compact", action="store_true",
+            help="Omit indentation and line breaks from json/yaml output"
+        )
+        render_parser.add_argument(
+            "--resources", action="store_true",
+            help="Stream the other YAML files in the plan directory as selectable resources"
+        )
+        render_parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Always re-expand and re-render instead of using the render cache"
+        )
+        render_parser.add_argument(
+            "--watch", action="store_true",
+            help="Keep running and re-render --output whenever plan files change"
+        )
+        render_parser.add_argument(
+            "--waves", action="store_true",
+            help="Print the phase dependency levels (phases that can run in parallel) instead of rendering"
+        )
+        render_parser.add_argument(
+            "plan_dirs", nargs="*", metavar="DIR",
+            help="Plan directories or glob patterns to render in one batch (requires --output-dir)"
+        )
+        render_parser.add_argument(
+            "--output-dir", type=str, default=None,
+            help="Directory receiving one rendered file per plan in batch mode"
+        )
+        render_parser.add_argument(
+            "-j", "--jobs", type=int, default=None,
+            help="Worker processes for batch rendering (default: CPU count)"
         )
 
         # Define the 'submit' command
         submit_parser = self.subparsers.add_parser(
-            "submit", help="Submit a rendered plan to a PMP server"
+            "submit", help="Submit a rendered plan to a PMP server", parents=[profile_options]
         )
         submit_parser.add_argument(
             "-d", "--directory", type=str, default=None, help="Directory containing the plan file (default: current directory)"
@@ -59,17 +144,49 @@ class JanetCLI:
             "-f", "--file", type=str, default=None, help="Plan file name (default: plan.yaml) or rendered JSON file"
         )
         submit_parser.add_argument(
-            "--endpoint", type=str, default="http://localhost:3030", 
-            help="PMP server endpoint (default: http://localhost:3030)"
+            "--endpoint", type=str, action="append", default=None,
+            help="PMP server endpoint; repeat to submit to several (default: http://localhost:3030)"
+        )
+        submit_parser.add_argument(
+            "--endpoints-file", type=str, default=None,
+            help="File listing PMP server endpoints, one per line"
+        )
+        submit_parser.add_argument(
+            "--concurrency", type=int, default=8,
+            help="Maximum concurrent submissions when fanning out (default: 8)"
         )
         submit_parser.add_argument(
             "--dry-run", action="store_true", 
             help="Perform a dry run submission"
         )
+        submit_parser.add_argument(
+            "--resources", action="store_true",
+            help="Stream the other YAML files in the plan directory as selectable resources"
+        )
+        submit_parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Always re-expand and re-render instead of using the render cache"
+        )
+        submit_parser.add_argument(
+            "--connect-timeout", type=float, default=5.0,
+            help="Seconds to wait for a connection (default: 5)"
+        )
+        submit_parser.add_argument(
+            "--read-timeout", type=float, default=30.0,
+            help="Seconds to wait for the server's response (default: 30)"
+        )
+        submit_parser.add_argument(
+            "--retries", type=int, default=3,
+            help="Retries for connection errors, timeouts and 409/429/502/503/504 (default: 3)"
+        )
+        submit_parser.add_argument(
+            "--no-gzip", action="store_true",
+            help="Never gzip the request body (by default bodies of 16 KiB or more are gzipped)"
+        )
 
         # Define the 'validate' command
         validate_parser = self.subparsers.add_parser(
-            "validate", help="Validate a plan against the schema"
+            "validate", help="Validate a plan against the schema", parents=[profile_options]
         )
         validate_parser.add_argument(
             "-d", "--directory", type=str, default=None, help="Directory containing the plan file (default: current directory)"
@@ -77,7 +194,52 @@ class JanetCLI:
         validate_parser.add_argument(
             "-f", "--file", type=str, default=None, help="Plan file name (default: plan.yaml)"
         )
+        validate_parser.add_argument(
+            "--resources", action="store_true",
+            help="Also validate the other YAML files in the plan directory by apiVersion/kind"
+        )
+
+        # Define the 'status' command
+        status_parser = self.subparsers.add_parser(
+            "status", help="Show phase status of a running plan", parents=[profile_options]
+        )
+        status_parser.add_argument(
+            "--endpoint", type=str, default="http://localhost:3030",
+            help="PMP server to poll for GET /status (default: http://localhost:3030)"
+        )
+        status_parser.add_argument(
+            "--nats", type=str, default=None,
+            help="NATS server URL; follow plan.session.<id>.state/events instead of polling HTTP"
+        )
+        status_parser.add_argument(
+            "--session", type=str, default=None,
+            help="Session id (required with --nats)"
+        )
+        status_parser.add_argument(
+            "--follow", action="store_true",
+            help="Keep running and redraw the table as phases change"
+        )
+        status_parser.add_argument(
+            "--interval", type=float, default=2.0,
+            help="Seconds between HTTP polls when following (default: 2)"
+        )
+        status_parser.add_argument(
+            "--max-rate", type=float, default=4.0,
+            help="Maximum redraws per second when following (default: 4)"
+        )
+        status_parser.add_argument(
+            "--rows", type=int, default=20,
+            help="Most recently changed phases to list (default: 20)"
+        )
 
+        # Define the 'cache' command
+        cache_parser = self.subparsers.add_parser(
+            "cache", help="Inspect or clear the render cache", parents=[profile_options]
+        )
+        cache_parser.add_argument(
+            "action", choices=["stats", "clear"],
+            help="Show cache statistics or remove every cached render"
+        )
 
     def resolve_plan_path(self):
         """Resolve the plan file path based on CLI options (-d, -f).
@@ -103,95 +265,561 @@ class JanetCLI:
         args = self.parser.parse_args()
         self.args = vars(args)  # Convert Namespace to dictionary
 
-        command = args.command
+        if args.startup_profile:
+            from .startup_profile import run_startup_profile
+            return run_startup_profile(
+                list(COMMAND_IMPORTS), args.startup_repeat, args.startup_budget)
+
+        try:
+            if args.command and args.profile:
+                return self.run_profiled(args.command)
+            return self.dispatch(args.command)
+        finally:
+            self.close_render_cache()
+
+    def dispatch(self, command):
+        """Run one command.
+
+        Args:
+            command (Optional[str]): The subcommand name; help is printed if None
+
+        Returns:
+            Optional[int]: The command's exit code, if it returns one
+        """
         if command == "render":
             self.render_plan()
         elif command == "validate":
             self.validate_plan()
         elif command == "submit":
-            self.submit_plan()
+            return self.submit_plan()
+        elif command == "status":
+            return self.status_command()
+        elif command == "cache":
+            self.cache_command()
         else:
             self.parser.print_help()
 
+    def run_profiled(self, command):
+        """Run a command under the profiler, then write the trace and print a summary.
+
+        The trace is written even when the command fails or exits early. The
+        summary goes to stderr so it never mixes with piped output.
+
+        Args:
+            command (str): The subcommand name
+
+        Returns:
+            Optional[int]: The command's exit code, if it returns one
+        """
+        from .profiling import Profiler
+
+        output = self.args.get("profile_output") or "janet-profile.json"
+        profiler = Profiler()
+        try:
+            with profiler, span(f"janet {command}", "command"):
+                return self.dispatch(command)
+        finally:
+            try:
+                profiler.write(output)
+                print(f"Profile: {profiler.summary()} (trace: {output})", file=sys.stderr)
+            except OSError as e:
+                print(f"Warning: Could not write profile trace: {e}", file=sys.stderr)
+
     def render_plan(self):
         """Render a plan using the PlanRenderer with optional Meatball macro expansion."""
+        if self.args.get("plan_dirs"):
+            self.render_batch()
+            return
+
         plan_path = self.resolve_plan_path()
         output_path = self.args.get("output")
         output_format = self.args.get("format", "json")
 
-        # Load and preprocess the plan
-        plan = self.load_and_preprocess_plan(plan_path)
+        if self.args.get("watch"):
+            self.watch_plan(plan_path)
+            return
 
-        # Render the plan
-        renderer = PlanRenderer(plan)
-        rendered_plan = renderer.render()
+        if self.args.get("waves"):
+            # Show which phases can run in parallel instead of the manifest
+            plan = self.load_and_preprocess_plan(plan_path)
+            for index, wave in enumerate(PlanRenderer(plan).phase_waves()):
+                print(f"Wave {index}: {', '.join(wave)}")
+            return
+
+        if output_format == "ndjson":
+            self.stream_rendered_plan(plan_path, output_path)
+            return
+
+        # Render the plan (or reuse a cached render of identical inputs)
+        rendered_plan = self.render_plan_file(plan_path)
 
         # Save the rendered plan to the output file or print it
+        body = self.format_rendered_plan(rendered_plan, output_format)
         if output_path:
-            with open(output_path, "w") as output_file:
-                if output_format == "json":
-                    json.dump(rendered_plan, output_file, indent=2)
-                else:
-                    yaml.dump(rendered_plan, output_file)
+            from .helpers import atomic_write_bytes
+            with span("write", path=output_path, bytes=len(body)):
+                atomic_write_bytes(output_path, body)
             print(f"Rendered plan saved to {output_path}")
         else:
-            print("Rendered plan:")
-            if output_format == "json":
-                print(json.dumps(rendered_plan, indent=2))
+            with span("write", path="<stdout>", bytes=len(body)):
+                print("Rendered plan:")
+                print(body.decode("utf-8"))
+
+    def stream_rendered_plan(self, plan_path, output_path=None):
+        """Write a plan as NDJSON, one document per line, while it renders.
+
+        Args:
+            plan_path (str): Path to the plan file
+            output_path (Optional[str]): File to write (atomically); stdout if omitted
+        """
+        from .helpers import atomic_open
+        from .serializers import iter_ndjson
+
+        lines = iter_ndjson(self.iter_render_plan_file(plan_path))
+        # Rendering, serializing and writing are interleaved, so they share one span
+        if output_path:
+            with span("render+write", path=output_path), atomic_open(output_path) as f:
+                f.writelines(lines)
+            print(f"Rendered plan saved to {output_path}")
+            return
+        # No banner here, so the output can be piped straight into other tools
+        with span("render+write", path="<stdout>"):
+            for line in lines:
+                sys.stdout.write(line.decode("utf-8"))
+
+    def render_batch(self):
+        """Render many plan directories across a process pool and print a summary."""
+        from .batch_render import expand_plan_dirs, render_batch
+
+        output_dir = self.args.get("output_dir")
+        if not output_dir:
+            print("Error: Batch rendering requires --output-dir")
+            sys.exit(1)
+
+        plan_dirs = expand_plan_dirs(self.args["plan_dirs"], self.args.get("file") or "plan.yaml")
+        if not plan_dirs:
+            print("Error: No plan directories matched")
+            sys.exit(1)
+
+        worker_args = {k: v for k, v in self.args.items() if k != "plan_dirs"}
+        started = time.perf_counter()
+        try:
+            results = render_batch(plan_dirs, output_dir, worker_args, self.args.get("jobs"))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - started
+
+        failures = 0
+        for plan_dir, success, seconds, detail in results:
+            if success:
+                print(f"OK    {plan_dir} -> {detail} ({seconds * 1000:.1f}ms)")
             else:
-                print(yaml.dump(rendered_plan))
+                failures += 1
+                print(f"FAIL  {plan_dir}: {detail} ({seconds * 1000:.1f}ms)")
+        print(f"Rendered {len(results) - failures}/{len(results)} plan(s), "
+              f"{failures} failed, in {elapsed:.2f}s")
+        if failures:
+            sys.exit(1)
+
+    def format_rendered_plan(self, rendered_plan, output_format):
+        """Serialize a rendered plan.
+
+        Args:
+            rendered_plan (list): The rendered Phase Manifest
+            output_format (str): "json", "canonical" or "yaml"
+
+        Returns:
+            bytes: The serialized plan (compact if --compact was given)
+        """
+        from .serializers import dumps
+
+        with span("serialize", format=output_format):
+            return dumps(rendered_plan, output_format, compact=bool(self.args.get("compact")))
+
+    def watch_plan(self, plan_path):
+        """Render a plan, then re-render incrementally whenever its files change."""
+        from .helpers import atomic_write_bytes
+        from .incremental_renderer import IncrementalRenderer
+        from .watcher import create_watcher
+
+        output_path = self.args.get("output")
+        output_format = self.args.get("format", "json")
+        if not output_path:
+            print("Error: --watch requires --output")
+            sys.exit(1)
+
+        renderer = IncrementalRenderer(
+            plan_path, self.load_and_preprocess_plan, resources=bool(self.args.get("resources")))
+        rendered_plan = renderer.render()
+        atomic_write_bytes(output_path, self.format_rendered_plan(rendered_plan, output_format))
+        print(f"Rendered plan saved to {output_path}")
+
+        plan_dir = os.path.dirname(plan_path) or "."
+        watcher = create_watcher(plan_dir, ignore=[output_path])
+        print(f"Watching {plan_dir} for changes (Ctrl-C to stop)...")
+        try:
+            while True:
+                changed = watcher.wait()
+                if not changed:
+                    continue
+                started = time.perf_counter()
+                try:
+                    rendered_plan, phases = renderer.update(changed)
+                    atomic_write_bytes(output_path, self.format_rendered_plan(rendered_plan, output_format))
+                except Exception as e:
+                    print(f"Error: Re-render failed: {e}")
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(f"Re-rendered {len(phases)} phase(s) from {len(changed)} changed file(s) in {elapsed_ms:.1f}ms")
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        finally:
+            watcher.close()
 
     def submit_plan(self):
-        """Submit a rendered plan to a PMP server."""
+        """Submit a rendered plan to a PMP server.
+
+        Returns:
+            int: A structured exit code (see janet.transport)
+        """
+        from .serializers import dump_json
+        from .transport import EXIT_UNREACHABLE
+
         plan_path = self.resolve_plan_path()
-        endpoint = self.args.get("endpoint", "http://localhost:3030")
+        endpoints = self.resolve_endpoints()
         dry_run = self.args.get("dry_run", False)
 
         # Check if the file is already rendered JSON or needs rendering
         if plan_path.endswith('.json'):
-            # Load pre-rendered JSON
-            with open(plan_path, "r") as f:
-                rendered_plan = json.load(f)
+            # Send pre-rendered JSON as it is, without decoding and re-encoding it
+            with span("read", path=plan_path), open(plan_path, "rb") as f:
+                body = f.read()
         else:
-            # Load and render YAML plan
-            plan = self.load_and_preprocess_plan(plan_path)
-            renderer = PlanRenderer(plan)
-            rendered_plan = renderer.render()
+            # Load and render YAML plan (once, however many endpoints there are)
+            rendered_plan = self.render_plan_file(plan_path)
+            with span("serialize", format="json"):
+                body = dump_json(rendered_plan, compact=True)
+
+        if len(endpoints) > 1:
+            return self.submit_fanout(endpoints, body, dry_run)
+        endpoint = endpoints[0]
 
         # Submit to PMP server
         url = f"{endpoint}/plan"
-        headers = {
-            "Content-Type": "application/vnd.phase-manifest+json"
-        }
+        print(f"Submitting plan to {url}...")
+        if dry_run:
+            print("DRY RUN - Plan that would be submitted:")
+            print(self.format_submission(body))
+            return 0
+
+        with span("submit", endpoint=endpoint, bytes=len(body)), self.create_transport() as transport:
+            result = transport.submit(endpoint, body=body)
+
+        if result.status_code is None:
+            if result.exit_code == EXIT_UNREACHABLE:
+                print(f"Error: Could not connect to PMP server at {endpoint} after {result.attempts} attempt(s)")
+                print("Make sure the server is running and accessible.")
+            else:
+                print(f"Error submitting plan: {result.error}")
+        elif result.status_code == 200:
+            print("Plan submitted successfully!")
+            if result.text:
+                print("Server response:", result.text)
+        elif result.status_code == 400:
+            print("Bad Request: Invalid manifest")
+            print("Response:", result.text)
+        elif result.status_code == 409:
+            print("Conflict: Already executing or conflicting manifest")
+            print("Response:", result.text)
+        else:
+            print(f"Unexpected response: {result.status_code}")
+            print("Response:", result.text)
+        return result.exit_code
+
+    def resolve_endpoints(self):
+        """Collect endpoints from --endpoint (repeatable) and --endpoints-file.
+
+        Returns:
+            list: Unique endpoints in the order given
+        """
+        from .fanout import load_endpoints_file
+
+        endpoint = self.args.get("endpoint")
+        endpoints = [endpoint] if isinstance(endpoint, str) else list(endpoint or [])
+        if self.args.get("endpoints_file"):
+            endpoints.extend(load_endpoints_file(self.args["endpoints_file"]))
+        endpoints = list(dict.fromkeys(e.rstrip("/") for e in endpoints))
+        return endpoints or ["http://localhost:3030"]
+
+    def format_submission(self, body):
+        """Pretty-print an encoded manifest for --dry-run.
+
+        Args:
+            body (bytes): The JSON request body
 
+        Returns:
+            str: Indented JSON, or the body as-is if it does not parse
+        """
         try:
-            print(f"Submitting plan to {url}...")
-            if dry_run:
-                print("DRY RUN - Plan that would be submitted:")
-                print(json.dumps(rendered_plan, indent=2))
-                return
+            return json.dumps(json.loads(body), indent=2)
+        except ValueError:
+            return body.decode("utf-8", errors="replace")
+
+    def submit_fanout(self, endpoints, body, dry_run=False):
+        """Submit one encoded manifest to many PMP servers concurrently.
+
+        Returns:
+            int: 0 if every submission succeeded, else the highest exit code
+        """
+        from .fanout import format_results_table, submit_many
 
-            response = requests.post(url, json=rendered_plan, headers=headers)
-            
-            if response.status_code == 200:
-                print("Plan submitted successfully!")
-                if response.text:
-                    print("Server response:", response.text)
-            elif response.status_code == 400:
-                print("Bad Request: Invalid manifest")
-                print("Response:", response.text)
-            elif response.status_code == 409:
-                print("Conflict: Already executing or conflicting manifest")
-                print("Response:", response.text)
+        concurrency = self.args.get("concurrency", 8)
+        print(f"Submitting plan to {len(endpoints)} endpoint(s), {concurrency} at a time...")
+        if dry_run:
+            print("DRY RUN - Plan that would be submitted:")
+            print(self.format_submission(body))
+            return 0
+
+        started = time.perf_counter()
+        with span("submit", endpoints=len(endpoints), bytes=len(body)), \
+                self.create_transport(pool_size=concurrency) as transport:
+            results = submit_many(transport, endpoints, concurrency=concurrency, body=body)
+        elapsed = time.perf_counter() - started
+
+        print(format_results_table(results))
+        succeeded = sum(1 for r in results if r.success)
+        print(f"Submitted to {succeeded}/{len(results)} endpoint(s) in {elapsed * 1000:.1f}ms")
+        return max(r.exit_code for r in results)
+
+    def create_transport(self, pool_size=10):
+        """Build the HTTP transport from the submit options.
+
+        Returns:
+            PMPTransport: A pooled, retrying transport
+        """
+        from .transport import PMPTransport
+
+        return PMPTransport(
+            connect_timeout=self.args.get("connect_timeout", 5.0),
+            read_timeout=self.args.get("read_timeout", 30.0),
+            max_retries=self.args.get("retries", 3),
+            gzip_min_bytes=None if self.args.get("no_gzip") else 16 * 1024,
+            pool_size=pool_size,
+        )
+
+    def status_command(self):
+        """Show the phase status table once, or keep it updated with --follow.
+
+        Returns:
+            int: 0, or a structured exit code if the server could not be reached
+        """
+        import asyncio
+
+        import requests
+
+        from .status import PhaseStatusTable, StatusPoller, follow, follow_http, follow_nats, parse_status_payload
+        from .transport import EXIT_ERROR, EXIT_UNREACHABLE
+
+        nats_url = self.args.get("nats")
+        session_id = self.args.get("session")
+        rows = self.args.get("rows", 20)
+        if nats_url and not session_id:
+            print("Error: --nats requires --session")
+            return EXIT_ERROR
+
+        table = PhaseStatusTable()
+        clear = "\x1b[H\x1b[2J" if sys.stdout.isatty() else ""
+
+        def draw(table):
+            print(f"{clear}{table.render(rows)}\n", flush=True)
+
+        if nats_url:
+            try:
+                from plantangenet.messaging import NATSConnector, NATSError
+            except ImportError:
+                print("Error: --nats requires the plantangenet package")
+                return EXIT_ERROR
+
+            async def from_nats():
+                async with NATSConnector(url=nats_url, name="janet-status") as connector:
+                    if self.args.get("follow"):
+                        await follow(lambda t, changed: follow_nats(connector, session_id, t, changed),
+                                     table, draw, self.args.get("max_rate", 4.0))
+                    else:
+                        table.replace(parse_status_payload(await connector.get_state(session_id)))
+                        draw(table)
+
+            try:
+                asyncio.run(from_nats())
+            except KeyboardInterrupt:
+                print("Stopped following.")
+            except (OSError, asyncio.TimeoutError, NATSError) as e:
+                print(f"Error: Could not get status from NATS at {nats_url}: {e}")
+                return EXIT_UNREACHABLE
+            return 0
+
+        poller = StatusPoller(self.args.get("endpoint", "http://localhost:3030"))
+        try:
+            if self.args.get("follow"):
+                asyncio.run(follow(
+                    lambda t, changed: follow_http(poller, t, changed, self.args.get("interval", 2.0)),
+                    table, draw, self.args.get("max_rate", 4.0)))
             else:
-                print(f"Unexpected response: {response.status_code}")
-                print("Response:", response.text)
-                
-        except requests.exceptions.ConnectionError:
-            print(f"Error: Could not connect to PMP server at {endpoint}")
-            print("Make sure the server is running and accessible.")
-        except Exception as e:
-            print(f"Error submitting plan: {e}")
+                table.replace(poller.poll() or [])
+                draw(table)
+        except KeyboardInterrupt:
+            print("Stopped following.")
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"Error: Could not reach {poller.url}: {e}")
+            return EXIT_UNREACHABLE
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error: Could not get status from {poller.url}: {e}")
+            return EXIT_ERROR
+        finally:
+            poller.close()
+        return 0
+
+    def render_plan_file(self, plan_path):
+        """Expand and render a plan file, reusing the render cache when possible.
+
+        Args:
+            plan_path (str): Path to the plan file
+
+        Returns:
+            list: The rendered Phase Manifest
+        """
+        cache = None if self.args.get("no_cache") else self.open_render_cache()
+        if cache is not None:
+            with span("cache.get"):
+                key = self.render_cache_key(plan_path)
+                cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        plan = self.load_and_preprocess_plan(plan_path)
+        with span("render"):
+            renderer = PlanRenderer(plan, self.load_resources(plan_path))
+            rendered_plan = renderer.render()
+
+        if cache is not None:
+            try:
+                with span("cache.put"):
+                    cache.put(key, rendered_plan)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Warning: Could not write render cache: {e}", file=sys.stderr)
+        return rendered_plan
+
+    def iter_render_plan_file(self, plan_path):
+        """Yield the rendered documents of a plan file as they are produced.
+
+        A cached render is replayed when there is one; otherwise the plan is
+        rendered lazily and, to keep memory flat, not added to the cache.
+
+        Args:
+            plan_path (str): Path to the plan file
+
+        Yields:
+            dict: Each Phase and matched resource, in manifest order
+        """
+        cache = None if self.args.get("no_cache") else self.open_render_cache()
+        if cache is not None:
+            cached = cache.get(self.render_cache_key(plan_path))
+            if cached is not None:
+                yield from cached
+                return
+
+        plan = self.load_and_preprocess_plan(plan_path)
+        yield from PlanRenderer(plan, self.load_resources(plan_path)).iter_render()
+
+    def open_render_cache(self):
+        """Open the configured render cache, or return None if it is unreachable.
+
+        The cache is opened once and reused by later calls, so a run that
+        renders many plans holds one Redis connection, until
+        close_render_cache().
+
+        Returns:
+            RenderCache: The on-disk cache, or a Redis-backed one when JANET_CACHE_REDIS is set
+        """
+        if self._render_cache_opened:
+            return self._render_cache
+        from .render_cache import open_render_cache
+
+        self._render_cache_opened = True
+        try:
+            self._render_cache = open_render_cache()
+        except (ImportError, OSError) as e:
+            print(f"Warning: Render cache unavailable, rendering without it: {e}", file=sys.stderr)
+        return self._render_cache
+
+    def close_render_cache(self):
+        """Close the render cache opened by open_render_cache(), if any."""
+        cache, self._render_cache = self._render_cache, None
+        self._render_cache_opened = False
+        if cache is not None:
+            cache.close()
+
+    def render_cache_key(self, plan_path):
+        """Compute the render cache key for a plan file and the current options.
+
+        Args:
+            plan_path (str): Path to the plan file
+
+        Returns:
+            str: The cache key
+        """
+        from .plan_loader import iter_plan_files
+        from .render_cache import RenderCache
+
+        sources = [plan_path]
+        resources = bool(self.args.get("resources"))
+        if resources:
+            plan_dir = os.path.dirname(plan_path) or "."
+            sources.extend(iter_plan_files(plan_dir, exclude=[plan_path]))
+        return RenderCache.compute_key(
+            sources, self.macro_context(plan_path), {"resources": resources})
+
+    def macro_context(self, plan_path):
+        """Build the context passed to Meatball macros.
+
+        Args:
+            plan_path (str): Path to the plan file
+
+        Returns:
+            dict: The macro context
+        """
+        return {
+            'plan_dir': os.path.dirname(plan_path),
+            'plan_file': os.path.basename(plan_path)
+        }
+
+    def cache_command(self):
+        """Show statistics for, or clear, the render cache."""
+        from .render_cache import open_render_cache
+
+        try:
+            cache = open_render_cache()
+        except (ImportError, OSError) as e:
+            print(f"Error: Could not open the render cache: {e}")
+            sys.exit(1)
+        try:
+            if self.args.get("action") == "clear":
+                removed = cache.clear()
+                print(f"Removed {removed} cached render(s) from {cache.directory}")
+                return
+            stats = cache.stats()
+        except OSError as e:
+            print(f"Error: Could not read the render cache: {e}")
+            sys.exit(1)
+        finally:
+            cache.close()
+        print(f"Cache directory: {stats['directory']}")
+        print(f"Entries: {stats['entries']}")
+        if stats["max_bytes"] is None:
+            print(f"Size: {stats['bytes']} bytes")
+        else:
+            print(f"Size: {stats['bytes']} / {stats['max_bytes']} bytes")
 
     def load_and_preprocess_plan(self, plan_path):
         """Load and preprocess a plan file with optional Meatball macro expansion.
@@ -202,43 +830,106 @@ class JanetCLI:
         Returns:
             dict: The processed plan data
         """
+        from .plan_loader import safe_load
+        try:
+            from meatball import preprocess_yaml_string
+        except ImportError:
+            preprocess_yaml_string = None
+
         # Load the raw YAML content
-        with open(plan_path, "r") as plan_file:
+        with span("read", path=plan_path), open(plan_path, "r") as plan_file:
             raw_yaml_content = plan_file.read()
 
         # Apply Meatball macro expansion if available
         if preprocess_yaml_string:
             try:
                 # Create context for macro expansion
-                context = {
-                    'plan_dir': os.path.dirname(plan_path),
-                    'plan_file': os.path.basename(plan_path)
-                }
-                expanded_yaml_content = preprocess_yaml_string(
-                    raw_yaml_content, context)
+                context = self.macro_context(plan_path)
+                with span("expand"):
+                    expanded_yaml_content = preprocess_yaml_string(
+                        raw_yaml_content, context)
                 return expanded_yaml_content
             except Exception as e:
-                print(f"Warning: Meatball macro expansion failed: {e}")
-                print("Falling back to standard YAML loading...")
-                return yaml.safe_load(raw_yaml_content)
+                print(f"Warning: Meatball macro expansion failed: {e}", file=sys.stderr)
+                print("Falling back to standard YAML loading...", file=sys.stderr)
+                with span("parse"):
+                    return safe_load(raw_yaml_content)
         else:
-            print("Meatball not available, using standard YAML loading...")
-            return yaml.safe_load(raw_yaml_content)
+            print("Meatball not available, using standard YAML loading...", file=sys.stderr)
+            with span("parse"):
+                return safe_load(raw_yaml_content)
+
+    def load_resources(self, plan_path):
+        """Stream resource documents from the plan's sibling YAML files.
+
+        Args:
+            plan_path (str): Path to the plan file, which is excluded
+
+        Returns:
+            Optional[Iterator[dict]]: A document generator when --resources is set
+        """
+        from .plan_loader import iter_plan_documents
+
+        if not self.args.get("resources"):
+            return None
+        plan_dir = os.path.dirname(plan_path) or "."
+        return iter_plan_documents(plan_dir, exclude=[plan_path])
 
     def validate_plan(self):
-        """Validate a plan against the JSON schema."""
+        """Validate a plan, and optionally its resource documents, against the bundled schemas."""
+        from .schema_registry import SchemaRegistry
+
         plan_path = self.resolve_plan_path()
 
         # Load and preprocess the plan
         plan = self.load_and_preprocess_plan(plan_path)
+        with span("schema.load"):
+            registry = SchemaRegistry.default()
+        invalid = 0
 
         # Validate the plan
-        try:
-            validate(instance=plan, schema=self.get_plan_schema())
-            print("Plan is valid.")
-        except ValidationError as e:
-            print(f"Plan is invalid: {e.message}")
-
+        if isinstance(plan, dict) and "phases" in plan:
+            print("Plan uses the phases format; no schema to validate it against.")
+        else:
+            try:
+                plan_schema = self.get_plan_schema()
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            with span("validate"):
+                errors = registry.iter_errors(plan, registry.compile(plan_schema))
+            if errors:
+                invalid += 1
+                print(f"Plan is invalid: {len(errors)} error(s)")
+                for error in errors:
+                    print(f"  {error}")
+            else:
+                print("Plan is valid.")
+
+        # Validate resource documents, each against the schema for its kind
+        resources = self.load_resources(plan_path)
+        if resources is not None:
+            checked = without_schema = invalid_resources = 0
+            # Resource files are read lazily by the loop, so the span includes reading them
+            with span("validate.resources"):
+                for document in resources:
+                    errors = registry.iter_errors(document)
+                    if errors is None:
+                        without_schema += 1
+                        continue
+                    checked += 1
+                    if errors:
+                        invalid_resources += 1
+                        name = (document.get("metadata") or {}).get("name") or "<unnamed>"
+                        print(f"{document.get('kind')} {name} is invalid: {len(errors)} error(s)")
+                        for error in errors:
+                            print(f"  {error}")
+            print(f"Validated {checked} resource document(s): {invalid_resources} invalid, "
+                  f"{without_schema} without a schema")
+            invalid += invalid_resources
+
+        if invalid:
+            sys.exit(1)
 
     def get_plan_schema(self):
         """Get the JSON schema for plan validation.
@@ -246,5 +937,6 @@ class JanetCLI:
         Returns:
             dict: The JSON schema as a dictionary.
         """
-        # TODO: Define and return the JSON schema for plan validation
-        return {}
+        from .schema_registry import SchemaRegistry
+
+        return SchemaRegistry.default().plan_schema
@@ -1,7 +1,11 @@
 from typing import Optional
 
+from .helpers import bounded_repr
+
 
 class ExecutionResult:
+    __slots__ = ("success", "message", "logs", "labels")
+
     def __init__(self, success: bool, message: str, logs: Optional[list] = None, labels: Optional[dict] = None):
         self.success = success
         self.message = message
@@ -9,4 +13,5 @@ class ExecutionResult:
         self.labels = labels or {}
 
     def __repr__(self):
-        return f"<ExecutionResult success={self.success} message='{self.message}' logs={self.logs} labels={self.labels}>"
+        return (f"<ExecutionResult success={self.success} message={bounded_repr(self.message)} "
+                f"logs={bounded_repr(self.logs)} labels={bounded_repr(self.labels)}>")
@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .transport import SubmitResult
+
+
+def load_endpoints_file(path):
+    """Read endpoints from a file, one per line; blank lines and # comments are ignored."""
+    endpoints = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                endpoints.append(line)
+    return endpoints
+
+
+async def _submit_all(transport, endpoints, body, headers, concurrency):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        async def submit_one(endpoint):
+            async with semaphore:
+                try:
+                    return await loop.run_in_executor(
+                        pool, partial(transport.submit, endpoint, body=body, headers=headers))
+                except Exception as e:
+                    return SubmitResult(endpoint, error=e)
+
+        return await asyncio.gather(*(submit_one(endpoint) for endpoint in endpoints))
+
+
+def submit_many(transport, endpoints, manifest=None, concurrency=8, body=None):
+    """
+    Submit one manifest to many PMP servers concurrently.
+
+    The manifest is encoded (and gzipped) once; pass ``body`` instead to
+    send already-encoded JSON bytes as they are. At most ``concurrency``
+    submissions are in flight; each has its own timeouts and retries, so a
+    slow or failing server only ties up its own slot.
+
+    Returns:
+        list: SubmitResult per endpoint, in input order
+    """
+    body, headers = transport.encode(manifest) if body is None else transport.prepare(body)
+    return asyncio.run(_submit_all(transport, endpoints, body, headers, max(1, concurrency)))
+
+
+def format_results_table(results):
+    """Render per-endpoint results as an aligned text table."""
+    rows = [("ENDPOINT", "STATUS", "ATTEMPTS", "LATENCY", "RESULT")]
+    for result in results:
+        if result.success:
+            outcome = "ok"
+        elif result.status_code is None:
+            outcome = f"error: {type(result.error).__name__}"
+        else:
+            # Show the first line of the error body, if it has any text at all
+            outcome = next(iter((result.text or "").strip().splitlines()), "")[:60] or "failed"
+        rows.append((
+            result.endpoint,
+            str(result.status_code) if result.status_code is not None else "-",
+            str(result.attempts),
+            f"{result.elapsed * 1000:.1f}ms",
+            outcome,
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1]
+        for row in rows
+    )
@@ -1,6 +1,13 @@
 import json
+import os
+import reprlib
+import shutil
+import stat
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 import re
+import sys
 
 
 def parse_timeout(timeout_str):
@@ -23,6 +30,53 @@ def parse_timeout(timeout_str):
         raise ValueError(f"Unknown unit in timeout: {unit}")
 
 
+_repr = reprlib.Repr()
+_repr.maxlevel = 2
+_repr.maxdict = 4
+_repr.maxlist = 4
+_repr.maxstring = 40
+_repr.maxother = 40
+
+
+def bounded_repr(value):
+    """A repr cut down to a few levels and items, for __repr__ of large resources."""
+    return _repr.repr(value)
+
+
+def intern_str(value):
+    # Names and ids repeat across many objects; share one copy of each
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_mapping(mapping):
+    """A copy of ``mapping`` with its string keys and values interned."""
+    return {intern_str(k): intern_str(v) for k, v in mapping.items()}
+
+
+def intern_labels(spec):
+    """
+    Intern the label keys and values of a resource (``labels`` and
+    ``metadata.labels``), so repeated labels share one string.
+
+    The caller's spec is not modified; when it has labels, a shallow copy
+    carrying the interned label dicts is returned instead.
+
+    Returns:
+        The spec, or a copy of it with interned labels
+    """
+    labels = spec.get("labels")
+    metadata = spec.get("metadata")
+    metadata_labels = metadata.get("labels") if isinstance(metadata, dict) else None
+    if not isinstance(labels, dict) and not isinstance(metadata_labels, dict):
+        return spec
+    spec = dict(spec)
+    if isinstance(labels, dict):
+        spec["labels"] = intern_mapping(labels)
+    if isinstance(metadata_labels, dict):
+        spec["metadata"] = {**metadata, "labels": intern_mapping(metadata_labels)}
+    return spec
+
+
 def load_state_file(directory="."):
     path = Path(directory) / ".plan_state.json"
     if path.exists():
@@ -33,10 +87,53 @@ def load_state_file(directory="."):
 
 def save_state_file(directory, state):
     path = Path(directory) / ".plan_state.json"
-    backup = path.with_suffix(".plan_state.json.bak")
+    backup = path.with_name(path.name + ".bak")
+    # Keep the previous state as a backup, but never leave the directory
+    # without a complete state file if we crash mid-write
     if path.exists():
-        path.rename(backup)
-    with open(path, "w") as f:
-        json.dump(state, f, indent=2)
+        shutil.copyfile(path, backup)
+    atomic_write_text(path, json.dumps(state, indent=2))
+
+
+def atomic_write_text(path, text):
+    """Write text to path via a temporary file and rename, so readers never see a partial file."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path, data):
+    """Write bytes to path via a temporary file and rename, so readers never see a partial file."""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def _file_mode(path):
+    """The mode a rewrite of path should have: the existing file's, else what open() would create."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
 
+@contextmanager
+def atomic_open(path):
+    """
+    Open a binary file for writing that only replaces ``path`` once the
+    block completes, so output can be streamed without readers seeing a
+    partial file.
 
+    The file keeps the mode of the one it replaces, or gets the usual
+    umask-based mode when new, rather than mkstemp's private 0600.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,186 @@
+from pathlib import Path
+
+from .label_index import LabelIndex
+from .plan_loader import iter_documents, iter_plan_files
+from .plan_renderer import PlanRenderer
+
+
+class IncrementalRenderer:
+    """
+    Render a plan and keep enough state to re-render it cheaply after edits.
+
+    Resource documents are indexed per file (including any that sit beside
+    the plan in a multi-document plan file), and each legacy phase's output
+    (the Phase plus its matched resources) is kept as a separate chunk.
+    When files change, only those files are re-parsed, and only the phases
+    whose definitions changed or whose selectors match an added or removed
+    resource are re-rendered. Phase order is recomputed only when the plan
+    file itself changes.
+    """
+
+    def __init__(self, plan_path, load_plan, resources=False):
+        """
+        Args:
+            plan_path (str): Path to the plan file
+            load_plan (Callable[[str], Any]): Loads and expands the plan file
+            resources (bool): Index the other YAML files in the plan directory
+        """
+        self.plan_path = Path(plan_path).resolve()
+        self.plan_dir = self.plan_path.parent
+        self.load_plan = load_plan
+        self.with_resources = resources
+
+        self.index = LabelIndex()
+        self.file_ids = {}
+        self.plan_ids = []
+        self.order = {}
+
+        self.renderer = None
+        self.phases = {}
+        self.ordered_phases = []
+        self.chunks = {}
+        self.manifest = []
+
+    def render(self):
+        """Load every source and render the whole plan."""
+        if self.with_resources:
+            for path in iter_plan_files(self.plan_dir, exclude=[self.plan_path]):
+                self._load_resource_file(path.resolve())
+        self._load_plan()
+        return self._render_affected(set(self.phases))[0]
+
+    def update(self, changed_paths):
+        """
+        Re-render after the given files changed.
+
+        Returns:
+            tuple: The full rendered manifest and the set of re-rendered phase names
+        """
+        plan_changed = False
+        changed_resources = []
+        for path in changed_paths:
+            path = Path(path).resolve()
+            if path == self.plan_path:
+                plan_changed = True
+            elif self.with_resources and path.parent == self.plan_dir:
+                changed_resources.extend(self._load_resource_file(path))
+
+        affected = set()
+        if plan_changed:
+            affected |= self._load_plan()
+        if changed_resources and self.renderer is not None:
+            affected |= self._phases_matching(changed_resources)
+        return self._render_affected(affected)
+
+    def _uses_phases_format(self):
+        return hasattr(self.renderer, "phases")
+
+    def _phases_matching(self, documents):
+        """Return the legacy phases whose selectors match any of the documents."""
+        if not documents or self._uses_phases_format():
+            return set()
+        # A tiny index over just the touched documents tells which
+        # selectors could have gained or lost a match
+        touched = LabelIndex(documents)
+        return {name for name, config in self.phases.items() if touched.select_ids(config.get("selector", {}))}
+
+    def _load_resource_file(self, path):
+        """(Re)index one resource file and return its old and new documents."""
+        touched = []
+        for resource_id in self.file_ids.pop(path, []):
+            touched.append(self.index.resources[resource_id])
+            self.index.remove(resource_id)
+            del self.order[resource_id]
+
+        if not path.is_file():
+            return touched
+
+        ids = []
+        for position, document in enumerate(iter_documents(path)):
+            if not isinstance(document, dict) or "plan" in document or "phases" in document:
+                continue
+            resource_id = self.index.add(document)
+            self.order[resource_id] = (path.name, position)
+            ids.append(resource_id)
+            touched.append(document)
+        self.file_ids[path] = ids
+        return touched
+
+    def _load_plan_resources(self, documents):
+        """Re-index the resources read alongside the plan and return their old and new documents."""
+        touched = []
+        for resource_id in self.plan_ids:
+            touched.append(self.index.resources[resource_id])
+            self.index.remove(resource_id)
+            del self.order[resource_id]
+
+        self.plan_ids = []
+        for position, document in enumerate(documents):
+            resource_id = self.index.add(document)
+            # Plan-file resources come before the other files, as in a full render
+            self.order[resource_id] = ("", position)
+            self.plan_ids.append(resource_id)
+            touched.append(document)
+        return touched
+
+    def _load_plan(self):
+        """Re-expand the plan file and return the names of phases whose definitions changed."""
+        renderer = PlanRenderer(self.load_plan(str(self.plan_path)))
+        plan_resources = list(renderer.label_index.resources)
+        previous = self.renderer
+
+        if hasattr(renderer, "phases"):
+            # Phases-format plans carry no resources; re-render them whole
+            self.manifest = renderer.render()
+            self._use_renderer(renderer, plan_resources)
+            self.phases = {}
+            self.ordered_phases = []
+            return {phase["Id"] for phase in self.manifest}
+
+        # Resolve the order before touching any state so a bad edit leaves
+        # the previous render intact
+        plan = renderer.plan_section
+        phases = renderer._legacy_phases(plan)
+        self.ordered_phases = renderer._resolve_phase_order(phases, plan.get("targetPhase"))
+        touched = self._use_renderer(renderer, plan_resources)
+
+        header_changed = (
+            previous is None
+            or not hasattr(previous, "plan_section")
+            or previous.plan_section.get("defaultInstanceMode") != plan.get("defaultInstanceMode")
+        )
+        if header_changed:
+            changed = set(phases)
+        else:
+            changed = {name for name, config in phases.items() if self.phases.get(name) != config}
+        self.phases = phases
+        for name in list(self.chunks):
+            if name not in phases:
+                del self.chunks[name]
+        return changed | self._phases_matching(touched)
+
+    def _use_renderer(self, renderer, plan_resources):
+        """Point the renderer at the shared index and merge in the plan file's own resources."""
+        touched = self._load_plan_resources(plan_resources)
+        renderer.label_index = self.index
+        renderer.all_resources = self.index.resources
+        self.renderer = renderer
+        return touched
+
+    def _render_affected(self, affected):
+        if self._uses_phases_format():
+            return self.manifest, affected
+
+        default_mode = self.renderer.plan_section.get("defaultInstanceMode", "immediate")
+        for name in affected:
+            if name not in self.phases:
+                continue
+            config = self.phases[name]
+            ids = self.index.select_ids(config.get("selector", {}))
+            matched = [self.index.resources[i] for i in sorted(ids, key=self.order.__getitem__)]
+            self.chunks[name] = [self.renderer._render_legacy_phase(name, config, default_mode)] + matched
+
+        result = []
+        for name in self.ordered_phases:
+            result.extend(self.chunks[name])
+        return result, affected & set(self.phases)
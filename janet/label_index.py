@@ -0,0 +1,118 @@
+class LabelIndex:
+    """Inverted index from metadata labels to resource positions.
+
+    Each ``(key, value)`` label pair maps to a posting set of resource ids
+    (positions in ``resources``), and each key maps to the ids of every
+    resource carrying it. Selectors are answered with set operations on
+    those postings instead of scanning every resource.
+    """
+
+    def __init__(self, resources=None):
+        self.resources = []
+        self.postings = {}
+        self.keys = {}
+        self.removed = set()
+        for resource in resources or []:
+            self.add(resource)
+
+    def __len__(self):
+        return len(self.resources) - len(self.removed)
+
+    def add(self, resource):
+        """Index a resource and return its id."""
+        resource_id = len(self.resources)
+        self.resources.append(resource)
+
+        labels = resource.get("metadata", {}).get("labels") or {}
+        for key, value in labels.items():
+            self.keys.setdefault(key, set()).add(resource_id)
+            try:
+                self.postings.setdefault((key, value), set()).add(resource_id)
+            except TypeError:
+                # Unhashable label values can never equal a selector value
+                continue
+        return resource_id
+
+    def remove(self, resource_id):
+        """Drop a resource from the postings. Its id is never reused."""
+        resource = self.resources[resource_id]
+        if resource is None:
+            return
+        labels = resource.get("metadata", {}).get("labels") or {}
+        for key, value in labels.items():
+            self.keys.get(key, set()).discard(resource_id)
+            try:
+                self.postings.get((key, value), set()).discard(resource_id)
+            except TypeError:
+                continue
+        self.resources[resource_id] = None
+        self.removed.add(resource_id)
+
+    def select(self, selector):
+        """
+        Return all resources matching the selector, in load order.
+        Supports matchLabels and matchExpressions (In, NotIn, Exists,
+        DoesNotExist). An empty selector matches nothing.
+
+        Raises:
+            ValueError if a matchExpressions entry uses an unknown operator
+        """
+        return [self.resources[i] for i in sorted(self.select_ids(selector))]
+
+    def select_ids(self, selector):
+        """Return the set of resource ids matching the selector."""
+        match_labels = selector.get("matchLabels") or {}
+        match_expressions = selector.get("matchExpressions") or []
+        if not match_labels and not match_expressions:
+            return set()
+
+        include = []
+        exclude = []
+        for key, value in match_labels.items():
+            include.append(self._posting(key, value))
+
+        for expression in match_expressions:
+            key = expression.get("key")
+            operator = expression.get("operator")
+            values = expression.get("values") or []
+            if operator == "In":
+                include.append(self._union(key, values))
+            elif operator == "NotIn":
+                exclude.append(self._union(key, values))
+            elif operator == "Exists":
+                include.append(self.keys.get(key, set()))
+            elif operator == "DoesNotExist":
+                exclude.append(self.keys.get(key, set()))
+            else:
+                raise ValueError(
+                    f"Unknown matchExpressions operator: {operator}")
+
+        if include:
+            # Intersect smallest posting lists first so the working set
+            # shrinks as early as possible
+            include.sort(key=len)
+            matched = set(include[0])
+            for posting in include[1:]:
+                if not matched:
+                    break
+                matched &= posting
+        else:
+            matched = set(range(len(self.resources))) - self.removed
+
+        for posting in exclude:
+            if not matched:
+                break
+            matched -= posting
+        return matched
+
+    def _posting(self, key, value):
+        try:
+            return self.postings.get((key, value), set())
+        except TypeError:
+            return set()
+
+    def _union(self, key, values):
+        result = set()
+        for value in values:
+            result |= self._posting(key, value)
+        return result
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import random
 import time
 
 from .helpers import parse_timeout
@@ -7,6 +8,54 @@ from .phase_resource import PhaseResource
 from .execution_result import ExecutionResult
 
 
+DEFAULT_BACKOFF = "500ms"
+DEFAULT_MAX_BACKOFF = "30s"
+
+
+def retry_policy(spec):
+    """
+    Read ``retry`` from a phase spec.
+
+    Returns:
+        tuple: ``(max_attempts, backoff_seconds, max_backoff_seconds, jitter)``
+    """
+    retry_config = spec.get("retry") or {}
+    max_attempts = int(retry_config.get("maxAttempts", 1))
+    backoff = parse_timeout(str(retry_config.get("backoff", DEFAULT_BACKOFF)))
+    max_backoff = parse_timeout(str(retry_config.get("maxBackoff", DEFAULT_MAX_BACKOFF)))
+    jitter = retry_config.get("jitter", "full") != "none"
+    return max_attempts, backoff, max_backoff, jitter
+
+
+def backoff_delay(attempt, backoff, max_backoff, jitter=True, rng=random):
+    """Seconds to wait after failed attempt number ``attempt`` (1-based)."""
+    delay = min(max_backoff, backoff * (2 ** (attempt - 1)))
+    return rng.uniform(0, delay) if jitter else delay
+
+
+def _finish(phase, success, message, logs):
+    # Choose handler based on success
+    handler = phase.spec.get(
+        "onSuccess") if success else phase.spec.get("onFailure")
+    handler_spec = handler.get("spec", {}) if handler else {}
+
+    # Collect handler messages and notifications
+    messages = handler_spec.get("message", [])
+    notify = handler_spec.get("notify", {})
+    labels = handler_spec.get("labels", {})
+
+    logs.extend(messages)
+    if notify:
+        logs.append(f"Notify targets: {notify}")
+
+    return ExecutionResult(
+        success=success,
+        message=message,
+        logs=logs,
+        labels=labels
+    )
+
+
 class PhaseExecutor:
     def execute(self, phase: PhaseResource) -> ExecutionResult:
         logs = []
@@ -39,23 +88,75 @@ class PhaseExecutor:
             else:
                 logs.append("Phase execution failed")
 
-        # Choose handler based on success
-        handler = phase.spec.get(
-            "onSuccess") if success else phase.spec.get("onFailure")
-        handler_spec = handler.get("spec", {}) if handler else {}
-
-        # Collect handler messages and notifications
-        messages = handler_spec.get("message", [])
-        notify = handler_spec.get("notify", {})
-        labels = handler_spec.get("labels", {})
-
-        logs.extend(messages)
-        if notify:
-            logs.append(f"Notify targets: {notify}")
-
-        return ExecutionResult(
-            success=success,
-            message=result_message,
-            logs=logs,
-            labels=labels
-        )
+        return _finish(phase, success, result_message, logs)
+
+
+class AsyncPhaseExecutor:
+    """
+    Event-loop variant of PhaseExecutor.
+
+    ``waitFor.timeout`` is an ``asyncio.sleep`` instead of a blocking sleep,
+    and failed attempts are retried up to ``retry.maxAttempts`` times with
+    exponential backoff: ``retry.backoff`` (default 500ms) doubling per
+    attempt up to ``retry.maxBackoff`` (default 30s), with full jitter unless
+    ``retry.jitter`` is ``none``. Cancelling the task stops a phase at
+    whichever wait it is in, so thousands of phases can be in flight on one
+    loop without holding a thread each.
+
+    ``attempt`` is an optional coroutine function ``(phase, attempt_number)``
+    returning a bool; by default every attempt succeeds, as in PhaseExecutor.
+    ``sleep`` defaults to ``asyncio.sleep``.
+    """
+
+    def __init__(self, attempt=None, sleep=None, rng=random):
+        # asyncio is imported here, not at module level: the CLI imports this
+        # module through PlanTransformer, and asyncio dominates its start-up
+        import asyncio
+
+        self.attempt = attempt
+        self.sleep = sleep or asyncio.sleep
+        self.rng = rng
+
+    async def execute(self, phase: PhaseResource) -> ExecutionResult:
+        logs = []
+        result_message = f"Executing phase {phase.name or phase.id}"
+        logs.append(result_message)
+
+        wait_for = phase.spec.get("waitFor", {})
+        timeout_value = parse_timeout(wait_for.get("timeout"))
+        if timeout_value > 0:
+            logs.append(f"Sleeping for timeout: {timeout_value} seconds")
+            await self.sleep(timeout_value)
+
+        max_attempts, backoff, max_backoff, jitter = retry_policy(phase.spec)
+        success = False
+        for attempt in range(1, max_attempts + 1):
+            logs.append(f"Attempt {attempt} of {max_attempts}")
+            success = await self.attempt(phase, attempt) if self.attempt else True
+            if success:
+                logs.append("Phase execution succeeded")
+                break
+            logs.append("Phase execution failed")
+            if attempt < max_attempts:
+                delay = backoff_delay(attempt, backoff, max_backoff, jitter, self.rng)
+                logs.append(f"Retrying in {delay:.3f} seconds")
+                await self.sleep(delay)
+
+        return _finish(phase, success, result_message, logs)
+
+    async def execute_all(self, phases, limit=None):
+        """
+        Execute phases concurrently and return their results in order.
+        ``limit`` caps how many run at once; None means all of them.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def run(phase):
+            if semaphore is None:
+                return await self.execute(phase)
+            async with semaphore:
+                return await self.execute(phase)
+
+        return await asyncio.gather(*(run(phase) for phase in phases))
@@ -0,0 +1,104 @@
+def phase_dependencies(config):
+    """
+    Return the phases a phase waits for, from either ``waitFor.dependsOn``
+    or ``waitFor.phases`` (a name or a list of names), without duplicates.
+    """
+    wait_for = config.get("waitFor") or {}
+    dependencies = []
+    for key in ("dependsOn", "phases"):
+        value = wait_for.get(key)
+        if not value:
+            continue
+        if isinstance(value, str):
+            value = [value]
+        dependencies.extend(value)
+    return list(dict.fromkeys(dependencies))
+
+
+def _find_cycle(remaining, dependencies):
+    """Walk unplaced phases along their dependencies until one repeats."""
+    start = next(iter(remaining))
+    path = [start]
+    seen = {start: 0}
+    node = start
+    while True:
+        node = next(d for d in dependencies[node] if d in remaining)
+        if node in seen:
+            return path[seen[node]:] + [node]
+        seen[node] = len(path)
+        path.append(node)
+
+
+def resolve_phase_waves(phases, target_phase=None):
+    """
+    Group phases into dependency levels ("waves") using Kahn's algorithm.
+
+    Every phase in a wave depends only on phases in earlier waves, so the
+    phases of one wave can run at the same time. Runs iteratively in
+    O(phases + dependencies). Within a wave, phases keep a deterministic
+    order derived from declaration order.
+
+    Args:
+        phases (dict): Phase name -> phase config (with optional waitFor)
+        target_phase (Optional[str]): Limit the result to this phase and
+            everything it transitively waits for
+
+    Returns:
+        list: A list of waves, each a list of phase names
+
+    Raises:
+        ValueError if waitFor or target_phase references an unknown phase
+        ValueError if a circular dependency is detected
+    """
+    dependencies = {}
+    for name, config in phases.items():
+        dependencies[name] = phase_dependencies(config)
+        for dependency in dependencies[name]:
+            if dependency not in phases:
+                raise ValueError(
+                    f"Unknown phase referenced: {dependency} (in waitFor of {name})")
+
+    names = list(phases)
+    if target_phase is not None:
+        if target_phase not in phases:
+            raise ValueError(f"Unknown target phase: {target_phase}")
+        keep = set()
+        stack = [target_phase]
+        while stack:
+            name = stack.pop()
+            if name not in keep:
+                keep.add(name)
+                stack.extend(dependencies[name])
+        names = [name for name in names if name in keep]
+
+    indegree = {name: len(dependencies[name]) for name in names}
+    dependents = {name: [] for name in names}
+    for name in names:
+        for dependency in dependencies[name]:
+            dependents[dependency].append(name)
+
+    waves = []
+    placed = 0
+    wave = [name for name in names if indegree[name] == 0]
+    while wave:
+        waves.append(wave)
+        placed += len(wave)
+        next_wave = []
+        for name in wave:
+            for dependent in dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    next_wave.append(dependent)
+        wave = next_wave
+
+    if placed < len(names):
+        remaining = {name for name in names if indegree[name] > 0}
+        cycle = _find_cycle(remaining, dependencies)
+        raise ValueError(
+            f"Circular dependency detected involving phase: {cycle[0]} ({' -> '.join(cycle)})")
+    return waves
+
+
+def resolve_phase_order(phases, target_phase=None):
+    """Return phase names in an execution order that respects waitFor."""
+    return [name for wave in resolve_phase_waves(phases, target_phase) for name in wave]
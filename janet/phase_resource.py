@@ -1,11 +1,76 @@
+import json
+
+from .helpers import bounded_repr, intern_labels, intern_str
+from .structural_diff import content_hash
+
+
 class PhaseResource:
-    def __init__(self, spec):
-        self.kind = spec.get("kind", "Phase")
-        self.id = spec.get("id") or spec.get("name")
-        self.spec = spec
-        self.phase = spec.get("phase")
-        self.name = spec.get("name")
-        self.metadata = spec.get("metadata", {})
+    """
+    A plan resource keyed by ``(kind, id)``.
+
+    Instances use ``__slots__`` and intern kind, id and label strings, so the
+    hundreds of thousands of resources loaded for a diff share one copy of
+    each label key and value. A resource built with from_json() keeps the
+    encoded body and only decodes ``spec`` when it is first accessed; a diff
+    that only compares content hashes never decodes it at all.
+    """
+
+    __slots__ = ("kind", "id", "_spec", "_raw", "_content_hash")
+
+    def __init__(self, spec, content_hash=None):
+        self.kind = intern_str(spec.get("kind", "Phase"))
+        self.id = intern_str(spec.get("id") or spec.get("name"))
+        self._spec = intern_labels(spec)
+        self._raw = None
+        self._content_hash = content_hash
+
+    @classmethod
+    def from_json(cls, kind, id, body, content_hash):
+        """A resource whose spec stays encoded until first use."""
+        resource = cls.__new__(cls)
+        resource.kind = intern_str(kind)
+        resource.id = intern_str(id)
+        resource._spec = None
+        resource._raw = body
+        resource._content_hash = content_hash
+        return resource
+
+    @property
+    def spec(self):
+        if self._spec is None:
+            self._spec = intern_labels(json.loads(self._raw))
+            self._raw = None
+        return self._spec
+
+    @property
+    def name(self):
+        return self.spec.get("name")
+
+    @property
+    def phase(self):
+        return self.spec.get("phase")
+
+    @property
+    def metadata(self):
+        return self.spec.get("metadata", {})
+
+    @property
+    def content_hash(self):
+        """Merkle hash of the spec, computed once (or taken from stored state)."""
+        if self._content_hash is None:
+            self._content_hash = content_hash(self.spec)
+        return self._content_hash
+
+    def to_state(self):
+        return {"resource": self.spec, "contentHash": self.content_hash}
+
+    @classmethod
+    def from_state(cls, entry):
+        """Build from a state entry written by to_state(), or from a bare spec."""
+        if "resource" in entry and "contentHash" in entry:
+            return cls(entry["resource"], content_hash=entry["contentHash"])
+        return cls(entry)
 
     def __repr__(self):
-        return f"<PhaseResource kind={self.kind} id={self.id} phase={self.phase} name={self.name} spec={self.spec}>"
+        return (f"<PhaseResource kind={self.kind} id={self.id} phase={self.phase} "
+                f"name={self.name} spec={bounded_repr(self.spec)}>")
@@ -0,0 +1,152 @@
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .execution_result import ExecutionResult
+from .phase_executor import PhaseExecutor
+from .phase_order import phase_dependencies
+
+
+class PhaseRun:
+    """The outcome and timing of one scheduled phase."""
+
+    def __init__(self, phase):
+        self.phase = phase
+        self.status = "pending"
+        self.result = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def __repr__(self):
+        return f"<PhaseRun id={self.phase.id} status={self.status} started={self.started} finished={self.finished}>"
+
+
+class PhaseScheduler:
+    """
+    Run phases on a bounded worker pool in dependency order.
+
+    Dependencies come from each phase's ``waitFor`` (phases or dependsOn).
+    Phases that depend on something outside the scheduled set are treated
+    as already satisfied. A phase is dispatched as soon as everything it
+    waits for has finished, so the wall-clock time of a run follows the
+    critical path rather than the sum of all phases.
+
+    When a phase fails, its ``onFailure.action`` decides what happens next:
+
+    * ``continue``: dependents run as if it had succeeded
+    * ``raise``: nothing new is dispatched; running phases finish and every
+      phase not yet started is marked ``cancelled``
+    * otherwise: its dependents (transitively) are marked ``skipped`` while
+      independent phases carry on
+    """
+
+    def __init__(self, executor=None, max_workers=4, clock=time.time):
+        self.executor = executor or PhaseExecutor()
+        self.max_workers = max(1, max_workers)
+        self.clock = clock
+
+    def _graph(self, phases):
+        by_name = {}
+        for index, phase in enumerate(phases):
+            for key in {phase.id, phase.name} - {None}:
+                by_name.setdefault(key, []).append(index)
+
+        dependents = [[] for _ in phases]
+        waiting = [0] * len(phases)
+        for index, phase in enumerate(phases):
+            dependencies = {
+                dep_index
+                for name in phase_dependencies(phase.spec)
+                for dep_index in by_name.get(name, [])
+            }
+            waiting[index] = len(dependencies)
+            for dep_index in dependencies:
+                dependents[dep_index].append(index)
+
+        # Reject cycles up front rather than deadlocking half way through
+        remaining = list(waiting)
+        queue = deque(i for i, count in enumerate(remaining) if count == 0)
+        placed = 0
+        while queue:
+            index = queue.popleft()
+            placed += 1
+            for dependent in dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if placed < len(phases):
+            stuck = [phases[i].id for i, count in enumerate(remaining) if count > 0]
+            raise ValueError(f"Circular dependency detected among phases: {', '.join(map(str, stuck))}")
+        return waiting, dependents
+
+    def _execute(self, run):
+        run.started = self.clock()
+        try:
+            return self.executor.execute(run.phase)
+        except Exception as e:
+            return ExecutionResult(success=False, message=f"Phase raised {type(e).__name__}: {e}")
+        finally:
+            run.finished = self.clock()
+
+    def run(self, phases, on_complete=None):
+        """
+        Execute phases and return a PhaseRun per phase, in input order.
+        ``on_complete`` is called on the calling thread as each phase finishes.
+
+        Raises:
+            ValueError if the phases' waitFor dependencies form a cycle
+        """
+        phases = list(phases)
+        runs = [PhaseRun(phase) for phase in phases]
+        waiting, dependents = self._graph(phases)
+        ready = deque(i for i, count in enumerate(waiting) if count == 0)
+        cancelled = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while ready or running:
+                while ready and not cancelled and len(running) < self.max_workers:
+                    index = ready.popleft()
+                    runs[index].status = "running"
+                    running[pool.submit(self._execute, runs[index])] = index
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    run = runs[index]
+                    run.result = future.result()
+                    run.status = "succeeded" if run.result.success else "failed"
+                    if on_complete:
+                        on_complete(run)
+
+                    action = (run.phase.spec.get("onFailure") or {}).get("action")
+                    if run.result.success or action == "continue":
+                        for dependent in dependents[index]:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0 and runs[dependent].status == "pending":
+                                ready.append(dependent)
+                    elif action == "raise":
+                        cancelled = True
+                    else:
+                        self._skip_dependents(index, runs, dependents)
+
+        for run in runs:
+            if run.status == "pending":
+                run.status = "cancelled"
+        return runs
+
+    def _skip_dependents(self, index, runs, dependents):
+        stack = list(dependents[index])
+        while stack:
+            dependent = stack.pop()
+            if runs[dependent].status == "pending":
+                runs[dependent].status = "skipped"
+                stack.extend(dependents[dependent])
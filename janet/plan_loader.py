@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+import yaml
+
+try:
+    # libyaml-backed loader, several times faster than the pure Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+YAML_PATTERNS = ("*.yaml", "*.yml")
+
+
+def safe_load(stream):
+    """Parse a single YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def iter_plan_files(plan_dir, exclude=None):
+    """
+    Yield the YAML files in a plan directory in a stable (sorted) order.
+    Paths listed in ``exclude`` are skipped.
+    """
+    excluded = {Path(p).resolve() for p in exclude or []}
+    paths = set()
+    for pattern in YAML_PATTERNS:
+        paths.update(Path(plan_dir).glob(pattern))
+    for path in sorted(paths):
+        if path.is_file() and path.resolve() not in excluded:
+            yield path
+
+
+def iter_documents(path):
+    """
+    Yield every document in a YAML file as it is parsed.
+
+    The file is handed to the parser as a stream, so only the document
+    currently being built is held in memory. Empty documents are skipped.
+    A document that fails to parse ends the file with a warning, since the
+    parser cannot resynchronise past it.
+    """
+    with open(path, "r") as stream:
+        try:
+            for document in yaml.load_all(stream, Loader=SafeLoader):
+                if document is not None:
+                    yield document
+        except yaml.YAMLError as e:
+            print(f"Warning: Skipping rest of {path}: {e}", file=sys.stderr)
+
+
+def iter_plan_documents(plan_dir, exclude=None):
+    """Yield every document in every YAML file of a plan directory."""
+    for path in iter_plan_files(plan_dir, exclude=exclude):
+        yield from iter_documents(path)
@@ -1,41 +1,68 @@
+from collections.abc import Iterator
+
+from .label_index import LabelIndex
+from .phase_order import resolve_phase_order, resolve_phase_waves
 from .phase_resource import PhaseResource
 
 
 class PlanRenderer:
-    def __init__(self, raw_planfile):
+    def __init__(self, raw_planfile, resources=None):
+        self.label_index = LabelIndex()
+        self.all_resources = self.label_index.resources
+
         # Support both old interface (single plan dict) and new interface (list of manifests)
         if isinstance(raw_planfile, dict) and "phases" in raw_planfile:
             # New YAML format with phases array
             self.phases = raw_planfile["phases"]
-            self.all_resources = []
         elif isinstance(raw_planfile, dict) and "plan" in raw_planfile:
             # Old interface: single plan file
             self.plan_section = raw_planfile["plan"]
-            self.all_resources = []
-        elif isinstance(raw_planfile, list):
-            # New interface: list of manifests
-            try:
-                self.plan_section = next(
-                    doc["plan"] for doc in raw_planfile if isinstance(doc, dict) and "plan" in doc)
-                self.all_resources = [doc for doc in raw_planfile if isinstance(
-                    doc, dict) and "plan" not in doc]
-            except StopIteration:
+        elif isinstance(raw_planfile, (list, Iterator)):
+            # New interface: list of manifests, possibly streamed from a generator.
+            # Resources are indexed as they arrive, in a single pass.
+            self.plan_section = None
+            for doc in raw_planfile:
+                if not isinstance(doc, dict):
+                    continue
+                if "plan" in doc:
+                    if self.plan_section is None:
+                        self.plan_section = doc["plan"]
+                else:
+                    self.label_index.add(doc)
+            if self.plan_section is None:
                 raise ValueError("No plan document found in manifests")
         else:
             raise ValueError(
                 "PlanRenderer expects either a plan dict or list of manifests")
 
+        for resource in resources or []:
+            self.add_resource(resource)
+
+    def add_resource(self, resource):
+        """Index a resource document so selectors can match it.
+        Plan documents fed through the resource stream are ignored."""
+        if not isinstance(resource, dict):
+            return
+        if "plan" in resource or "phases" in resource:
+            return
+        self.label_index.add(resource)
+
     def render(self, target_phase=None):
         """Render plan into PMP-compliant Phase Manifest format."""
-        result = []
-        
+        return list(self.iter_render(target_phase))
+
+    def iter_render(self, target_phase=None):
+        """
+        Yield the Phase Manifest one document at a time: each Phase, followed
+        (in the legacy format) by the resources its selector matches. Phase
+        ordering is resolved up front, so errors surface on the first item.
+        """
         # Handle new phases array format (PMP-style)
         if hasattr(self, 'phases') and self.phases:
-            for phase in self.phases:
-                metadata = phase.get("metadata", {})
-                spec = phase.get("spec", {})
-                phase_id = metadata.get("name") or f"phase-{len(result)}"
-                
+            phases = self._array_phases()
+            for phase_id in self._resolve_phase_order(phases, target_phase):
+                spec = phases[phase_id]
+
                 # Convert to PMP format
                 pmp_phase = {
                     "Kind": "Phase",
@@ -50,9 +77,9 @@ class PlanRenderer:
                         "on_success": spec.get("onSuccess", {})
                     }
                 }
-                result.append(pmp_phase)
-            return result
-        
+                yield pmp_phase
+            return
+
         # Handle legacy plan format
         plan = self.plan_section
 
@@ -61,102 +88,91 @@ class PlanRenderer:
             target_phase = plan.get('targetPhase')
         default_mode = plan.get('defaultInstanceMode', 'immediate')
 
-        phases = {
-            k: v for k, v in plan.items()
-            if k not in ['targetPhase', 'defaultInstanceMode'] and isinstance(v, dict)
-        }
+        phases = self._legacy_phases(plan)
 
         ordered_phases = self._resolve_phase_order(phases, target_phase)
 
         for phase_name in ordered_phases:
             phase_config = phases[phase_name]
-            instance_mode = phase_config.get('instanceMode', default_mode)
-
-            # Create PMP-compliant phase
-            spec = {
-                'description': phase_config.get('description', ''),
-                'selector': self._convert_selector_to_snake_case(phase_config.get('selector', {})),
-                'instance_mode': instance_mode,
-                'wait_for': self._convert_wait_for_to_snake_case(phase_config.get('waitFor', {})),
-                'retry': phase_config.get('retry', {}),
-                'on_failure': phase_config.get('onFailure', {}),
-                'on_success': phase_config.get('onSuccess', {})
-            }
-            
-            pmp_phase = {
-                "Kind": "Phase",
-                "Id": phase_name,
-                "Spec": spec
-            }
-            result.append(pmp_phase)
+            yield self._render_legacy_phase(phase_name, phase_config, default_mode)
 
             # NEW: apply selector to find matching resources
             selector = phase_config.get('selector', {})
-            matched = self._select_resources(selector)
-            result.extend(matched)
+            yield from self._select_resources(selector)
 
-        return result
+    def _legacy_phases(self, plan):
+        """Return the phase definitions of a legacy plan section, keyed by name."""
+        return {
+            k: v for k, v in plan.items()
+            if k not in ['targetPhase', 'defaultInstanceMode'] and isinstance(v, dict)
+        }
+
+    def _render_legacy_phase(self, phase_name, phase_config, default_mode):
+        """Convert one legacy phase definition into a PMP-compliant Phase."""
+        instance_mode = phase_config.get('instanceMode', default_mode)
+
+        # Create PMP-compliant phase
+        spec = {
+            'description': phase_config.get('description', ''),
+            'selector': self._convert_selector_to_snake_case(phase_config.get('selector', {})),
+            'instance_mode': instance_mode,
+            'wait_for': self._convert_wait_for_to_snake_case(phase_config.get('waitFor', {})),
+            'retry': phase_config.get('retry', {}),
+            'on_failure': phase_config.get('onFailure', {}),
+            'on_success': phase_config.get('onSuccess', {})
+        }
+
+        return {
+            "Kind": "Phase",
+            "Id": phase_name,
+            "Spec": spec
+        }
 
     def _select_resources(self, selector):
         """
         Return all resources matching the selector.
-        For now, support matchLabels only.
+        Supports matchLabels and matchExpressions via the label index.
+        """
+        return self.label_index.select(selector)
+
+    def phase_waves(self, target_phase=None):
         """
-        match_labels = selector.get('matchLabels', {})
-        if not match_labels:
-            return []
+        Return the plan's phases grouped into dependency levels. Phases in
+        the same wave have no dependencies on each other and can run in
+        parallel.
+        """
+        if hasattr(self, 'phases'):
+            return resolve_phase_waves(self._array_phases(), target_phase or None)
+        plan = self.plan_section
+        if target_phase is None:
+            target_phase = plan.get('targetPhase')
+        return resolve_phase_waves(self._legacy_phases(plan), target_phase or None)
 
-        matches = []
-        for resource in self.all_resources:
-            labels = resource.get('metadata', {}).get('labels', {})
-            if all(labels.get(k) == v for k, v in match_labels.items()):
-                matches.append(resource)
-        return matches
+    def _array_phases(self):
+        """Return the specs of a phases-array plan keyed by phase id, in declaration order.
+
+        Raises:
+            ValueError if two phases share a name
+        """
+        phases = {}
+        for index, phase in enumerate(self.phases):
+            phase_id = phase.get("metadata", {}).get("name") or f"phase-{index}"
+            if phase_id in phases:
+                raise ValueError(f"Duplicate phase name: {phase_id}")
+            phases[phase_id] = phase.get("spec", {})
+        return phases
 
     def _resolve_phase_order(self, phases, target_phase=None):
         """
-        Returns a list of phases in execution order,
-        respecting waitFor dependencies, stopping at target_phase if given.
+        Returns a list of phases in execution order, respecting waitFor
+        dependencies (dependsOn or phases). With target_phase, only that
+        phase and what it transitively waits for are included.
 
         Raises:
             ValueError if a circular dependency is detected
             ValueError if waitFor references unknown phases
         """
-        visited = set()
-        temp_visited = set()
-        result = []
-
-        def visit(phase_name):
-            if phase_name in temp_visited:
-                raise ValueError(
-                    f"Circular dependency detected involving phase: {phase_name}")
-
-            if phase_name in visited:
-                return
-
-            if phase_name not in phases:
-                raise ValueError(f"Unknown phase referenced: {phase_name}")
-
-            temp_visited.add(phase_name)
-            wait_for = phases[phase_name].get('waitFor', {})
-            depends_on = wait_for.get('dependsOn')
-            if depends_on:
-                if isinstance(depends_on, str):
-                    depends_on = [depends_on]
-                for dep in depends_on:
-                    visit(dep)
-            temp_visited.remove(phase_name)
-            visited.add(phase_name)
-            result.append(phase_name)
-            if target_phase and phase_name == target_phase:
-                raise StopIteration
-
-        try:
-            for phase in phases:
-                visit(phase)
-        except StopIteration:
-            pass
-        return result
+        return resolve_phase_order(phases, target_phase or None)
 
     def _convert_selector_to_snake_case(self, selector):
         """Convert selector from camelCase to snake_case for PMP compatibility."""
@@ -167,6 +183,8 @@ class PlanRenderer:
         for key, value in selector.items():
             if key == "matchLabels":
                 result["match_labels"] = value
+            elif key == "matchExpressions":
+                result["match_expressions"] = value
             else:
                 result[key] = value
         return result
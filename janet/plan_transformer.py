@@ -1,4 +1,11 @@
+import time
+
 from .phase_executor import PhaseExecutor
+from .phase_scheduler import PhaseScheduler
+from .structural_diff import diff_patch, format_patch
+
+
+DEFAULT_MAX_WORKERS = 8
 
 
 class PlanTransformer:
@@ -6,6 +13,7 @@ class PlanTransformer:
         self.desired_resources = rendered_plan
         self.stored_state = stored_state
         self.environment_state = environment_state
+        self.runs = []
 
     def diff_against_state(self):
         """
@@ -22,53 +30,83 @@ class PlanTransformer:
         return self._compute_diff(self.stored_state, self.environment_state)
 
     def _compute_diff(self, desired, current):
-        # Classic 3-way diff algorithm
+        # Classic 3-way diff algorithm, comparing content hashes so unchanged
+        # resources never need a deep comparison. Equal hashes mean equal
+        # specs; differing ones are confirmed with == (hashes stored by an
+        # older janet may have been computed differently)
         adds = []
         updates = []
         deletes = []
+        patches = {}
 
         current_lookup = {(r.kind, r.id): r for r in current}
         desired_lookup = {(r.kind, r.id): r for r in desired}
 
         # Additions and updates
         for key, desired_r in desired_lookup.items():
-            if key not in current_lookup:
+            current_r = current_lookup.get(key)
+            if current_r is None:
                 adds.append(desired_r)
-            else:
-                current_r = current_lookup[key]
-                if desired_r.spec != current_r.spec:
-                    updates.append((current_r, desired_r))
+            elif desired_r.content_hash != current_r.content_hash and desired_r.spec != current_r.spec:
+                updates.append((current_r, desired_r))
+                patches[key] = diff_patch(current_r.spec, desired_r.spec)
 
         # Deletions
         for key, current_r in current_lookup.items():
             if key not in desired_lookup:
                 deletes.append(current_r)
 
-        return {"add": adds, "update": updates, "delete": deletes}
+        return {"add": adds, "update": updates, "delete": deletes, "patch": patches}
 
-    def apply(self, dry_run=False):
+    def describe(self, plan):
+        """
+        Operator approval summary of a diff: one line per resource, with the
+        exact fields changed by each update.
+        """
+        lines = []
+        for r in plan["add"]:
+            lines.append(f"+ {r.kind}/{r.id}")
+        for c, d in plan["update"]:
+            lines.append(f"~ {c.kind}/{c.id}")
+            lines.extend(format_patch(plan["patch"][(d.kind, d.id)]))
+        for r in plan["delete"]:
+            lines.append(f"- {r.kind}/{r.id}")
+        return "\n".join(lines)
+
+    def apply(self, dry_run=False, max_workers=DEFAULT_MAX_WORKERS):
         """
         Actually perform the plan.
         """
         plan = self.diff_against_state()
 
         # Always show execution logs, even for dry-run
-        self._execute_plan(plan, dry_run=dry_run)
+        self.runs = self._execute_plan(plan, dry_run=dry_run, max_workers=max_workers)
         return plan
 
-    def _execute_plan(self, plan, dry_run=False):
-        executor = PhaseExecutor()
+    def _execute_plan(self, plan, dry_run=False, max_workers=DEFAULT_MAX_WORKERS):
+        # Adds and updates run together so a waitFor can span both
+        headings = {}
         for r in plan["add"]:
-            result = executor.execute(r)
-            print(f"Creating: {r}")
-            for log in result.logs:
-                print(f"    {log}")
+            headings[id(r)] = f"Creating: {r}"
         for c, d in plan["update"]:
-            result = executor.execute(d)
-            print(f"Updating: {c.id}")
-            for log in result.logs:
+            headings[id(d)] = f"Updating: {c.id}"
+        phases = list(plan["add"]) + [d for _, d in plan["update"]]
+
+        started = time.time()
+
+        def report(run):
+            print(headings[id(run.phase)])
+            for log in run.result.logs:
                 print(f"    {log}")
+            print(f"    [{run.started - started:+.3f}s .. {run.finished - started:+.3f}s] {run.status}")
+
+        scheduler = PhaseScheduler(PhaseExecutor(), max_workers=max_workers)
+        runs = scheduler.run(phases, on_complete=report)
+        for run in runs:
+            if run.status in ("skipped", "cancelled"):
+                print(f"Not run ({run.status}): {run.phase.id}")
         for r in plan["delete"]:
             print(f"Deleting: {r}")
         if dry_run:
             print("(dry-run: no changes made)")
+        return runs
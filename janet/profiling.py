@@ -0,0 +1,206 @@
+"""
+Timed spans around the stages of janet's commands.
+
+Code wraps a stage in ``with span("render"):``. While nobody listens, that
+costs one list check. Embedding code can collect the spans in either of
+two ways:
+
+* ``add_hook(callback)`` passes every finished Span to ``callback``.
+* ``Profiler`` records them and exports them as Chrome trace events, for
+  chrome://tracing or https://ui.perfetto.dev. ``janet --profile`` uses it.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+_hooks = []
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+
+
+def add_hook(callback):
+    """Call ``callback(span)`` for every span that finishes from now on.
+
+    Returns:
+        callable: ``callback``, so this can be used as a decorator
+    """
+    _hooks.append(callback)
+    return callback
+
+
+def remove_hook(callback):
+    """Stop calling a hook added with add_hook(); unknown hooks are ignored."""
+    try:
+        _hooks.remove(callback)
+    except ValueError:
+        pass
+
+
+def span(name, category="janet", **args):
+    """Time the enclosed block as a stage called ``name``.
+
+    Args:
+        name (str): The stage, e.g. "render" or "serialize"
+        category (str): Grouping shown by trace viewers
+        **args: Details attached to the span, e.g. the file being read
+
+    Returns:
+        A context manager; a shared no-op one when no hook is listening
+    """
+    if not _hooks:
+        return _NULL
+    return Span(name, category, args)
+
+
+def _tracemalloc():
+    # Only a Profiler starts tracing, and it imports tracemalloc first, so
+    # spans never import it themselves and `import janet.cli` stays cheap
+    return sys.modules.get("tracemalloc")
+
+
+def _memory_stack():
+    stack = getattr(_local, "peaks", None)
+    if stack is None:
+        stack = _local.peaks = []
+    return stack
+
+
+class Span:
+    """
+    One timed stage. ``start`` and ``duration`` are in microseconds;
+    ``peak_bytes`` is how far traced memory rose above its level at the
+    start of the span, or None when tracemalloc is not tracing.
+    """
+
+    __slots__ = ("name", "category", "args", "start", "duration", "depth", "thread_id",
+                 "peak_bytes", "_memory_start")
+
+    def __init__(self, name, category="janet", args=None):
+        self.name = name
+        self.category = category
+        self.args = args or {}
+        self.start = None
+        self.duration = None
+        self.depth = 0
+        self.thread_id = threading.get_ident()
+        self.peak_bytes = None
+        self._memory_start = None
+
+    def __enter__(self):
+        stack = _memory_stack()
+        self.depth = len(stack)
+        tracemalloc = _tracemalloc()
+        if tracemalloc is not None and tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+            # reset_peak() is process-wide, so fold the enclosing span's peak so far into its entry first
+            current, peak = tracemalloc.get_traced_memory()
+            if stack and stack[-1] is not None:
+                stack[-1] = max(stack[-1], peak)
+            tracemalloc.reset_peak()
+            self._memory_start = current
+            stack.append(current)
+        else:
+            stack.append(None)
+        self.start = time.perf_counter_ns() // 1000
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter_ns() // 1000 - self.start
+        stack = _memory_stack()
+        peak = stack.pop()
+        tracemalloc = _tracemalloc()
+        if peak is not None and tracemalloc is not None and tracemalloc.is_tracing():
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            self.peak_bytes = peak - self._memory_start
+            if stack and stack[-1] is not None:
+                stack[-1] = max(stack[-1], peak)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        for hook in list(_hooks):
+            hook(self)
+        return False
+
+    def __repr__(self):
+        return f"Span(name={self.name}, duration={self.duration}us, peak_bytes={self.peak_bytes})"
+
+
+class Profiler:
+    """
+    Collect spans while active, optionally tracing memory with tracemalloc.
+
+        with Profiler() as profiler:
+            cli.render_plan()
+        profiler.write("trace.json")
+        print(profiler.summary())
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.spans = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        import tracemalloc
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        add_hook(self.spans.append)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import tracemalloc
+
+        remove_hook(self.spans.append)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def to_chrome_trace(self):
+        """The spans as Chrome trace-event JSON ("X" complete events, times in microseconds).
+
+        Returns:
+            dict: ``{"traceEvents": [...], "displayTimeUnit": "ms"}``
+        """
+        pid = os.getpid()
+        events = []
+        for s in sorted(self.spans, key=lambda s: (s.start, -s.duration)):
+            args = dict(s.args)
+            if s.peak_bytes is not None:
+                args["peak_bytes"] = s.peak_bytes
+            events.append({"name": s.name, "cat": s.category, "ph": "X", "ts": s.start, "dur": s.duration,
+                           "pid": pid, "tid": s.thread_id, "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Write the Chrome trace to ``path``."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+    def summary(self):
+        """One line: the outermost span's time, its stages' totals, and the peak memory.
+
+        Returns:
+            str: e.g. ``janet render 84.1ms: read 0.2ms, expand 61.0ms, render 20.3ms, other 2.6ms, peak 3.1 MiB``
+        """
+        if not self.spans:
+            return "No spans recorded"
+        top = min(s.depth for s in self.spans)
+        roots = [s for s in self.spans if s.depth == top]
+        stages = {}
+        for s in self.spans:
+            if s.depth == top + 1:
+                stages[s.name] = stages.get(s.name, 0) + s.duration
+        total = sum(s.duration for s in roots)
+        parts = [f"{name} {duration / 1000:.1f}ms" for name, duration in stages.items()]
+        if stages:
+            # Time outside any stage: lazy imports, cache setup, printing
+            parts.append(f"other {max(total - sum(stages.values()), 0) / 1000:.1f}ms")
+        peaks = [s.peak_bytes for s in roots if s.peak_bytes is not None]
+        if peaks:
+            parts.append(f"peak {max(peaks) / (1024 * 1024):.1f} MiB")
+        head = f"{' + '.join(dict.fromkeys(s.name for s in roots))} {total / 1000:.1f}ms"
+        return f"{head}: {', '.join(parts)}" if parts else head
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from .version import __version__
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_home():
+    """Return Janet's cache root, honouring JANET_CACHE_DIR and XDG_CACHE_HOME."""
+    override = os.environ.get("JANET_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "janet"
+
+
+def default_cache_dir():
+    """Return the render cache directory."""
+    return cache_home() / "render"
+
+
+def default_max_bytes():
+    value = os.environ.get("JANET_CACHE_MAX_BYTES")
+    return int(value) if value else DEFAULT_MAX_BYTES
+
+
+class RenderCache:
+    """
+    Content-addressed on-disk cache of rendered manifests.
+
+    Entries are keyed on a hash of the source file bytes, the macro context
+    handed to Meatball and the Janet version, so a hit can skip expansion
+    and rendering entirely. Files read by macros at expansion time are not
+    part of the key; use --no-cache when a plan depends on them.
+
+    Entry mtimes record last use, and the oldest entries are evicted once
+    the cache grows past ``max_bytes``.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+
+    @staticmethod
+    def compute_key(source_paths, context, options=None):
+        """Hash the sources, macro context, options and Janet version into a cache key.
+
+        Args:
+            source_paths (list): Files whose bytes determine the render
+            context (dict): Macro context passed to Meatball
+            options (Optional[dict]): Render options that change the output
+
+        Returns:
+            str: Hex digest identifying the render
+        """
+        digest = hashlib.sha256()
+        header = {
+            "version": __version__,
+            "context": context,
+            "options": options or {},
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+        for path in source_paths:
+            digest.update(b"\0" + os.path.basename(path).encode("utf-8") + b"\0")
+            with open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(1 << 16), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def get(self, key):
+        """Return the cached manifest for a key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as entry:
+                manifest = json.load(entry)
+        except (OSError, ValueError):
+            return None
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return manifest
+
+    def put(self, key, manifest):
+        """Store a manifest atomically, then evict down to the size bound."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(manifest, tmp, separators=(",", ":"))
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def _entries(self):
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        """Return entry count and size information for the cache."""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        """Remove every cache entry and return how many were removed."""
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def _redis_unavailable():
+    """Re-raise Redis error replies (READONLY, OOM, ...) as OSError, like a lost connection."""
+    from plantangenet.storage import RedisError
+
+    try:
+        yield
+    except RedisError as e:
+        raise OSError(f"Redis render cache: {e}") from e
+
+
+class RedisRenderCache(RenderCache):
+    """
+    Render cache shared through Redis, so CI runners reuse each other's renders.
+
+    Keys are the same as RenderCache's. Entries expire after ``ttl`` seconds
+    rather than being evicted by size, and with a client-side caching
+    connector, repeated lookups of a hot render are served from memory
+    until another client changes it.
+    """
+
+    PREFIX = "janet:render:"
+
+    def __init__(self, connector, ttl=None):
+        self.connector = connector
+        self.ttl = ttl
+        self.max_bytes = None
+        self.directory = f"redis://{connector.host}:{connector.port}/{connector.db} ({self.PREFIX}*)"
+
+    def get(self, key):
+        try:
+            with _redis_unavailable():
+                value = self.connector.get(self.PREFIX + key)
+        except OSError:
+            # The cache is an optimization; an unreachable or failing server is a miss
+            return None
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def put(self, key, manifest):
+        with _redis_unavailable():
+            self.connector.set(self.PREFIX + key, json.dumps(manifest, separators=(",", ":")), ex=self.ttl)
+
+    def evict(self):
+        return 0
+
+    def _keys(self):
+        return list(self.connector.scan_iter(self.PREFIX + "*"))
+
+    def stats(self):
+        with _redis_unavailable():
+            keys = self._keys()
+            with self.connector.pipeline() as pipe:
+                for key in keys:
+                    pipe.execute_command("STRLEN", key)
+                sizes = pipe.execute()
+        return {
+            "directory": self.directory,
+            "entries": len(keys),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with _redis_unavailable():
+            keys = self._keys()
+            return self.connector.delete(*keys) if keys else 0
+
+    def close(self):
+        self.connector.close()
+
+
+def open_render_cache():
+    """
+    Return the render cache to use: Redis when ``JANET_CACHE_REDIS`` holds a
+    URL (entries expire after ``JANET_CACHE_TTL`` seconds, if set),
+    otherwise the on-disk cache. Call ``close()`` on it when done.
+
+    Raises:
+        OSError: If the Redis server cannot be reached or refuses the connection
+    """
+    url = os.environ.get("JANET_CACHE_REDIS")
+    if not url:
+        return RenderCache()
+    from plantangenet.storage import RedisConnector
+
+    ttl = os.environ.get("JANET_CACHE_TTL")
+    connector = RedisConnector(url=url, client_cache=True)
+    try:
+        with _redis_unavailable():
+            connector.connect()
+    except OSError:
+        connector.close()
+        raise
+    return RedisRenderCache(connector, ttl=int(ttl) if ttl else None)
+
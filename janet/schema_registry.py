@@ -0,0 +1,218 @@
+import json
+import os
+from pathlib import Path
+
+from jsonschema.validators import validator_for
+
+from .helpers import atomic_write_text
+from .render_cache import cache_home
+from .version import __version__
+
+try:
+    # Optional: generates plain Python validators, used as a fast accept path
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+class SchemaNotFoundError(ValueError):
+    pass
+
+
+def default_schema_dir():
+    """Return the schemas/ tree shipped inside the janet package, or JANET_SCHEMA_DIR when set."""
+    override = os.environ.get("JANET_SCHEMA_DIR")
+    if override:
+        return Path(override)
+    return Path(__file__).resolve().parent / "schemas"
+
+
+def format_error(error):
+    """Render a jsonschema ValidationError as ``path: message``."""
+    path = "/".join(str(p) for p in error.absolute_path)
+    return f"{path or '<root>'}: {error.message}"
+
+
+class CompiledSchema:
+    """
+    A schema compiled for repeated use.
+
+    Holds a ready jsonschema validator and, when fastjsonschema is installed,
+    a validator it generated in this process that accepts valid documents
+    cheaply. Invalid documents are always re-checked with jsonschema so
+    every error is reported, not just the first.
+    """
+
+    def __init__(self, schema, checked=False):
+        cls = validator_for(schema)
+        if not checked:
+            cls.check_schema(schema)
+        self.schema = schema
+        self.validator = cls(schema)
+        self.fast = None
+        if fastjsonschema is not None:
+            try:
+                self.fast = fastjsonschema.compile(schema, use_default=False, detailed_exceptions=False)
+            except Exception:
+                # Unsupported by the code generator; jsonschema alone still works
+                self.fast = None
+
+    def iter_errors(self, document):
+        """Return every validation error for a document as ``path: message`` strings."""
+        if self.fast is not None:
+            try:
+                self.fast(document)
+                return []
+            except Exception:
+                pass
+        errors = sorted(self.validator.iter_errors(document),
+                        key=lambda e: list(map(str, e.absolute_path)))
+        return [format_error(e) for e in errors]
+
+
+class SchemaRegistry:
+    """
+    Compiled validators for the bundled schemas, dispatched by apiVersion/kind.
+
+    Every schema is loaded, meta-checked and compiled once per process and
+    the resulting validators are reused for every document. The schema tree
+    is also written to a bundle in the Janet cache, as plain schema JSON;
+    later runs that find the bundle up to date skip re-reading and
+    re-checking the individual schema files. Validators are never loaded
+    from the bundle, only compiled in-process from the schemas.
+    """
+
+    PLAN_SCHEMA = "plan.json"
+
+    _default = None
+
+    def __init__(self, schema_dir=None, bundle_path=None):
+        self.schema_dir = Path(schema_dir) if schema_dir else default_schema_dir()
+        self.bundle_path = Path(bundle_path) if bundle_path else cache_home() / "schemas.json"
+        self.validators = {}
+        self.plan_validator = None
+        self._compiled = {}
+
+        schemas, cached = self._load()
+        self.schemas = {}
+        for relative, schema in schemas.items():
+            compiled = CompiledSchema(schema, checked=True)
+            self.schemas[relative] = compiled
+            if relative == self.PLAN_SCHEMA:
+                self.plan_validator = compiled
+                continue
+            properties = schema.get("properties", {})
+            api_versions = properties.get("apiVersion", {}).get("enum") or [str(Path(relative).parent)]
+            kinds = properties.get("kind", {}).get("enum") or [Path(relative).stem]
+            for api_version in api_versions:
+                for kind in kinds:
+                    self.validators[(api_version, kind)] = compiled
+
+        if not cached:
+            self._save(schemas)
+
+    @classmethod
+    def default(cls):
+        """Return the process-wide registry for the default schema tree."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def plan_schema(self):
+        """
+        The plan schema.
+
+        Raises:
+            SchemaNotFoundError: If the schema tree has no plan.json; validating
+                against an empty schema would accept every plan
+        """
+        if self.plan_validator is None:
+            raise SchemaNotFoundError(f"Plan schema {self.PLAN_SCHEMA} not found in {self.schema_dir}")
+        return self.plan_validator.schema
+
+    def _schema_files(self):
+        if not self.schema_dir.is_dir():
+            return {}
+        files = {}
+        for path in sorted(self.schema_dir.rglob("*.json")):
+            stat = path.stat()
+            files[path.relative_to(self.schema_dir).as_posix()] = [stat.st_mtime_ns, stat.st_size]
+        return files
+
+    def _bundle_header(self):
+        return {
+            "version": __version__,
+            "schema_dir": str(self.schema_dir),
+            "files": self._schema_files(),
+        }
+
+    def _load(self):
+        """Load the schema tree, preferring an up-to-date cached bundle.
+
+        Returns:
+            tuple: ``(schemas, loaded_from_bundle)``
+        """
+        header = self._bundle_header()
+        try:
+            with open(self.bundle_path, "r") as f:
+                bundle = json.load(f)
+            if all(bundle.get(k) == v for k, v in header.items()):
+                return bundle["schemas"], True
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+        schemas = {}
+        for relative in header["files"]:
+            with open(self.schema_dir / relative, "r") as f:
+                schema = json.load(f)
+            validator_for(schema).check_schema(schema)
+            schemas[relative] = schema
+        return schemas, False
+
+    def _save(self, schemas):
+        bundle = self._bundle_header()
+        bundle["schemas"] = schemas
+        try:
+            self.bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.bundle_path, json.dumps(bundle, separators=(",", ":")))
+        except OSError:
+            # The bundle is only an optimisation
+            pass
+
+    def compile(self, schema):
+        """Return a (cached) compiled validator for an arbitrary schema."""
+        key = json.dumps(schema, sort_keys=True)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compiled[key] = CompiledSchema(schema)
+        return compiled
+
+    def validator_for(self, document):
+        """
+        Pick the validator for a document: per-kind schemas by
+        apiVersion/kind, the plan schema for legacy ``plan:`` files.
+
+        Returns:
+            The compiled validator, or None when no schema applies
+        """
+        if not isinstance(document, dict):
+            return None
+        if "apiVersion" in document or "kind" in document:
+            return self.validators.get((document.get("apiVersion"), document.get("kind")))
+        if "plan" in document:
+            return self.plan_validator
+        return None
+
+    def iter_errors(self, document, validator=None):
+        """
+        Validate a document in one pass and return every error message.
+
+        Returns:
+            Optional[list]: Error strings (empty when valid), or None when
+            no schema applies to the document
+        """
+        validator = validator or self.validator_for(document)
+        if validator is None:
+            return None
+        return validator.iter_errors(document)
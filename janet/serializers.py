@@ -0,0 +1,85 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+FORMATS = ("json", "canonical", "yaml", "ndjson")
+
+
+def _yaml_dumper():
+    import yaml
+    return getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def dump_json(data, compact=False):
+    """
+    Serialize to JSON bytes, using orjson when it is installed.
+
+    Output is two-space indented, or has no whitespace at all when compact,
+    and non-ASCII text is written as raw UTF-8 rather than ``\\u`` escapes.
+    The two encoders decode to the same values but are not byte-identical:
+    orjson spells some floats differently (``1e20`` rather than ``1e+20``)
+    and writes NaN and infinities as ``null``. Use ``dump_canonical`` where
+    the bytes must not depend on the environment.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # Types orjson will not handle (e.g. ints beyond 64 bits) take the slow path
+            pass
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dump_canonical(data):
+    """
+    Serialize to canonical JSON: sorted keys, no whitespace, UTF-8.
+
+    Always uses the standard library encoder so the bytes for a given
+    manifest are identical whether or not orjson is installed.
+    """
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def iter_ndjson(documents):
+    """Yield each document as one line of compact JSON, newline included."""
+    for document in documents:
+        yield dump_json(document, compact=True) + b"\n"
+
+
+def dump_yaml(data, compact=False):
+    """Serialize to YAML bytes with the libyaml emitter when PyYAML was built with it."""
+    import yaml
+    return yaml.dump(data, Dumper=_yaml_dumper(), default_flow_style=True if compact else False,
+                     width=2 ** 31 - 1 if compact else 80, encoding="utf-8")
+
+
+def dumps(data, output_format="json", compact=False):
+    """
+    Serialize a rendered manifest.
+
+    Args:
+        data: The manifest
+        output_format (str): One of FORMATS
+        compact (bool): Drop indentation and line breaks where the format allows
+
+    Returns:
+        bytes: The encoded manifest
+    """
+    if output_format == "json":
+        return dump_json(data, compact)
+    if output_format == "canonical":
+        return dump_canonical(data)
+    if output_format == "yaml":
+        return dump_yaml(data, compact)
+    if output_format == "ndjson":
+        return b"".join(iter_ndjson(data))
+    raise ValueError(f"Unknown output format: {output_format}")
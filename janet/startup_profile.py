@@ -0,0 +1,74 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+# Runs in a fresh interpreter: build the CLI, import what the command needs,
+# and report how long that took from the first line of the script
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+from janet.cli import JanetCLI, preload_command
+JanetCLI()
+missing = preload_command(sys.argv[1])
+print(time.perf_counter() - started)
+print(",".join(missing))
+"""
+
+
+def profile_command(command, repeat=5):
+    """
+    Measure cold start for one command across ``repeat`` fresh interpreters.
+
+    Returns:
+        dict: Median/min wall time of the whole process, median in-process
+        import time (all in ms), and modules that failed to import
+    """
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    walls = []
+    imports = []
+    missing = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE, command],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+        walls.append((time.perf_counter() - started) * 1000)
+        imports.append(float(output[0]) * 1000)
+        missing = [m for m in output[1].split(",") if m] if len(output) > 1 else []
+    return {
+        "command": command,
+        "wall_ms": statistics.median(walls),
+        "wall_min_ms": min(walls),
+        "import_ms": statistics.median(imports),
+        "missing": missing,
+    }
+
+
+def run_startup_profile(commands, repeat=5, budget_ms=None):
+    """
+    Print a cold-start table for each command.
+
+    Returns:
+        int: 1 if any command's median wall time exceeds ``budget_ms``, else 0
+    """
+    baseline = profile_command("--help", repeat)
+    print(f"{'command':<10} {'wall ms':>9} {'min ms':>8} {'imports ms':>11}  notes")
+    over_budget = False
+    for result in [baseline] + [profile_command(c, repeat) for c in commands]:
+        notes = []
+        if result["missing"]:
+            notes.append("missing: " + ", ".join(result["missing"]))
+        if budget_ms is not None and result["wall_ms"] > budget_ms:
+            over_budget = True
+            notes.append(f"over budget ({budget_ms:.0f}ms)")
+        print(f"{result['command']:<10} {result['wall_ms']:>9.1f} {result['wall_min_ms']:>8.1f} "
+              f"{result['import_ms']:>11.1f}  {'; '.join(notes)}")
+    return 1 if over_budget else 0
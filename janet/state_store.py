@@ -0,0 +1,333 @@
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from .helpers import load_state_file, save_state_file
+from .phase_resource import PhaseResource
+
+
+STATE_DB = ".plan_state.db"
+STATE_JSON = ".plan_state.json"
+
+
+def _state_id(kind, id):
+    """The id a resource is stored under; resources without one cannot be stored."""
+    if id is None:
+        raise ValueError(f"Cannot store a {kind} resource without an id (metadata.name)")
+    return str(id)
+
+
+def load_state_resources(directory):
+    """
+    Read the PhaseResources in ``directory/.plan_state.json``.
+
+    The file may be a bare list of resources, as older versions wrote it,
+    or ``{"resources": [...]}``.
+
+    Raises:
+        ValueError: If the file is not valid JSON or an entry is not an object
+    """
+    state = load_state_file(directory)
+    entries = state.get("resources", []) if isinstance(state, dict) else state
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError(f"{Path(directory) / STATE_JSON} must hold a list of resources")
+    return [PhaseResource.from_state(entry) for entry in entries]
+
+
+class StateStore(ABC):
+    """
+    Applied plan state, keyed by ``(kind, id)``.
+
+    Backends implement ``get``, ``__iter__``, ``__len__`` and ``commit``;
+    everything else is built on those.
+    """
+
+    @abstractmethod
+    def get(self, kind, id):
+        """The stored PhaseResource, or None."""
+
+    @abstractmethod
+    def __iter__(self):
+        """Iterate over the stored PhaseResources."""
+
+    @abstractmethod
+    def __len__(self):
+        """Number of stored resources."""
+
+    @abstractmethod
+    def commit(self, upserts=(), deletes=()):
+        """
+        Atomically upsert PhaseResources and delete ``(kind, id)`` keys.
+
+        Raises:
+            ValueError: If a resource to upsert has no id
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def resources(self):
+        return list(self)
+
+    def apply_plan(self, plan):
+        """Record a diff from PlanTransformer as applied, touching only what changed."""
+        upserts = list(plan["add"]) + [d for _, d in plan["update"]]
+        deletes = [(r.kind, r.id) for r in plan["delete"]]
+        self.commit(upserts, deletes)
+
+    def export_json(self, directory):
+        """
+        Write the state as a ``.plan_state.json`` file in ``directory``.
+        Each entry keeps its content hash, so importing it back does not re-hash.
+        """
+        save_state_file(directory, {"resources": [r.to_state() for r in self]})
+
+    def import_json(self, directory):
+        """Replace the state with the contents of ``directory/.plan_state.json``."""
+        resources = load_state_resources(directory)
+        keep = {(r.kind, r.id) for r in resources}
+        stale = [(r.kind, r.id) for r in self if (r.kind, r.id) not in keep]
+        self.commit(resources, stale)
+
+
+class JSONStateStore(StateStore):
+    """The original whole-file ``.plan_state.json`` format, rewritten on every commit."""
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        resources = load_state_resources(directory)
+        self._resources = {(r.kind, None if r.id is None else str(r.id)): r for r in resources}
+
+    def get(self, kind, id):
+        return self._resources.get((kind, None if id is None else str(id)))
+
+    def __iter__(self):
+        return iter(list(self._resources.values()))
+
+    def __len__(self):
+        return len(self._resources)
+
+    def commit(self, upserts=(), deletes=()):
+        resources = dict(self._resources)
+        for kind, id in deletes:
+            resources.pop((kind, None if id is None else str(id)), None)
+        for r in upserts:
+            resources[(r.kind, _state_id(r.kind, r.id))] = r
+        save_state_file(self.directory, {"resources": [r.to_state() for r in resources.values()]})
+        self._resources = resources
+
+
+class SQLiteStateStore(StateStore):
+    """
+    State in an embedded SQLite database with one row per resource.
+
+    Rows are keyed on ``(kind, id)`` and carry the resource's content hash,
+    so a commit touches only the changed rows inside one transaction and
+    iteration streams rows without re-hashing, decoding bodies only when a
+    resource's spec is read.
+    """
+
+    BATCH = 1000
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS resources ("
+            " kind TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " PRIMARY KEY (kind, id)"
+            ") WITHOUT ROWID")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def _resource(row):
+        # Bodies are decoded only if something reads the spec
+        return PhaseResource.from_json(*row)
+
+    def get(self, kind, id):
+        if id is None:
+            return None
+        row = self.connection.execute(
+            "SELECT kind, id, body, content_hash FROM resources WHERE kind = ? AND id = ?",
+            (kind, str(id))).fetchone()
+        return self._resource(row) if row else None
+
+    def __iter__(self):
+        cursor = self.connection.execute(
+            "SELECT kind, id, body, content_hash FROM resources ORDER BY kind, id")
+        while True:
+            rows = cursor.fetchmany(self.BATCH)
+            if not rows:
+                return
+            for row in rows:
+                yield self._resource(row)
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def hashes(self):
+        """``{(kind, id): content_hash}`` without loading any resource bodies."""
+        return {(kind, id): h for kind, id, h in
+                self.connection.execute("SELECT kind, id, content_hash FROM resources")}
+
+    def commit(self, upserts=(), deletes=()):
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM resources WHERE kind = ? AND id = ?",
+                ((kind, str(id)) for kind, id in deletes if id is not None))
+            self.connection.executemany(
+                "INSERT INTO resources (kind, id, content_hash, body) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (kind, id) DO UPDATE SET"
+                " content_hash = excluded.content_hash, body = excluded.body"
+                " WHERE content_hash != excluded.content_hash",
+                ((r.kind, _state_id(r.kind, r.id), r.content_hash, json.dumps(r.spec, separators=(",", ":"), default=str))
+                 for r in upserts))
+
+
+class RedisStateStore(StateStore):
+    """
+    State shared through Redis, so several runners see the same applied plan.
+
+    Each resource is one key holding its content hash and encoded body, and
+    a set indexes the keys in a namespace. Commits run as one MULTI/EXEC
+    transaction; iteration fetches bodies with batched MGETs and, like the
+    SQLite store, leaves them encoded until a spec is read.
+
+    ``connector`` is a ``plantangenet.storage.RedisConnector`` (or anything
+    with the same get/mget/scard/smembers/pipeline methods).
+    """
+
+    BATCH = 1000
+
+    def __init__(self, connector, namespace="default"):
+        self.connector = connector
+        self.prefix = f"janet:state:{namespace}:"
+        self.index = self.prefix + "index"
+
+    def close(self):
+        self.connector.close()
+
+    @staticmethod
+    def _member(kind, id):
+        return json.dumps([kind, _state_id(kind, id)], separators=(",", ":"))
+
+    def _key(self, member):
+        if isinstance(member, bytes):
+            member = member.decode("utf-8")
+        return self.prefix + "r:" + member
+
+    @staticmethod
+    def _resource(kind, id, value):
+        content_hash, body = value.split(b"\n", 1)
+        return PhaseResource.from_json(kind, id, body, content_hash.decode("ascii"))
+
+    def get(self, kind, id):
+        if id is None:
+            return None
+        value = self.connector.get(self._key(self._member(kind, id)))
+        return self._resource(kind, str(id), value) if value is not None else None
+
+    def _members(self):
+        return sorted(self.connector.smembers(self.index))
+
+    def __iter__(self):
+        members = self._members()
+        for start in range(0, len(members), self.BATCH):
+            batch = members[start:start + self.BATCH]
+            values = self.connector.mget([self._key(m) for m in batch])
+            for member, value in zip(batch, values):
+                if value is not None:
+                    yield self._resource(*json.loads(member), value)
+
+    def __len__(self):
+        return self.connector.scard(self.index)
+
+    def hashes(self):
+        """``{(kind, id): content_hash}``, reading only the hash prefix of each value."""
+        hashes = {}
+        members = self._members()
+        for start in range(0, len(members), self.BATCH):
+            batch = members[start:start + self.BATCH]
+            for member, value in zip(batch, self.connector.mget([self._key(m) for m in batch])):
+                if value is not None:
+                    hashes[tuple(json.loads(member))] = value.split(b"\n", 1)[0].decode("ascii")
+        return hashes
+
+    def commit(self, upserts=(), deletes=()):
+        removed = [self._member(kind, id) for kind, id in deletes if id is not None]
+        values = {}
+        for r in upserts:
+            body = json.dumps(r.spec, separators=(",", ":"), default=str)
+            values[self._member(r.kind, r.id)] = f"{r.content_hash}\n{body}".encode("utf-8")
+        if not removed and not values:
+            return
+        with self.connector.pipeline(transaction=True) as pipe:
+            if removed:
+                pipe.delete(*[self._key(m) for m in removed])
+                pipe.srem(self.index, *removed)
+            if values:
+                pipe.mset({self._key(m): v for m, v in values.items()})
+                pipe.sadd(self.index, *values)
+            pipe.execute()
+
+
+def open_state_store(directory=".", backend="sqlite", url=None, namespace=None):
+    """
+    Open the state store for a plan directory.
+
+    The first time the SQLite or Redis backend is opened next to an existing
+    ``.plan_state.json``, that file is imported so no applied state is lost.
+    The Redis backend connects to ``url`` (default: ``JANET_STATE_REDIS``)
+    and keeps the state under ``namespace``, which defaults to the name of
+    the plan directory.
+
+    Raises:
+        ValueError: If the backend is unknown or ``.plan_state.json`` cannot be read
+    """
+    if backend == "json":
+        return JSONStateStore(directory)
+    if backend == "redis":
+        from plantangenet.storage import RedisConnector
+
+        url = url or os.environ.get("JANET_STATE_REDIS") or "redis://localhost:6379"
+        store = RedisStateStore(RedisConnector(url=url).connect(),
+                                namespace or Path(directory).resolve().name)
+        if not len(store) and (Path(directory) / STATE_JSON).exists():
+            try:
+                store.import_json(directory)
+            except BaseException:
+                store.close()
+                raise
+        return store
+    if backend != "sqlite":
+        raise ValueError(f"Unknown state backend: {backend}")
+    path = Path(directory) / STATE_DB
+    fresh = not path.exists()
+    store = SQLiteStateStore(path)
+    if fresh and (Path(directory) / STATE_JSON).exists():
+        try:
+            store.import_json(directory)
+        except BaseException:
+            # An empty database would shadow the JSON state on the next open
+            store.close()
+            for leftover in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+                if leftover.exists():
+                    leftover.unlink()
+            raise
+    return store
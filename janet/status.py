@@ -0,0 +1,212 @@
+import asyncio
+import json
+from collections import Counter, OrderedDict
+
+import requests
+
+
+# Lifecycle events on plan.session.<id>.events, mapped onto phase statuses
+EVENT_STATUSES = {
+    "start": "running",
+    "started": "running",
+    "complete": "complete",
+    "completed": "complete",
+    "fail": "failed",
+    "failed": "failed",
+}
+
+
+def parse_status_payload(data):
+    """
+    Normalize a status document into a list of ``{"phaseId", "status", ...}``
+    updates. Accepts a list of updates, ``{"phases": [...]}`` or
+    ``{"phases": {phase_id: status}}``.
+    """
+    if isinstance(data, dict):
+        data = data.get("phases", [])
+    if isinstance(data, dict):
+        return [{"phaseId": phase_id, "status": status} for phase_id, status in data.items()]
+    return [update for update in data if isinstance(update, dict) and "phaseId" in update]
+
+
+class PhaseStatusTable:
+    """
+    In-memory phase status, updated incrementally.
+
+    Each update touches one entry plus the per-status counts, so rendering
+    the summary never rescans the session however many phases it has.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counts = Counter()
+        self.recent = OrderedDict()
+        self.version = 0
+        # Shown after the summary, e.g. when the table lacks a full snapshot
+        self.note = None
+        # Messages that were not a JSON object and were ignored
+        self.malformed = 0
+
+    def apply(self, update):
+        """Apply one ``plan.session.<id>.state`` message. Returns True if anything changed."""
+        phase_id = update.get("phaseId")
+        status = update.get("status")
+        if phase_id is None or status is None:
+            return False
+        entry = (status, update.get("updated", ""))
+        previous = self.phases.get(phase_id)
+        if previous == entry:
+            return False
+        if previous is not None:
+            self.counts[previous[0]] -= 1
+        self.counts[status] += 1
+        self.phases[phase_id] = entry
+        self.recent[phase_id] = None
+        self.recent.move_to_end(phase_id)
+        self.version += 1
+        return True
+
+    def apply_event(self, event):
+        """Apply one ``plan.session.<id>.events`` message, if it concerns a phase."""
+        status = EVENT_STATUSES.get(str(event.get("event") or event.get("type", "")).lower())
+        if status is None:
+            return False
+        return self.apply({"phaseId": event.get("phaseId"), "status": status,
+                           "updated": event.get("updated", "")})
+
+    def replace(self, updates):
+        """Replace the table with a full snapshot. Returns True if anything changed."""
+        changed = False
+        seen = set()
+        for update in updates:
+            seen.add(update["phaseId"])
+            changed = self.apply(update) or changed
+        for phase_id in [p for p in self.phases if p not in seen]:
+            self.counts[self.phases.pop(phase_id)[0]] -= 1
+            self.recent.pop(phase_id, None)
+            changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+    def render(self, rows=20):
+        """A summary line followed by the ``rows`` most recently changed phases."""
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(self.counts.items()) if count)
+        notes = [self.note] if self.note else []
+        if self.malformed:
+            notes.append(f"{self.malformed} malformed message(s) ignored")
+        lines = [f"{len(self.phases)} phase(s)" + (f" ({summary})" if summary else "")
+                 + "".join(f" [{note}]" for note in notes)]
+        if rows:
+            lines.append(f"{'PHASE':<30} {'STATUS':<10} UPDATED")
+            for phase_id in reversed(list(self.recent)[-rows:]):
+                status, updated = self.phases[phase_id]
+                lines.append(f"{phase_id:<30} {status:<10} {updated}")
+        return "\n".join(lines)
+
+
+class StatusPoller:
+    """Poll ``GET <endpoint>/status`` with If-None-Match, so unchanged status costs a 304."""
+
+    def __init__(self, endpoint, session=None, timeout=(5.0, 30.0)):
+        self.url = f"{endpoint.rstrip('/')}/status"
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.etag = None
+
+    def poll(self):
+        """
+        Returns:
+            list: Status updates, or None if nothing changed since the last poll
+        """
+        headers = {"Accept": "application/json"}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self.etag = response.headers.get("ETag")
+        return parse_status_payload(response.json())
+
+    def close(self):
+        self.session.close()
+
+
+async def follow_nats(connector, session_id, table, changed, snapshot_timeout=5.0):
+    """
+    Load the current state, then apply state and event messages as they arrive.
+
+    If the session does not answer ``get_state`` within ``snapshot_timeout``
+    seconds, the table is marked "no snapshot" and only shows the phases
+    that have changed since following began. Messages that are not a JSON
+    object are counted in ``table.malformed`` and otherwise ignored.
+    """
+    def decode(msg):
+        try:
+            document = json.loads(msg.data)
+        except ValueError:
+            document = None
+        if not isinstance(document, dict):
+            table.malformed += 1
+            changed.set()
+            return None
+        return document
+
+    def on_state(msg):
+        update = decode(msg)
+        if update is not None and table.apply(update):
+            changed.set()
+
+    def on_event(msg):
+        event = decode(msg)
+        if event is not None and table.apply_event(event):
+            changed.set()
+
+    await connector.subscribe(connector.session_subject(session_id, "state"), on_state)
+    await connector.subscribe(connector.session_subject(session_id, "events"), on_event)
+    try:
+        snapshot = await connector.get_state(session_id, snapshot_timeout)
+    except asyncio.TimeoutError:
+        table.note = f"no snapshot: get_state timed out after {snapshot_timeout:g}s"
+    else:
+        for update in parse_status_payload(snapshot):
+            table.apply(update)
+    changed.set()
+    await asyncio.Event().wait()
+
+
+async def follow_http(poller, table, changed, interval=2.0):
+    """Poll for status every ``interval`` seconds, replacing the table when it changed."""
+    loop = asyncio.get_running_loop()
+    while True:
+        updates = await loop.run_in_executor(None, poller.poll)
+        if updates is not None and table.replace(updates):
+            changed.set()
+        await asyncio.sleep(interval)
+
+
+async def redraw(table, changed, draw, max_rate=4.0):
+    """
+    Call ``draw(table)`` whenever the table changes, at most ``max_rate``
+    times a second. Updates arriving between redraws are coalesced into
+    the next one, and nothing runs while the table is unchanged.
+    """
+    interval = 1.0 / max_rate if max_rate else 0
+    while True:
+        await changed.wait()
+        changed.clear()
+        draw(table)
+        await asyncio.sleep(interval)
+
+
+async def follow(source, table, draw, max_rate=4.0):
+    """Run a status source and the redraw loop until the source ends or is cancelled."""
+    changed = asyncio.Event()
+    drawer = asyncio.ensure_future(redraw(table, changed, draw, max_rate))
+    try:
+        await source(table, changed)
+    finally:
+        drawer.cancel()
+        if changed.is_set():
+            draw(table)
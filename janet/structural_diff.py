@@ -0,0 +1,117 @@
+import hashlib
+import json
+
+
+def _blake(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _scalar_bytes(value):
+    # Tagged and length-prefixed so "1" and 1 stay distinct and concatenations
+    # cannot collide. Numbers hash like == compares them: True, 1 and 1.0 are
+    # one value, so YAML's "timeout: 1" vs "timeout: 1.0" is not a change
+    if isinstance(value, str):
+        data = b"s" + value.encode("utf-8")
+    elif value is None:
+        data = b"c" + b"None"
+    elif isinstance(value, (int, float)):
+        if isinstance(value, bool) or (isinstance(value, float) and value.is_integer()):
+            value = int(value)
+        data = b"n" + repr(value).encode("ascii")
+    else:
+        data = b"j" + json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+    return len(data).to_bytes(4, "big") + data
+
+
+def _key_bytes(key):
+    # Keys are typed like values, so {1: x} and {"1": x} differ as they do under ==
+    return _scalar_bytes(key)
+
+
+def _encode(value):
+    """Bytes standing for a value inside its parent: a digest for containers, the value for scalars."""
+    if isinstance(value, dict):
+        return b"D" + _blake(b"".join(_key_bytes(k) + _encode(value[k]) for k in sorted(value, key=str)))
+    if isinstance(value, (list, tuple)):
+        return b"L" + _blake(b"".join(_encode(child) for child in value))
+    return _scalar_bytes(value)
+
+
+def merkle_tree(value):
+    """
+    Hash a JSON-like value bottom-up. Containers are hashed over their
+    children's encodings; scalars are encoded inline rather than hashed.
+
+    Returns:
+        tuple: ``(encoding, children)`` where children is a dict of key -> node
+        for mappings, a list of nodes for lists and None for scalars. Equal
+        subtrees always have equal encodings regardless of key order.
+    """
+    if isinstance(value, dict):
+        children = {key: merkle_tree(child) for key, child in value.items()}
+        encoded = b"".join(_key_bytes(k) + children[k][0] for k in sorted(children, key=str))
+        return b"D" + _blake(encoded), children
+    if isinstance(value, (list, tuple)):
+        children = [merkle_tree(child) for child in value]
+        return b"L" + _blake(b"".join(child[0] for child in children)), children
+    return _scalar_bytes(value), None
+
+
+def content_hash(value):
+    """Hex Merkle root of a JSON-like value, as stored alongside plan state."""
+    return _blake(_encode(value)).hex()
+
+
+def _pointer(path):
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def _diff(old, new, old_node, new_node, path, ops):
+    if old_node[0] == new_node[0]:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path + [key]), "old": old[key]})
+        for key in new:
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path + [key]), "value": new[key]})
+            else:
+                _diff(old[key], new[key], old_node[1][key], new_node[1][key], path + [key], ops)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            _diff(old[index], new[index], old_node[1][index], new_node[1][index], path + [index], ops)
+        # Remove from the end so earlier indices stay valid while applying
+        for index in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": _pointer(path + [index]), "old": old[index]})
+        for index in range(common, len(new)):
+            ops.append({"op": "add", "path": _pointer(path + [index]), "value": new[index]})
+        return
+    ops.append({"op": "replace", "path": _pointer(path), "value": new, "old": old})
+
+
+def diff_patch(old, new):
+    """
+    Field-level patch turning ``old`` into ``new``, as RFC 6902 operations
+    (``add``, ``remove``, ``replace``) with JSON Pointer paths. Subtrees with
+    equal hashes are skipped without being compared. Each operation also
+    carries the previous value under ``old`` where there was one, for review.
+    """
+    ops = []
+    _diff(old, new, merkle_tree(old), merkle_tree(new), [], ops)
+    return ops
+
+
+def format_patch(ops, indent="    "):
+    """Render patch operations as one line per changed field."""
+    lines = []
+    for op in ops:
+        if op["op"] == "add":
+            lines.append(f"{indent}+ {op['path']}: {json.dumps(op['value'], default=str)}")
+        elif op["op"] == "remove":
+            lines.append(f"{indent}- {op['path']}: {json.dumps(op['old'], default=str)}")
+        else:
+            lines.append(f"{indent}~ {op['path']}: {json.dumps(op['old'], default=str)} -> {json.dumps(op['value'], default=str)}")
+    return lines
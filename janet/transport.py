@@ -0,0 +1,182 @@
+import email.utils
+import gzip
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .serializers import dump_json
+
+
+MANIFEST_CONTENT_TYPE = "application/vnd.phase-manifest+json"
+
+# Exit codes for `janet submit`, so automation can react without parsing output.
+# 2 is left to argparse for usage errors.
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_REJECTED = 3
+EXIT_CONFLICT = 4
+EXIT_SERVER_ERROR = 5
+EXIT_UNREACHABLE = 6
+
+# Statuses worth retrying: resubmitting the same manifest is idempotent
+# because the PMP server diffs it against what it already has
+RETRY_STATUSES = {409, 429, 502, 503, 504}
+RETRY_AFTER_STATUSES = {409, 429, 503}
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def exit_code_for_status(status_code):
+    if 200 <= status_code < 300:
+        return EXIT_OK
+    if status_code == 409:
+        return EXIT_CONFLICT
+    if 400 <= status_code < 500:
+        return EXIT_REJECTED
+    return EXIT_SERVER_ERROR
+
+
+class SubmitResult:
+    def __init__(self, endpoint, status_code=None, text="", attempts=0, elapsed=0.0, error=None):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.text = text
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def exit_code(self):
+        if self.status_code is None:
+            if isinstance(self.error, (requests.exceptions.ConnectionError,
+                                       requests.exceptions.Timeout)):
+                return EXIT_UNREACHABLE
+            return EXIT_ERROR
+        return exit_code_for_status(self.status_code)
+
+    @property
+    def success(self):
+        return self.exit_code == EXIT_OK
+
+    def __repr__(self):
+        return (f"<SubmitResult endpoint={self.endpoint} status={self.status_code} "
+                f"attempts={self.attempts} elapsed={self.elapsed:.3f}s error={self.error}>")
+
+
+class PMPTransport:
+    """
+    HTTP transport for submitting manifests to PMP servers.
+
+    Keeps a pooled keep-alive session across requests, gzips large bodies,
+    applies separate connect/read timeouts and retries transient failures
+    (connection errors, timeouts, 409/429/502/503/504) with exponential
+    backoff and full jitter, waiting for Retry-After when the server asks.
+    """
+
+    def __init__(self, connect_timeout=5.0, read_timeout=30.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=60.0, gzip_min_bytes=16 * 1024,
+                 pool_size=10, session=None, sleep=time.sleep):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.gzip_min_bytes = gzip_min_bytes
+        self.sleep = sleep
+        self.session = session or self._create_session(pool_size)
+
+    def _create_session(self, pool_size):
+        session = requests.Session()
+        # Retries are handled here so Retry-After and jitter apply uniformly
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def encode(self, manifest):
+        """Serialize a manifest to a compact request body, gzipping it when large.
+
+        Returns:
+            tuple: ``(body_bytes, headers)``
+        """
+        return self.prepare(dump_json(manifest, compact=True))
+
+    def prepare(self, body):
+        """Wrap already-encoded JSON bytes as a request body, gzipping them when large.
+
+        Returns:
+            tuple: ``(body_bytes, headers)``
+        """
+        headers = {"Content-Type": MANIFEST_CONTENT_TYPE}
+        if self.gzip_min_bytes is not None and len(body) >= self.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number ``attempt`` (1-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def submit(self, endpoint, manifest=None, body=None, headers=None):
+        """
+        POST a manifest to ``<endpoint>/plan``, retrying transient failures.
+        Pass a pre-encoded ``body``/``headers`` pair to reuse one encoding
+        across several endpoints, or just JSON bytes as ``body`` to send
+        them without decoding.
+
+        Returns:
+            SubmitResult
+        """
+        if body is None:
+            body, headers = self.encode(manifest)
+        elif headers is None:
+            body, headers = self.prepare(body)
+        url = f"{endpoint.rstrip('/')}/plan"
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt > self.max_retries:
+                    return SubmitResult(endpoint, attempts=attempt,
+                                        elapsed=time.perf_counter() - started, error=e)
+            except requests.exceptions.RequestException as e:
+                # Invalid URLs and the like will not improve with retries
+                return SubmitResult(endpoint, attempts=attempt,
+                                    elapsed=time.perf_counter() - started, error=e)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt > self.max_retries:
+                    return SubmitResult(endpoint, response.status_code, response.text, attempt,
+                                        time.perf_counter() - started)
+                if response.status_code in RETRY_AFTER_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.sleep(self.backoff(attempt, retry_after))
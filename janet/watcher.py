@@ -0,0 +1,132 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+
+WATCHED_SUFFIXES = (".yaml", ".yml")
+
+
+def _is_watched(path, ignore):
+    return path.suffix in WATCHED_SUFFIXES and path not in ignore
+
+
+class InotifyWatcher:
+    """Report changed YAML files in a directory using Linux inotify (via libc)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory, ignore=None, settle=0.02):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.directory = Path(directory).resolve()
+        self.ignore = {Path(p).resolve() for p in ignore or []}
+        self.settle = settle
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(str(self.directory)), self.MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.directory}")
+
+    def _drain(self, changed):
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self.EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    path = self.directory / os.fsdecode(name)
+                    if _is_watched(path, self.ignore):
+                        changed.add(path)
+
+    def wait(self, timeout=None):
+        """
+        Block until YAML files change (or the timeout expires) and return
+        the set of changed paths. Bursts of events, such as an editor's
+        write-then-rename save, are coalesced over a short settle window.
+        """
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        self._drain(changed)
+        while select.select([self.fd], [], [], self.settle)[0]:
+            self._drain(changed)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Report changed YAML files by comparing mtimes and sizes at an interval."""
+
+    def __init__(self, directory, ignore=None, interval=0.25):
+        self.directory = Path(directory).resolve()
+        self.ignore = {Path(p).resolve() for p in ignore or []}
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for entry in os.scandir(self.directory):
+            path = self.directory / entry.name
+            if not _is_watched(path, self.ignore):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Poll until YAML files change (or the timeout expires) and return the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path for path in current.keys() | self.snapshot.keys()
+                if current.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def create_watcher(directory, ignore=None, poll_interval=0.25):
+    """Return an inotify watcher when the platform supports it, else a polling watcher."""
+    try:
+        return InotifyWatcher(directory, ignore=ignore)
+    except (OSError, AttributeError, TypeError):
+        return PollingWatcher(directory, ignore=ignore, interval=poll_interval)
@@ -1,6 +1,8 @@
 
 import os
 
+from .bulk import environment_snapshot, random_hex
+
 
 class ArgumentValueFactory:
     def generate(self, references: dict, sample=False) -> dict:
@@ -20,3 +22,22 @@ class ArgumentValueFactory:
             else:
                 result[key] = value.get("default", fallback)
         return result
+
+    def generate_many(self, references: dict, n: int, sample=False, environ=None) -> dict:
+        """
+        Generate ``n`` values per reference as columns: ``{key: [value, ...]}``.
+        ``environ`` defaults to one snapshot of the environment for the batch.
+        """
+        env = environment_snapshot() if environ is None else environ
+        result = {}
+        for key, value in references.items():
+            shellVar = value.get("shellVar")
+            if shellVar and shellVar in env:
+                result[key] = [env[shellVar]] * n
+            elif "default" in value:
+                result[key] = [value["default"]] * n
+            elif sample:
+                result[key] = random_hex(n, 16)
+            else:
+                result[key] = [None] * n
+        return result
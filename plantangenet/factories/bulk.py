@@ -0,0 +1,90 @@
+"""
+Building blocks for the factories' generate_many() paths, which produce a
+whole column of values with a handful of C-level calls instead of one
+Python-level call per value.
+"""
+import os
+import threading
+import time
+
+_DIGITS = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford's base32, as used by ULIDs
+_PAIRS = [high + low for high in _DIGITS for low in _DIGITS]  # the last two digits, for the low 10 bits
+_RANDOM_BITS = 80
+
+_lock = threading.Lock()
+_last = (0, 0)  # (timestamp ms, randomness) of the last ULID handed out
+
+
+def environment_snapshot():
+    """One copy of the environment for a whole batch, instead of an os.getenv() per value."""
+    return os.environ.copy()
+
+
+def monotonic_ulids(n):
+    """
+    ``n`` ULID strings, strictly increasing within the batch and across
+    calls in this process.
+
+    The batch shares one clock read and one random draw: each ULID after
+    the first increments the 80-bit randomness of the one before, as in the
+    ULID spec's monotonic mode. Consecutive ULIDs then differ only in their
+    last two digits within each block of 1024, so each block's first 24
+    digits are encoded once and the rest is string concatenation.
+    """
+    global _last
+    if n <= 0:
+        return []
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        last_time, last_random = _last
+        if now <= last_time:
+            now, start = last_time, last_random + 1
+        else:
+            start = int.from_bytes(os.urandom(10), "big")
+        if start + n > 1 << _RANDOM_BITS:
+            # Randomness would overflow; move on to the next millisecond
+            now, start = now + 1, int.from_bytes(os.urandom(10), "big") >> 1
+        _last = (now, start + n - 1)
+
+    ulids = []
+    first = now << _RANDOM_BITS | start
+    for block in range(first >> 10, (first + n - 1 >> 10) + 1):
+        head = _encode(block << 10)[:24]
+        low = max(first - (block << 10), 0)
+        high = min(first + n - (block << 10), 1024)
+        ulids.extend(map(head.__add__, _PAIRS[low:high]))
+    return ulids
+
+
+def _encode(value):
+    """A 128-bit value as 26 base32 digits, most significant first."""
+    return "".join([_DIGITS[value >> shift & 31] for shift in range(125, -1, -5)])
+
+
+def random_hex(n, nbytes):
+    """``n`` hex strings of ``nbytes`` random bytes each, from a single os.urandom() read."""
+    width = nbytes * 2
+    data = os.urandom(n * nbytes).hex()
+    return [data[i:i + width] for i in range(0, n * width, width)]
+
+
+def unique_values(draw, n, max_attempts=None):
+    """
+    ``n`` distinct values from ``draw()``, drawing again on collisions.
+
+    Raises:
+        ValueError: If ``max_attempts`` draws (default ``10 * n + 100``)
+            do not yield ``n`` distinct values
+    """
+    seen = set()
+    values = []
+    if n <= 0:
+        return values
+    for _ in range(max_attempts or 10 * n + 100):
+        value = draw()
+        if value not in seen:
+            seen.add(value)
+            values.append(value)
+            if len(values) == n:
+                return values
+    raise ValueError(f"Could not draw {n} distinct values, only {len(values)}")
@@ -1,7 +1,8 @@
 
 
 import os
-from ulid import ULID
+
+from .bulk import environment_snapshot, monotonic_ulids, random_hex
 
 
 class FreshIdFactory:
@@ -9,6 +10,8 @@ class FreshIdFactory:
         """
         Generate argument values based on the provided manifest.
         """
+        from ulid import ULID
+
         result = {}
         for key, value in references.items():
             shellVar = value.get("shellVar")
@@ -22,3 +25,21 @@ class FreshIdFactory:
             else:
                 result[key] = fallback
         return result
+
+    def generate_many(self, references: dict, n: int, sample=False, environ=None) -> dict:
+        """
+        Generate ``n`` ids per reference as columns: ``{key: [value, ...]}``.
+        Ids are monotonic ULIDs produced in bulk (random hex in ``sample``
+        mode), and ``environ`` defaults to one snapshot of the environment.
+        """
+        env = environment_snapshot() if environ is None else environ
+        result = {}
+        for key, value in references.items():
+            shellVar = value.get("shellVar")
+            prefix = value.get("prefix", "VAR-")
+            if shellVar and shellVar in env:
+                result[key] = [env[shellVar]] * n
+            else:
+                ids = random_hex(n, 8) if sample else monotonic_ulids(n)
+                result[key] = [prefix + id for id in ids]
+        return result
@@ -1,5 +1,7 @@
 import os
-from coolname import generate_slug
+from functools import partial
+
+from .bulk import environment_snapshot, unique_values
 
 
 class RandomSlugFactory:
@@ -7,6 +9,8 @@ class RandomSlugFactory:
         """
         Generate argument values based on the provided manifest.
         """
+        from coolname import generate_slug
+
         result = {}
         for key, value in references.items():
             shellVar = value.get("shellVar")
@@ -18,3 +22,22 @@ class RandomSlugFactory:
             else:
                 result[key] = fallback
         return result
+
+    def generate_many(self, references: dict, n: int, sample=False, environ=None) -> dict:
+        """
+        Generate ``n`` slugs per reference as columns: ``{key: [value, ...]}``.
+        Slugs within a column are distinct (a value taken from the
+        environment is repeated as is), and ``environ`` defaults to one
+        snapshot of the environment for the batch.
+        """
+        from coolname import generate_slug
+
+        env = environment_snapshot() if environ is None else environ
+        result = {}
+        for key, value in references.items():
+            shellVar = value.get("shellVar")
+            if shellVar and shellVar in env:
+                result[key] = [env[shellVar]] * n
+            else:
+                result[key] = unique_values(partial(generate_slug, value.get("chunks", 2)), n)
+        return result
@@ -0,0 +1,31 @@
+import reprlib
+import sys
+
+__all__ = ["bounded_repr", "intern_metadata", "intern_str"]
+
+# plantangenet keeps its own copy of these small helpers so it never
+# depends on janet, which is the package that builds on it
+_repr = reprlib.Repr()
+_repr.maxlevel = 2
+_repr.maxdict = 4
+_repr.maxlist = 4
+_repr.maxstring = 40
+_repr.maxother = 40
+
+
+def bounded_repr(value):
+    """A repr cut down to a few levels and items, for __repr__ of large objects."""
+    return _repr.repr(value)
+
+
+def intern_str(value):
+    # Names and ids repeat across many objects; share one copy of each
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_metadata(metadata):
+    """A copy of a metadata dict with its label keys and values interned."""
+    if isinstance(metadata, dict) and isinstance(metadata.get("labels"), dict):
+        labels = {intern_str(k): intern_str(v) for k, v in metadata["labels"].items()}
+        return {**metadata, "labels": labels}
+    return metadata
@@ -1,5 +1,10 @@
-from .nats_connector import NATSConnector
+from .broker import InProcessBroker
+from .nats_connector import Message, NATSConnector, NATSError, Subscription
 
 __all__ = [
+    "InProcessBroker",
+    "Message",
     "NATSConnector",
+    "NATSError",
+    "Subscription",
 ]
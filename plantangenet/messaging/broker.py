@@ -0,0 +1,117 @@
+import asyncio
+import json
+import socket
+
+
+def subject_matches(pattern, subject):
+    """NATS subject matching: ``*`` matches one token, a trailing ``>`` the rest."""
+    pattern_tokens = pattern.split(".")
+    tokens = subject.split(".")
+    for index, token in enumerate(pattern_tokens):
+        if token == ">":
+            return len(tokens) > index
+        if index >= len(tokens) or (token != "*" and token != tokens[index]):
+            return False
+    return len(tokens) == len(pattern_tokens)
+
+
+class _Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.subscriptions = {}  # sid -> (subject, queue group)
+
+
+class InProcessBroker:
+    """
+    A minimal NATS server for tests and local runs, with no network.
+
+    Each open_connection() creates a socket pair inside the process and
+    serves the core protocol (CONNECT, PING/PONG, SUB/UNSUB, PUB, MSG) on
+    the other end, so clients exercise their real wire handling. Pass
+    ``broker.open_connection`` as a connector's ``open_connection``.
+
+    SUBs to a subject matching one of ``deny_subscribe`` are refused with a
+    "Permissions Violation" error, as a server with per-user permissions
+    would, and the connection stays open.
+    """
+
+    def __init__(self, deny_subscribe=()):
+        self.deny_subscribe = tuple(deny_subscribe)
+        self.clients = []
+        self.published = 0
+        self._tasks = []
+
+    async def open_connection(self, host=None, port=None):
+        client_sock, server_sock = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=server_sock)
+        client = _Client(reader, writer)
+        self.clients.append(client)
+        self._tasks.append(asyncio.ensure_future(self._serve(client)))
+        return await asyncio.open_connection(sock=client_sock)
+
+    async def disconnect_all(self):
+        """Drop every client connection, as a server restart would."""
+        for client in list(self.clients):
+            client.writer.close()
+        self.clients = []
+
+    async def close(self):
+        await self.disconnect_all()
+        for task in self._tasks:
+            task.cancel()
+
+    async def _serve(self, client):
+        info = {"server_id": "in-process", "version": "2.10.0", "proto": 1, "max_payload": 1048576}
+        client.writer.write(b"INFO " + json.dumps(info).encode() + b"\r\n")
+        try:
+            while True:
+                line = await client.reader.readline()
+                if not line:
+                    break
+                op = line.split(None, 1)[0].upper() if line.strip() else b""
+                if op == b"PING":
+                    client.writer.write(b"PONG\r\n")
+                elif op == b"SUB":
+                    parts = line.split()
+                    subject = parts[1].decode()
+                    queue = parts[2].decode() if len(parts) == 4 else None
+                    if any(subject_matches(denied, subject) for denied in self.deny_subscribe):
+                        client.writer.write(
+                            f"-ERR 'Permissions Violation for Subscription to \"{subject}\"'\r\n".encode())
+                    else:
+                        client.subscriptions[int(parts[-1])] = (subject, queue)
+                elif op == b"UNSUB":
+                    client.subscriptions.pop(int(line.split()[1]), None)
+                elif op == b"PUB":
+                    parts = line.split()
+                    reply = parts[2].decode() if len(parts) == 4 else None
+                    data = (await client.reader.readexactly(int(parts[-1]) + 2))[:-2]
+                    self._route(parts[1].decode(), reply, data)
+                await client.writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            if client in self.clients:
+                self.clients.remove(client)
+            client.writer.close()
+
+    def _route(self, subject, reply, data):
+        self.published += 1
+        queue_groups = {}
+        for client in self.clients:
+            for sid, (pattern, queue) in client.subscriptions.items():
+                if not subject_matches(pattern, subject):
+                    continue
+                if queue:
+                    # Queue subscribers share the stream: one member gets each message
+                    queue_groups.setdefault((pattern, queue), (client, sid))
+                else:
+                    self._send(client, sid, subject, reply, data)
+        for client, sid in queue_groups.values():
+            self._send(client, sid, subject, reply, data)
+
+    @staticmethod
+    def _send(client, sid, subject, reply, data):
+        head = f"MSG {subject} {sid} {reply} {len(data)}\r\n" if reply else f"MSG {subject} {sid} {len(data)}\r\n"
+        client.writer.write(head.encode() + data + b"\r\n")
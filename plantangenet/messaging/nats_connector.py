@@ -1,18 +1,444 @@
+import asyncio
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+
+class NATSError(Exception):
+    pass
+
+
+# -ERR messages after which the server keeps the connection open; any
+# other error is followed by the server closing it
+NON_FATAL_ERRORS = ("permissions violation", "invalid subject")
+
+_DENIED_SUBSCRIPTION = re.compile(r'permissions violation for subscription to "?([^"\s]+)"?', re.IGNORECASE)
+
+
+class Message:
+    __slots__ = ("subject", "data", "reply", "sid")
+
+    def __init__(self, subject, data, reply=None, sid=None):
+        self.subject = subject
+        self.data = data
+        self.reply = reply
+        self.sid = sid
+
+    def json(self):
+        return json.loads(self.data)
+
+    def __repr__(self):
+        return f"Message(subject={self.subject}, reply={self.reply}, bytes={len(self.data)})"
+
+
+class Subscription:
+    """
+    Messages for one SUB, delivered through a bounded queue.
+
+    When the queue is full, further messages are dropped and counted in
+    ``dropped``, as the NATS server does for slow consumers. The connection
+    keeps reading, so one lagging subscriber neither grows memory without
+    limit nor stalls flushes, replies and other subscriptions.
+
+    If the server refuses the SUB (a permissions violation), ``error`` is
+    set and the next ``next_msg()`` or iteration raises it.
+    """
+
+    def __init__(self, connector, sid, subject, queue_group=None, max_pending=1000):
+        self.connector = connector
+        self.sid = sid
+        self.subject = subject
+        self.queue_group = queue_group
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self.error = None
+        self.task = None
+
+    def _fail(self, error):
+        self.error = error
+        try:
+            self.queue.put_nowait(error)
+        except asyncio.QueueFull:
+            pass
+
+    @staticmethod
+    def _check(item):
+        if isinstance(item, NATSError):
+            raise item
+        return item
+
+    async def next_msg(self, timeout=None):
+        return self._check(await asyncio.wait_for(self.queue.get(), timeout))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return self._check(await self.queue.get())
+
+    async def unsubscribe(self):
+        await self.connector.unsubscribe(self)
+
+
+def _encode(payload):
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode("utf-8")
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
 class NATSConnector:
-    def __init__(self, host=None, port=None, **kwargs):
-        self.host = host
-        self.port = port
-
-    def connect(self):
-        # Simulate a connection to NATS
-        print(f"Connected to NATS servers: {self.host}:{self.port}")
-
-    def publish(self, subject, message):
-        # Simulate publishing a message to a NATS subject
-        print(f"Published message to {subject}: {message}")
-
-    def subscribe(self, subject, callback):
-        # Simulate subscribing to a NATS subject
-        print(f"Subscribed to {subject}")
-        # Simulate receiving a message
-        callback("Test message")
+    """
+    Asyncio client for the NATS core protocol, with helpers for the PMP
+    ``plan.session.<id>.*`` subjects.
+
+    Publishes are buffered and written in batches (at ``batch_size`` bytes,
+    or as soon as the event loop is idle); ``flush()`` writes the buffer and
+    waits for the server to acknowledge it. If the connection drops the
+    connector reconnects, re-establishes subscriptions and sends whatever
+    was published meanwhile, holding up to ``max_reconnect_buffer`` bytes.
+
+    Errors the server reports without closing the connection, such as a
+    permissions violation, do not trigger a reconnect. They are kept in
+    ``errors`` and passed to ``error_callback(error)`` if one is given; a
+    refused SUB also fails its Subscription. Exceptions raised by a
+    subscription callback are reported the same way, and delivery to the
+    callback carries on with the next message.
+
+    ``open_connection`` may be replaced (e.g. by InProcessBroker.open_connection)
+    to run without a network.
+    """
+
+    def __init__(self, host=None, port=None, url=None, name="plantangenet", batch_size=64 * 1024,
+                 max_pending=1000, max_reconnect_buffer=8 * 1024 * 1024, reconnect_wait=2.0,
+                 max_reconnect_attempts=60, open_connection=None, error_callback=None, **kwargs):
+        if url:
+            parsed = urlparse(url)
+            host = host or parsed.hostname
+            port = port or parsed.port
+        self.host = host or "localhost"
+        self.port = port or 4222
+        self.name = name
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_reconnect_buffer = max_reconnect_buffer
+        self.reconnect_wait = reconnect_wait
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.open_connection = open_connection or asyncio.open_connection
+        self.error_callback = error_callback
+        self.errors = []
+
+        self.server_info = {}
+        self.reconnects = 0
+        self._reader = None
+        self._writer = None
+        self._connected = False
+        self._closing = False
+        self._pending = []
+        self._pending_size = 0
+        self._pongs = []
+        self._subscriptions = {}
+        self._next_sid = 0
+        self._read_task = None
+        self._flush_task = None
+        self._flush_wanted = None
+        self._inbox_prefix = None
+        self._inbox_sub = None
+        self._requests = {}
+        self._next_request = 0
+
+    @property
+    def is_connected(self):
+        return self._connected
+
+    # -- connection lifecycle -------------------------------------------------
+
+    async def connect(self):
+        self._closing = False
+        self._flush_wanted = asyncio.Event()
+        await self._open()
+        self._read_task = asyncio.ensure_future(self._read_loop())
+        self._flush_task = asyncio.ensure_future(self._flush_loop())
+
+    async def _open(self):
+        self._reader, self._writer = await self.open_connection(self.host, self.port)
+        try:
+            await self._handshake()
+        except BaseException:
+            self._close_transport()
+            raise
+        self._connected = True
+
+    def _close_transport(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _handshake(self):
+        line = await self._reader.readline()
+        if not line.startswith(b"INFO"):
+            raise NATSError(f"Unexpected greeting from NATS server: {line!r}")
+        self.server_info = json.loads(line[4:])
+        connect = {"verbose": False, "pedantic": False, "name": self.name,
+                   "lang": "python", "version": "1.0.0", "protocol": 1}
+        self._writer.write(b"CONNECT " + json.dumps(connect).encode() + b"\r\nPING\r\n")
+        await self._writer.drain()
+        while True:
+            line = await self._reader.readline()
+            if line.startswith(b"PONG"):
+                break
+            if line.startswith(b"-ERR") or not line:
+                raise NATSError(f"NATS connect failed: {line.decode(errors='replace').strip()}")
+
+    async def close(self):
+        """Flush what has been published, then disconnect."""
+        if self._connected:
+            try:
+                await self.flush()
+            except (NATSError, ConnectionError, asyncio.TimeoutError):
+                pass
+        self._closing = True
+        self._connected = False
+        for task in (self._read_task, self._flush_task):
+            if task:
+                task.cancel()
+        for sub in self._subscriptions.values():
+            if sub.task:
+                sub.task.cancel()
+        self._close_transport()
+        self._fail_waiters(NATSError("Connection closed"))
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _fail_waiters(self, error):
+        for future in self._pongs + list(self._requests.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._pongs = []
+        self._requests = {}
+
+    async def _reconnect(self):
+        self._connected = False
+        # The old socket is dead to us; close it before opening another
+        self._close_transport()
+        self._pongs, pongs = [], self._pongs
+        for future in pongs:
+            if not future.done():
+                future.set_exception(NATSError("Connection lost before flush completed"))
+        for attempt in range(1, self.max_reconnect_attempts + 1):
+            await asyncio.sleep(self.reconnect_wait)
+            try:
+                await self._open()
+            except (OSError, NATSError):
+                continue
+            self.reconnects += 1
+            # Subscriptions go out ahead of anything buffered while offline
+            resubscribe = [self._sub_command(sub) for sub in self._subscriptions.values()]
+            self._pending[:0] = resubscribe
+            self._pending_size += sum(len(c) for c in resubscribe)
+            self._flush_wanted.set()
+            return True
+        self._closing = True
+        self._fail_waiters(NATSError("Could not reconnect to NATS"))
+        return False
+
+    # -- reading ----------------------------------------------------------------
+
+    async def _read_loop(self):
+        while not self._closing:
+            try:
+                await self._read_one()
+            except (ConnectionError, asyncio.IncompleteReadError, OSError, NATSError):
+                if self._closing or not await self._reconnect():
+                    return
+
+    async def _read_one(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("NATS connection closed by server")
+        if line.startswith(b"MSG"):
+            parts = line.split()
+            subject, sid = parts[1].decode(), int(parts[2])
+            reply = parts[3].decode() if len(parts) == 5 else None
+            size = int(parts[-1])
+            data = (await self._reader.readexactly(size + 2))[:-2]
+            self._deliver(Message(subject, data, reply, sid))
+        elif line.startswith(b"PING"):
+            self._writer.write(b"PONG\r\n")
+        elif line.startswith(b"PONG"):
+            if self._pongs:
+                future = self._pongs.pop(0)
+                if not future.done():
+                    future.set_result(True)
+        elif line.startswith(b"-ERR"):
+            message = line[5:].decode(errors="replace").strip().strip("'")
+            if not message.lower().startswith(NON_FATAL_ERRORS):
+                raise NATSError(message)
+            self._report(NATSError(message))
+        elif line.startswith(b"INFO"):
+            self.server_info = json.loads(line[4:])
+
+    def _report(self, error):
+        """Record an error the server sent on a live connection, or one raised by a callback."""
+        self.errors.append(error)
+        denied = _DENIED_SUBSCRIPTION.match(str(error))
+        if denied:
+            for sub in self._subscriptions.values():
+                if sub.subject == denied.group(1):
+                    sub._fail(error)
+        if self.error_callback is not None:
+            self.error_callback(error)
+
+    def _deliver(self, msg):
+        if self._inbox_sub is not None and msg.sid == self._inbox_sub.sid:
+            future = self._requests.pop(msg.subject, None)
+            if future is not None and not future.done():
+                future.set_result(msg)
+            return
+        sub = self._subscriptions.get(msg.sid)
+        if sub is not None:
+            try:
+                sub.queue.put_nowait(msg)
+            except asyncio.QueueFull:
+                sub.dropped += 1
+
+    # -- writing ----------------------------------------------------------------
+
+    def _queue(self, command):
+        if self._flush_wanted is None or self._closing:
+            raise NATSError("Not connected")
+        if not self._connected and self._pending_size + len(command) > self.max_reconnect_buffer:
+            raise NATSError("Reconnect buffer is full")
+        self._pending.append(command)
+        self._pending_size += len(command)
+        self._flush_wanted.set()
+
+    async def _write_pending(self):
+        if not self._connected or not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def _flush_loop(self):
+        while not self._closing:
+            await self._flush_wanted.wait()
+            self._flush_wanted.clear()
+            # Let publishers in the same loop iteration join this batch
+            await asyncio.sleep(0)
+            try:
+                await self._write_pending()
+            except (ConnectionError, OSError):
+                pass
+
+    async def publish(self, subject, payload=b"", reply=None):
+        """Queue a message; it is written with the next batch."""
+        data = _encode(payload)
+        header = f"PUB {subject} {reply} {len(data)}\r\n" if reply else f"PUB {subject} {len(data)}\r\n"
+        self._queue(header.encode() + data + b"\r\n")
+        if self._connected and self._pending_size >= self.batch_size:
+            await self._write_pending()
+
+    async def flush(self, timeout=10.0):
+        """Write buffered publishes and wait until the server has processed them."""
+        if not self._connected:
+            raise NATSError("Not connected")
+        future = asyncio.get_running_loop().create_future()
+        self._pongs.append(future)
+        self._queue(b"PING\r\n")
+        await self._write_pending()
+        await asyncio.wait_for(future, timeout)
+
+    # -- subscriptions ----------------------------------------------------------
+
+    @staticmethod
+    def _sub_command(sub):
+        if sub.queue_group:
+            return f"SUB {sub.subject} {sub.queue_group} {sub.sid}\r\n".encode()
+        return f"SUB {sub.subject} {sub.sid}\r\n".encode()
+
+    async def subscribe(self, subject, callback=None, queue=None, max_pending=None):
+        """
+        Subscribe to a subject (wildcards allowed). Iterate the returned
+        Subscription, or pass ``callback`` (sync or async) to have each
+        message handed to it in order.
+        """
+        self._next_sid += 1
+        sub = Subscription(self, self._next_sid, subject, queue, max_pending or self.max_pending)
+        self._subscriptions[sub.sid] = sub
+        if self._connected:
+            # Otherwise it is sent with the others on reconnect
+            self._queue(self._sub_command(sub))
+            await self._write_pending()
+        if callback is not None:
+            sub.task = asyncio.ensure_future(self._dispatch(sub, callback))
+        return sub
+
+    async def _dispatch(self, sub, callback):
+        async for msg in sub:
+            try:
+                result = callback(msg)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                # One bad message must not stop delivery of the rest
+                self._report(e)
+
+    async def unsubscribe(self, sub):
+        if self._subscriptions.pop(sub.sid, None) is None:
+            return
+        if sub.task:
+            sub.task.cancel()
+        self._queue(f"UNSUB {sub.sid}\r\n".encode())
+        await self._write_pending()
+
+    async def request(self, subject, payload=b"", timeout=5.0):
+        """Publish with a unique reply subject and wait for the first response."""
+        if self._inbox_sub is None:
+            self._inbox_prefix = f"_INBOX.{os.urandom(8).hex()}"
+            self._next_sid += 1
+            self._inbox_sub = Subscription(self, self._next_sid, f"{self._inbox_prefix}.*")
+            self._subscriptions[self._inbox_sub.sid] = self._inbox_sub
+            if self._connected:
+                self._queue(self._sub_command(self._inbox_sub))
+        self._next_request += 1
+        reply = f"{self._inbox_prefix}.{self._next_request}"
+        future = asyncio.get_running_loop().create_future()
+        self._requests[reply] = future
+        await self.publish(subject, payload, reply=reply)
+        await self._write_pending()
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._requests.pop(reply, None)
+
+    # -- PMP subjects -----------------------------------------------------------
+
+    @staticmethod
+    def session_subject(session_id, kind):
+        """``plan.session.<id>.<kind>``, e.g. kind ``start``, ``state`` or ``events``."""
+        return f"plan.session.{session_id}.{kind}"
+
+    async def start_session(self, session_id, manifest, dry_run=False):
+        """Send a manifest to ``plan.session.<id>.start`` and wait until the server has it."""
+        await self.publish(self.session_subject(session_id, "start"),
+                           {"manifest": manifest, "dryRun": dry_run})
+        await self.flush()
+
+    async def get_state(self, session_id, timeout=5.0):
+        msg = await self.request(self.session_subject(session_id, "get_state"), b"{}", timeout)
+        return msg.json()
+
+    async def diff(self, session_id, manifest=None, timeout=5.0):
+        payload = {"manifest": manifest} if manifest is not None else {}
+        msg = await self.request(self.session_subject(session_id, "diff"), payload, timeout)
+        return msg.json()
@@ -1,10 +1,15 @@
+from .engine import Decision, PolicyEngine
 from .identity import Identity
+from .membership import MembershipGraph
 from .role import Role
 from .policy import Policy
 from .statement import Statement
 
 __all__ = [
+    "Decision",
     "Identity",
+    "MembershipGraph",
+    "PolicyEngine",
     "Role",
     "Policy",
     "Statement",
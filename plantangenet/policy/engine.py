@@ -0,0 +1,308 @@
+import fnmatch
+from collections import OrderedDict
+
+# valueMatch values starting with one of these roots are read from the
+# request context; anything else is a literal
+REFERENCE_ROOTS = ("self", "identity", "target", "context")
+
+# Condition kinds: who is asking, what the request carries, arbitrary code
+SUBJECT, CONTEXT, SCRIPT = "subject", "context", "script"
+
+
+class Decision:
+    __slots__ = ("allowed", "statement")
+
+    def __init__(self, allowed, statement=None):
+        self.allowed = allowed
+        self.statement = statement
+
+    def __bool__(self):
+        return self.allowed
+
+    def __repr__(self):
+        reason = self.statement.id if self.statement is not None else "no matching statement"
+        return f"Decision(allowed={self.allowed}, statement={reason})"
+
+
+def _path(expression):
+    return tuple(expression.split("."))
+
+
+def resolve(path, identity, context):
+    """Look up a dotted path such as ``target.status`` in the request."""
+    value = identity if path[0] == "identity" else context.get(path[0])
+    for part in path[1:]:
+        if value is None:
+            return None
+        value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+    return value
+
+
+class _Attributes(dict):
+    """A dict that scripts can also read as attributes (``target.status``)."""
+
+    def __getattr__(self, name):
+        value = self.get(name)
+        return _Attributes(value) if isinstance(value, dict) else value
+
+
+_OPERATORS = {
+    "equals": lambda a, b: a == b,
+    "notEquals": lambda a, b: a != b,
+    "in": lambda a, b: b is not None and a in b,
+    "notIn": lambda a, b: b is None or a not in b,
+    "exists": lambda a, b: a is not None,
+}
+
+
+def _never(*args):
+    return False
+
+
+def _getter(path):
+    """A ``get(identity, context)`` for one path, specialized for the common ``root.key``."""
+    if path[0] != "identity" and len(path) == 2:
+        root, leaf = path
+
+        def get(identity, context):
+            value = context.get(root)
+            if value is None:
+                return None
+            return value.get(leaf) if type(value) is dict else getattr(value, leaf, None)
+        return get
+    return lambda identity, context: resolve(path, identity, context)
+
+
+def _compile_condition(condition, paths, allow_scripts=False):
+    """
+    Turn one condition into ``(predicate, kind)``, adding the context paths
+    it reads to ``paths``. Subject predicates are called as
+    ``predicate(identity, roles)``; context and script predicates as
+    ``predicate(identity, context)``. Script results may depend on
+    anything, so they are never cached. Unknown conditions never match,
+    and neither do python scriptMatch conditions unless ``allow_scripts``
+    is set, since running them executes the statement's code.
+    """
+    if "roleSelector" in condition:
+        role = condition["roleSelector"].get("roleBinding")
+        return (lambda identity, roles: role in roles), SUBJECT
+
+    if "identities" in condition:
+        bindings = frozenset(s["identitySelector"].get("identityBinding")
+                             for s in condition["identities"] if "identitySelector" in s)
+        return (lambda identity, roles: identity.id in bindings or identity.name in bindings), SUBJECT
+
+    if "valueMatch" in condition:
+        match = condition["valueMatch"]
+        operator = _OPERATORS.get(match.get("operator", "equals"))
+        if operator is None:
+            return _never, CONTEXT
+        key = _path(match["key"])
+        paths.add(key)
+        get_key = _getter(key)
+        value = match.get("value")
+        if isinstance(value, str) and "." in value and value.split(".", 1)[0] in REFERENCE_ROOTS:
+            reference = _path(value)
+            paths.add(reference)
+            get_reference = _getter(reference)
+            return (lambda identity, context: operator(
+                get_key(identity, context), get_reference(identity, context))), CONTEXT
+        return (lambda identity, context: operator(get_key(identity, context), value)), CONTEXT
+
+    if "scriptMatch" in condition:
+        script = condition["scriptMatch"]
+        if not allow_scripts or script.get("lang") != "python" or "code" not in script:
+            # Untrusted statements, other languages and configMap scripts
+            # cannot run here; fail closed
+            return _never, CONTEXT
+        namespace = {}
+        exec(compile(script["code"], f"<scriptMatch {script.get('entrypoint')}>", "exec"), namespace)
+        entrypoint = namespace[script.get("entrypoint", "check")]
+        return (lambda identity, context: bool(entrypoint(
+            _Attributes(context), _Attributes(context.get("target") or {})))), SCRIPT
+
+    return _never, CONTEXT
+
+
+class _CompiledStatement:
+    __slots__ = ("statement", "subject", "context", "deny", "paths", "cacheable", "allow_scripts")
+
+    def __init__(self, statement, allow_scripts=False):
+        self.statement = statement
+        self.allow_scripts = allow_scripts
+        self.deny = statement.effect == "deny"
+        self.subject = []
+        self.context = []
+        self.cacheable = True
+        paths = set()
+        for condition in statement.conditions():
+            predicate, kind = _compile_condition(condition, paths, allow_scripts)
+            (self.subject if kind == SUBJECT else self.context).append(predicate)
+            self.cacheable = self.cacheable and kind != SCRIPT
+        self.paths = paths
+
+    def applies_to(self, identity, roles):
+        for predicate in self.subject:
+            if not predicate(identity, roles):
+                return False
+        return True
+
+    def matches(self, identity, context):
+        for predicate in self.context:
+            if not predicate(identity, context):
+                return False
+        return True
+
+
+class _ActionRule:
+    """Everything needed to decide one action: its statements, denies first."""
+
+    __slots__ = ("action", "statements", "key", "cacheable")
+
+    def __init__(self, action, statements, min_predicates=0):
+        self.action = action
+        self.statements = sorted(statements, key=lambda s: not s.deny)
+        paths = sorted(set().union(*(s.paths for s in statements)))
+        self.key = self._key_function(action, [_getter(path) for path in paths])
+        predicates = sum(len(s.subject) + len(s.context) for s in statements)
+        self.cacheable = predicates >= min_predicates and all(s.cacheable for s in statements)
+
+    @staticmethod
+    def _key_function(action, getters):
+        # Unrolled for the usual zero to two context values; building the
+        # key has to stay cheaper than the evaluation it saves
+        if not getters:
+            return lambda identity, context: (identity.id, action, identity.effective_roles())
+        if len(getters) == 1:
+            (first,) = getters
+            return lambda identity, context: (identity.id, action, identity.effective_roles(),
+                                              first(identity, context))
+        if len(getters) == 2:
+            first, second = getters
+            return lambda identity, context: (identity.id, action, identity.effective_roles(),
+                                              first(identity, context), second(identity, context))
+        return lambda identity, context: (identity.id, action, identity.effective_roles(),
+                                          *[get(identity, context) for get in getters])
+
+
+class PolicyEngine:
+    """
+    Authorization decisions over compiled policy statements.
+
+    Statements are compiled once into predicates and indexed by action, so
+    a check only evaluates the statements for its own action. Deny
+    overrides allow, and a request no statement allows is denied.
+
+    Decisions are kept in an LRU keyed on the identity, its roles, the
+    action and the context values that action's conditions read, so
+    repeated checks skip evaluation. Every action is cached by default.
+    Building the key costs about as much as a few predicates, so callers
+    whose actions are mostly trivial can set ``cache_min_predicates`` to
+    evaluate actions with fewer predicates than that outright. Adding or
+    removing statements, or changing a watched Policy, recompiles the index
+    and clears the cache.
+
+    Python scriptMatch conditions execute the code in the statement, so
+    they only run with ``allow_scripts=True``, for statements from a
+    trusted source; otherwise they never match. Actions with scripts are
+    evaluated on every check.
+    """
+
+    def __init__(self, statements=(), policies=(), cache_size=65536, cache_min_predicates=0,
+                 allow_scripts=False):
+        self.cache_size = cache_size
+        self.cache_min_predicates = cache_min_predicates
+        self.allow_scripts = allow_scripts
+        self.hits = 0
+        self.misses = 0
+        self._statements = list(statements)
+        self._policies = []
+        self._cache = OrderedDict()
+        self._rules = {}
+        self._compiled = None
+        for policy in policies:
+            self.add_policy(policy)
+        self.invalidate()
+
+    # -- policy changes -------------------------------------------------------
+
+    def add_policy(self, policy):
+        self._policies.append(policy)
+        policy.watch(self.invalidate)
+        self.invalidate()
+
+    def add_statement(self, statement):
+        self._statements.append(statement)
+        self.invalidate()
+
+    def remove_statement(self, statement):
+        self._statements.remove(statement)
+        self.invalidate()
+
+    def statements(self):
+        collected = list(self._statements)
+        for policy in self._policies:
+            collected.extend(policy.get_statements())
+        return collected
+
+    def invalidate(self, *args):
+        """Recompile statements and drop every cached decision."""
+        compiled = {}
+        for statement in self.statements():
+            compiled.setdefault(statement.action, []).append(_CompiledStatement(statement, self.allow_scripts))
+        self._compiled = compiled
+        self._rules = {}
+        self._cache.clear()
+
+    def _rule(self, action):
+        statements = list(self._compiled.get(action, ()))
+        for pattern, more in self._compiled.items():
+            if pattern and pattern != action and any(c in pattern for c in "*?[") \
+                    and fnmatch.fnmatchcase(action, pattern):
+                statements.extend(more)
+        rule = self._rules[action] = _ActionRule(action, statements, self.cache_min_predicates)
+        return rule
+
+    # -- decisions --------------------------------------------------------------
+
+    def evaluate(self, identity, action, context=None):
+        """
+        Decide whether ``identity`` may perform ``action``.
+
+        ``context`` holds what conditions refer to, e.g.
+        ``{"target": {"status": "inactive"}, "self": {"resource": "game-1"}}``.
+        Returns a Decision, which is truthy when allowed.
+        """
+        rule = self._rules.get(action) or self._rule(action)
+        context = context or {}
+        key = None
+        if rule.cacheable and self.cache_size:
+            try:
+                key = rule.key(identity, context)
+                decision = self._cache.get(key)
+            except TypeError:
+                key = decision = None  # unhashable context values
+            if decision is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return decision
+        self.misses += 1
+
+        decision = _DENY
+        roles = identity.effective_roles()
+        for compiled in rule.statements:
+            if compiled.applies_to(identity, roles) and compiled.matches(identity, context):
+                decision = Decision(not compiled.deny, compiled.statement)
+                break
+
+        if key is not None:
+            self._cache[key] = decision
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return decision
+
+    def is_allowed(self, identity, action, context=None):
+        return self.evaluate(identity, action, context).allowed
+
+
+_DENY = Decision(False)
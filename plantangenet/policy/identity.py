@@ -1,28 +1,54 @@
+from ..interning import intern_metadata, intern_str
+from .membership import role_name
+
+
 class Identity:
+    """
+    An identity and its direct roles.
+
+    Once added to a MembershipGraph, role checks include nested roles and
+    are answered from the graph's precomputed bitsets.
+    """
+
+    __slots__ = ("id", "name", "roles", "description", "metadata", "_membership")
+
     def __init__(self, id, name=None, roles=None, description=None, metadata=None, **kwargs):
-        self.id = id
-        self.name = name
-        self.roles = roles
+        self.id = intern_str(id)
+        self.name = intern_str(name)
+        self.roles = [intern_str(r) for r in roles] if roles is not None else None
         self.description = description
-        self.metadata = metadata
+        self.metadata = intern_metadata(metadata)
+        self._membership = None
 
     def add_role(self, role):
-        # Simulate adding a role to the identity
-        print(f"Added role {role.name} to identity {self.name}")
+        name = role_name(role)
+        if self.roles is None:
+            self.roles = []
+        if name not in self.roles:
+            self.roles.append(name)
+        if self._membership is not None:
+            self._membership.add_role(self, name)
 
     def remove_role(self, role):
-        # Simulate removing a role from the identity
-        print(f"Removed role {role.name} from identity {self.name}")
+        name = role_name(role)
+        if self.roles and name in self.roles:
+            self.roles.remove(name)
+        if self._membership is not None:
+            self._membership.remove_role(self, name)
 
     def get_roles(self):
-        # Simulate getting all roles for the identity
-        print(f"Getting roles for identity {self.name}")
-        return []
+        """Every role held, including roles inherited through nesting."""
+        return sorted(self.effective_roles())
+
+    def effective_roles(self):
+        if self._membership is not None:
+            return self._membership.role_names(self)
+        return tuple(self.roles or ())
 
     def has_role(self, role):
-        # Simulate checking if the identity has a specific role
-        print(f"Checking if identity {self.name} has role {role.name}")
-        return role in self.get_roles()
+        if self._membership is not None:
+            return self._membership.has_role(self, role)
+        return role_name(role) in (self.roles or ())
 
     def __str__(self):
         return f"Identity(id={self.id}, name={self.name})"
@@ -0,0 +1,261 @@
+from ..interning import intern_str
+
+
+def _bits(mask):
+    """Indexes of the set bits in ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def role_name(role):
+    """The name a role is known by: a string as given, else the Role's name, or its id if it has none."""
+    return intern_str(role if isinstance(role, str) else (role.name or role.id))
+
+
+def _identity_key(value):
+    return value if isinstance(value, str) else value.id
+
+
+class _Ids:
+    """Dense integer ids for names, reusing the ids of removed names."""
+
+    def __init__(self):
+        self.index = {}
+        self.names = []
+        self.free = []
+
+    def get(self, name):
+        return self.index.get(name)
+
+    def add(self, name):
+        index = self.index.get(name)
+        if index is None:
+            if self.free:
+                index = self.free.pop()
+                self.names[index] = name
+            else:
+                index = len(self.names)
+                self.names.append(name)
+            self.index[name] = index
+        return index
+
+    def remove(self, name):
+        index = self.index.pop(name)
+        self.names[index] = None
+        self.free.append(index)
+        return index
+
+
+class MembershipGraph:
+    """
+    Identity and role membership, kept as bitsets over dense integer ids.
+
+    Roles may be nested: when a role is added to a parent role, every
+    member of the role is also a member of the parent. The transitive
+    closure is precomputed, as each role's ancestors and each identity's
+    effective roles, plus each role's effective members, so has_role()
+    and has_identity() are a single bit test.
+
+    Changes are applied incrementally. Adding or removing an identity's
+    role touches only that identity and the roles it gains or loses;
+    nesting or unnesting a role recomputes only the roles below it and
+    the identities that hold them. Ids freed by removed identities are
+    reused, so the bitsets stay dense under churn.
+    """
+
+    def __init__(self):
+        self._identities = _Ids()
+        self._roles = _Ids()
+        self._direct = []      # identity id -> bitset of direct roles
+        self._effective = []   # identity id -> bitset of roles, with nesting
+        self._members = []     # role id -> bitset of identities that have it
+        self._parents = []     # role id -> bitset of direct parent roles
+        self._ancestors = []   # role id -> bitset of itself and every role it is nested in
+        self._names = {}       # identity id -> frozenset of effective role names, built on demand
+
+    # -- ids --------------------------------------------------------------------
+
+    def _role_id(self, role):
+        name = role_name(role)
+        index = self._roles.get(name)
+        if index is None:
+            index = self._roles.add(name)
+            if index == len(self._members):
+                self._members.append(0)
+                self._parents.append(0)
+                self._ancestors.append(0)
+            self._members[index] = 0
+            self._parents[index] = 0
+            self._ancestors[index] = 1 << index
+        return index
+
+    def _identity_id(self, identity):
+        key = _identity_key(identity)
+        index = self._identities.get(key)
+        if index is None:
+            index = self._identities.add(key)
+            if index == len(self._direct):
+                self._direct.append(0)
+                self._effective.append(0)
+            self._direct[index] = 0
+            self._effective[index] = 0
+        return index
+
+    def _set_effective(self, index, effective):
+        old = self._effective[index]
+        if old == effective:
+            return
+        bit = 1 << index
+        for role in _bits(old & ~effective):
+            self._members[role] &= ~bit
+        for role in _bits(effective & ~old):
+            self._members[role] |= bit
+        self._effective[index] = effective
+        self._names.pop(index, None)
+
+    def _closure(self, direct):
+        effective = 0
+        for role in _bits(direct):
+            effective |= self._ancestors[role]
+        return effective
+
+    # -- identities -------------------------------------------------------------
+
+    def register_role(self, role):
+        """Register a role; Role objects are attached so their methods use this graph."""
+        index = self._role_id(role)
+        if not isinstance(role, str):
+            role._membership = self
+        return index
+
+    def add_identity(self, identity, roles=()):
+        """Register an identity with its direct roles; Identity objects are attached."""
+        index = self._identity_id(identity)
+        if not isinstance(identity, str):
+            identity._membership = self
+            roles = list(roles) + list(identity.roles or ())
+        for role in roles:
+            self._direct[index] |= 1 << self._role_id(role)
+        self._set_effective(index, self._closure(self._direct[index]))
+        return index
+
+    def remove_identity(self, identity):
+        index = self._identities.get(_identity_key(identity))
+        if index is None:
+            return
+        self._set_effective(index, 0)
+        self._direct[index] = 0
+        self._identities.remove(_identity_key(identity))
+        if not isinstance(identity, str):
+            identity._membership = None
+
+    def add_role(self, identity, role):
+        index = self._identity_id(identity)
+        role_index = self._role_id(role)
+        self._direct[index] |= 1 << role_index
+        self._set_effective(index, self._effective[index] | self._ancestors[role_index])
+
+    def remove_role(self, identity, role):
+        index = self._identities.get(_identity_key(identity))
+        role_index = self._roles.get(role_name(role))
+        if index is None or role_index is None:
+            return
+        self._direct[index] &= ~(1 << role_index)
+        self._set_effective(index, self._closure(self._direct[index]))
+
+    # -- nested roles -------------------------------------------------------------
+
+    def _descendants(self, role_index):
+        bit = 1 << role_index
+        return [r for r, ancestors in enumerate(self._ancestors)
+                if ancestors & bit and self._roles.names[r] is not None]
+
+    def add_parent(self, role, parent):
+        """Nest ``role`` in ``parent``: members of ``role`` become members of ``parent``."""
+        role_index = self._role_id(role)
+        parent_index = self._role_id(parent)
+        if self._ancestors[parent_index] & (1 << role_index):
+            raise ValueError(f"Nesting {role_name(role)} in {role_name(parent)} would create a cycle")
+        self._parents[role_index] |= 1 << parent_index
+        gained = self._ancestors[parent_index]
+        for descendant in self._descendants(role_index):
+            self._ancestors[descendant] |= gained
+        for index in _bits(self._members[role_index]):
+            self._set_effective(index, self._effective[index] | gained)
+
+    def remove_parent(self, role, parent):
+        role_index = self._roles.get(role_name(role))
+        parent_index = self._roles.get(role_name(parent))
+        if role_index is None or parent_index is None:
+            return
+        self._parents[role_index] &= ~(1 << parent_index)
+        affected = self._descendants(role_index)
+        # Parents sit above their children, so resolve ancestors top-down
+        pending = set(affected)
+        while pending:
+            for r in list(pending):
+                parents = self._parents[r]
+                if any(p in pending for p in _bits(parents)):
+                    continue
+                ancestors = 1 << r
+                for p in _bits(parents):
+                    ancestors |= self._ancestors[p]
+                self._ancestors[r] = ancestors
+                pending.discard(r)
+        for index in _bits(self._members[role_index]):
+            self._set_effective(index, self._closure(self._direct[index]))
+
+    def remove_role_definition(self, role):
+        """Forget a role entirely, removing it from every identity and nesting."""
+        role_index = self._roles.get(role_name(role))
+        if role_index is None:
+            return
+        for child in [r for r, parents in enumerate(self._parents) if parents & (1 << role_index)]:
+            self.remove_parent(self._roles.names[child], role)
+        for parent in list(_bits(self._parents[role_index])):
+            self.remove_parent(role, self._roles.names[parent])
+        for index in list(_bits(self._members[role_index])):
+            if self._direct[index] & (1 << role_index):
+                self._direct[index] &= ~(1 << role_index)
+                self._set_effective(index, self._closure(self._direct[index]))
+        self._roles.remove(role_name(role))
+        self._ancestors[role_index] = 0
+        self._members[role_index] = 0
+
+    # -- queries ------------------------------------------------------------------
+
+    def has_role(self, identity, role):
+        index = self._identities.get(_identity_key(identity))
+        role_index = self._roles.get(role_name(role))
+        if index is None or role_index is None:
+            return False
+        return bool(self._effective[index] >> role_index & 1)
+
+    def role_names(self, identity):
+        """Every role the identity holds, directly or through nesting."""
+        index = self._identities.get(_identity_key(identity))
+        if index is None:
+            return frozenset()
+        names = self._names.get(index)
+        if names is None:
+            names = self._names[index] = frozenset(self._roles.names[r] for r in _bits(self._effective[index]))
+        return names
+
+    def direct_roles(self, identity):
+        index = self._identities.get(_identity_key(identity))
+        if index is None:
+            return []
+        return [self._roles.names[r] for r in _bits(self._direct[index])]
+
+    def identities(self, role):
+        """Ids of every identity holding the role, directly or through nesting."""
+        role_index = self._roles.get(role_name(role))
+        if role_index is None:
+            return []
+        return [self._identities.names[i] for i in _bits(self._members[role_index])]
+
+    def count(self, role):
+        role_index = self._roles.get(role_name(role))
+        return bin(self._members[role_index]).count("1") if role_index is not None else 0
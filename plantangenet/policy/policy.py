@@ -1,41 +1,51 @@
+from ..interning import intern_metadata, intern_str
+from .membership import role_name
+
+
 class Policy:
-    def __init__(self, id, name=None, description=None, metadata=None, spec=None, **kwargs):
-        self.id = id
-        self.name = name
+    __slots__ = ("id", "name", "description", "metadata", "spec", "statements", "roles", "_watchers")
+
+    def __init__(self, id, name=None, description=None, metadata=None, spec=None, statements=None, roles=None,
+                 **kwargs):
+        self.id = intern_str(id)
+        self.name = intern_str(name)
         self.description = description
-        self.metadata = metadata
+        self.metadata = intern_metadata(metadata)
         self.spec = spec
+        self.statements = list(statements or [])
+        self.roles = {role_name(r) for r in roles or ()}
+        self._watchers = []
+
+    def watch(self, callback):
+        """Call ``callback(policy)`` whenever the policy's statements change."""
+        self._watchers.append(callback)
+
+    def _changed(self):
+        for callback in self._watchers:
+            callback(self)
 
     def add_role(self, role):
-        # Simulate adding a role to the policy
-        print(f"Added role {role.name} to policy {self.name}")
+        self.roles.add(role_name(role))
 
     def remove_role(self, role):
-        # Simulate removing a role from the policy
-        print(f"Removed role {role.name} from policy {self.name}")
+        self.roles.discard(role_name(role))
 
     def add_statement(self, statement):
-        # Simulate adding a statement to the policy
-        print(f"Added statement {statement.name} to policy {self.name}")
+        self.statements.append(statement)
+        self._changed()
 
     def remove_statement(self, statement):
-        # Simulate removing a statement from the policy
-        print(f"Removed statement {statement.name} from policy {self.name}")
+        self.statements.remove(statement)
+        self._changed()
 
     def get_statements(self):
-        # Simulate getting all statements in the policy
-        print(f"Getting statements for policy {self.name}")
-        return []
+        return list(self.statements)
 
     def get_roles(self):
-        # Simulate getting all roles in the policy
-        print(f"Getting roles for policy {self.name}")
-        return []
+        return sorted(self.roles)
 
     def has_role(self, role):
-        # Simulate checking if the policy has a specific role
-        print(f"Checking if policy {self.name} has role {role.name}")
-        return role in self.get_roles()
+        return role_name(role) in self.roles
 
     def __str__(self):
         return f"Policy(id={self.id}, name={self.name}, description={self.description})"
@@ -1,30 +1,58 @@
+from ..interning import bounded_repr, intern_metadata, intern_str
+from .membership import role_name
+
+
 class Role:
+    """
+    A role. Once registered with a MembershipGraph, identities can be added
+    to it and roles nested in it, and membership checks are bit tests.
+    """
+
+    __slots__ = ("id", "name", "description", "metadata", "_membership")
+
     def __init__(self, id, name=None, description=None, metadata=None, **kwargs):
-        self.id = id
-        self.name = name
+        self.id = intern_str(id)
+        self.name = intern_str(name)
         self.description = description
-        self.metadata = metadata
+        self.metadata = intern_metadata(metadata)
+        self._membership = None
+
+    def _graph(self):
+        if self._membership is None:
+            raise ValueError(f"Role {role_name(self)} is not registered with a MembershipGraph")
+        return self._membership
 
     def add_identity(self, identity):
-        # Simulate adding an identity to the role
-        print(f"Added identity {identity.name} to role {self.name}")
+        graph = self._graph()
+        if getattr(identity, "_membership", None) is None and not isinstance(identity, str):
+            graph.add_identity(identity)
+        if isinstance(identity, str):
+            graph.add_role(identity, self)
+        else:
+            identity.add_role(self)
 
     def remove_identity(self, identity):
-        # Simulate removing an identity from the role
-        print(f"Removed identity {identity.name} from role {self.name}")
+        if isinstance(identity, str):
+            self._graph().remove_role(identity, self)
+        else:
+            identity.remove_role(self)
 
     def get_identities(self):
-        # Simulate getting all identities in the role
-        print(f"Getting identities for role {self.name}")
-        return []
+        """Ids of every identity holding this role, directly or through nesting."""
+        return self._graph().identities(self) if self._membership is not None else []
 
     def has_identity(self, identity):
-        # Simulate checking if the role has a specific identity
-        print(f"Checking if role {self.name} has identity {identity.name}")
-        return identity in self.get_identities()
+        return self._membership is not None and self._membership.has_role(identity, self)
+
+    def add_parent(self, parent):
+        """Nest this role in ``parent``, so its members are members of ``parent`` too."""
+        self._graph().add_parent(self, parent)
+
+    def remove_parent(self, parent):
+        self._graph().remove_parent(self, parent)
 
     def __str__(self):
-        return f"Role(name={self.name}, description={self.description}, metadata={self.metadata})"
+        return f"Role(name={self.name}, description={self.description}, metadata={bounded_repr(self.metadata)})"
 
     def __repr__(self):
-        return f"Role(name={self.name}, description={self.description}, metadata={self.metadata})"
+        return f"Role(name={self.name}, description={self.description}, metadata={bounded_repr(self.metadata)})"
@@ -1,11 +1,36 @@
+from ..interning import intern_metadata, intern_str
+
+
 class Statement:
-    def __init__(self, id, name=None, action=None, effect=None, condition=None, metadata=None, **kwargs):
-        self.id = id
-        self.name = name
-        self.action = action
-        self.effect = effect
+    __slots__ = ("id", "name", "action", "effect", "condition", "identities", "metadata", "_compiled")
+
+    def __init__(self, id, name=None, action=None, effect=None, condition=None, identities=None,
+                 metadata=None, **kwargs):
+        self.id = intern_str(id)
+        self.name = intern_str(name)
+        self.action = intern_str(action)
+        self.effect = intern_str(effect)
         self.condition = condition
-        self.metadata = metadata
+        self.identities = identities
+        self.metadata = intern_metadata(metadata)
+        self._compiled = None
+
+    @classmethod
+    def from_resource(cls, resource):
+        """Build from an ``IdentityAllowedStatement``/``RoleAllowedStatement`` document."""
+        metadata = resource.get("metadata") or {}
+        spec = resource.get("spec") or {}
+        name = metadata.get("name") or spec.get("name")
+        return cls(name, name=name, action=spec.get("action"), effect=spec.get("effect", "allow"),
+                   condition=spec.get("conditions") or spec.get("condition"),
+                   identities=spec.get("identities"), metadata=metadata)
+
+    def conditions(self):
+        """All conditions that must hold for the statement to apply."""
+        conditions = list(self.condition or [])
+        if self.identities:
+            conditions.append({"identities": self.identities})
+        return conditions
 
     def __str__(self):
         return f"Statement(id={self.id}, name={self.name}, action={self.action}, effect={self.effect})"
@@ -13,10 +38,22 @@ class Statement:
     def __repr__(self):
         return f"Statement(id={self.id}, name={self.name}, action={self.action}, effect={self.effect})"
 
-    def evaluate(self, context):
-        # Simulate evaluating the statement against a context
-        print(
-            f"Evaluating statement {self.name} with action {self.action} and effect {self.effect}")
-        if self.condition:
-            print(f"Conditions: {self.condition}")
-        return self.effect == "allow"
+    def evaluate(self, context, allow_scripts=False):
+        """
+        True if this statement applies to the request in ``context`` and
+        allows it. ``context["identity"]`` is the requesting Identity; the
+        rest is what the conditions refer to. Without an identity nothing
+        is allowed. The conditions are compiled on first use and reused, and
+        python scriptMatch conditions only run with ``allow_scripts``, as in
+        PolicyEngine.
+        """
+        from .engine import _CompiledStatement
+
+        identity = context.get("identity")
+        if identity is None:
+            return False
+        compiled = self._compiled
+        if compiled is None or compiled.allow_scripts != allow_scripts:
+            compiled = self._compiled = _CompiledStatement(self, allow_scripts)
+        return (not compiled.deny and compiled.applies_to(identity, identity.effective_roles())
+                and compiled.matches(identity, context))
@@ -1,7 +1,10 @@
 from .session import Session
-from .squad import Squad
+from .squad import Squad, SquadFullError, assign_members, matches_selector
 
 __all__ = [
     "Session",
     "Squad",
+    "SquadFullError",
+    "assign_members",
+    "matches_selector",
 ]
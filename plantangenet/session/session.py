@@ -1,13 +1,34 @@
+from ..interning import bounded_repr, intern_metadata, intern_str
+from .squad import assign_members, matches_selector
+
+
 class Session:
+    __slots__ = ("id", "name", "identity", "policy", "metadata", "spec", "description")
+
     def __init__(self, id: str, name: str, identity: str, policy: str, metadata: dict, spec: dict, description: str = '', **kwargs):
-        self.id = id
-        self.name = name
-        self.identity = identity
-        self.policy = policy
-        self.metadata = metadata
+        self.id = intern_str(id)
+        self.name = intern_str(name)
+        self.identity = intern_str(identity)
+        self.policy = intern_str(policy)
+        self.metadata = intern_metadata(metadata)
         self.spec = spec
         self.description = description
 
+    def __repr__(self):
+        return f"Session(id={self.id}, name={self.name}, identity={self.identity}, policy={self.policy}, spec={bounded_repr(self.spec)})"
+
+    def selector(self, kind):
+        """The squad selector for ``kind`` (``players``, ``referees``, ``arenas``) from the spec."""
+        return ((self.spec or {}).get(kind) or {}).get("selector") or {}
+
+    def select_squads(self, kind, squads):
+        selector = self.selector(kind)
+        return [s for s in squads if matches_selector(s.metadata, selector)]
+
+    def assign(self, kind, members, squads, balance=True):
+        """Place members into the squads this session selects for ``kind``; see assign_members()."""
+        return assign_members(members, squads, self.selector(kind), balance)
+
 # metadata:
 #   phase: setup
 #   name: tictactoe
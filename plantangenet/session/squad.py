@@ -1,12 +1,47 @@
+from itertools import islice
+
+from ..interning import intern_metadata, intern_str
+
+
+class SquadFullError(ValueError):
+    pass
+
+
+def _member_key(member):
+    return member if isinstance(member, str) else member.id
+
+
+def matches_selector(metadata, selector):
+    """True if ``metadata`` carries every label in ``selector["matchLabels"]``."""
+    wanted = (selector or {}).get("matchLabels") or {}
+    labels = (metadata or {}).get("labels") or {}
+    for key, value in wanted.items():
+        if labels.get(key) != value:
+            return False
+    return True
+
+
 class Squad:
+    """
+    A bounded group of members, keyed by member id.
+
+    Members are held in an insertion-ordered dict, so membership tests are
+    O(1) and get_members() keeps join order. Adding past ``max_members``
+    raises SquadFullError; add_members() checks capacity for the whole batch
+    first and adds all of it or nothing.
+    """
+
+    __slots__ = ("id", "name", "session_id", "class_name", "max_members", "metadata", "spec", "_members")
+
     def __init__(self, id, name=None, session_id=None, class_name=None, max_members=None, metadata=None, spec=None, **kwargs):
-        self.id = id
-        self.name = name
-        self.session_id = session_id
-        self.class_name = class_name
-        self.max_members = max_members
-        self.metadata = metadata
+        self.id = intern_str(id)
+        self.name = intern_str(name)
+        self.session_id = intern_str(session_id)
+        self.class_name = intern_str(class_name)
+        self.max_members = int(max_members) if max_members is not None else None
+        self.metadata = intern_metadata(metadata)
         self.spec = spec
+        self._members = {}
 
     def __str__(self):
         return f"Squad(id={self.id}, name={self.name}, session_id={self.session_id}, class_name={self.class_name}, max_members={self.max_members})"
@@ -14,20 +49,144 @@ class Squad:
     def __repr__(self):
         return f"Squad(id={self.id}, name={self.name}, session_id={self.session_id}, class_name={self.class_name}, max_members={self.max_members})"
 
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, member):
+        return _member_key(member) in self._members
+
+    @property
+    def available(self):
+        """Free places, or None for an unbounded squad."""
+        return None if self.max_members is None else self.max_members - len(self._members)
+
+    def is_full(self):
+        return self.max_members is not None and len(self._members) >= self.max_members
+
     def add_member(self, member):
-        # Simulate adding a member to the squad
-        print(f"Added member {member.name} to squad {self.name}")
+        """Add a member; returns False if it was already in the squad."""
+        key = _member_key(member)
+        if key in self._members:
+            return False
+        if self.is_full():
+            raise SquadFullError(f"Squad {self.name or self.id} is full ({self.max_members} members)")
+        self._members[key] = member
+        return True
+
+    def add_members(self, members):
+        """
+        Add a batch of members in one pass; members already present are
+        skipped. Raises SquadFullError, adding nobody, if the batch does not fit.
+
+        Returns:
+            int: Number of members added
+        """
+        current = self._members
+        new = {(m if type(m) is str else m.id): m for m in members}
+        if current:
+            for key in new.keys() & current.keys():
+                del new[key]
+        if self.max_members is not None and len(current) + len(new) > self.max_members:
+            raise SquadFullError(
+                f"Squad {self.name or self.id} has room for {self.available} more member(s), not {len(new)}")
+        current.update(new)
+        return len(new)
 
     def remove_member(self, member):
-        # Simulate removing a member from the squad
-        print(f"Removed member {member.name} from squad {self.name}")
+        """Remove a member; returns False if it was not in the squad."""
+        return self._members.pop(_member_key(member), None) is not None
+
+    def remove_members(self, members):
+        """Remove a batch of members, ignoring any not in the squad. Returns how many were removed."""
+        pop = self._members.pop
+        return sum(pop(_member_key(member), None) is not None for member in members)
 
     def get_members(self):
-        # Simulate getting all members in the squad
-        print(f"Getting members for squad {self.name}")
-        return []
+        return list(self._members.values())
 
     def has_member(self, member):
-        # Simulate checking if the squad has a specific member
-        print(f"Checking if squad {self.name} has member {member.name}")
-        return member in self.get_members()
+        return _member_key(member) in self._members
+
+
+def assign_members(members, squads, selector=None, balance=True):
+    """
+    Place ``members`` into the squads matching ``selector``.
+
+    With ``balance`` the members are spread so squad sizes stay as even as
+    capacity allows; otherwise each squad is filled in turn. Members already
+    in one of those squads stay where they are. Capacity is checked for the
+    whole batch before anything changes, raising SquadFullError if it does
+    not fit.
+
+    Returns:
+        dict: ``{squad id: number of members added}``
+    """
+    targets = [s for s in squads if selector is None or matches_selector(s.metadata, selector)]
+    # Dedupe by id and drop members already placed, all with dict/set operations
+    pending = {(m if type(m) is str else m.id): m for m in members}
+    for squad in targets:
+        if squad._members:
+            for key in pending.keys() & squad._members.keys():
+                del pending[key]
+
+    if not pending:
+        return {}
+    room = [s.available for s in targets]
+    unbounded = [i for i, r in enumerate(room) if r is None]
+    total = sum(r for r in room if r is not None)
+    if not unbounded and total < len(pending):
+        raise SquadFullError(f"{len(targets)} matching squad(s) have room for {total} member(s), not {len(pending)}")
+
+    quotas = _balanced_quotas(targets, room, len(pending)) if balance else _fill_quotas(room, len(pending))
+    items = iter(pending.items())
+    added = {}
+    for squad, quota in zip(targets, quotas):
+        if quota:
+            squad._members.update(islice(items, quota))
+            added[squad.id] = quota
+    return added
+
+
+def _fill_quotas(room, count):
+    quotas = []
+    for available in room:
+        quota = count if available is None else min(available, count)
+        quotas.append(quota)
+        count -= quota
+    return quotas
+
+
+def _balanced_quotas(squads, room, count):
+    """Raise the smallest squads first, like water filling, without one step per member."""
+    sizes = [len(s) for s in squads]
+    limits = [None if r is None else size + r for size, r in zip(sizes, room)]
+    level = _fill_level(sizes, limits, count)
+    quotas = [max(0, (level if limit is None else min(level, limit)) - size) for size, limit in zip(sizes, limits)]
+    left = count - sum(quotas)
+    # Less than one more round is left; it goes one each to squads at the level
+    for i, (size, limit) in enumerate(zip(sizes, limits)):
+        if not left:
+            break
+        if size + quotas[i] == level and (limit is None or level < limit):
+            quotas[i] += 1
+            left -= 1
+    return quotas
+
+
+def _fill_level(sizes, limits, count):
+    """
+    The highest level every squad can be raised to (each up to its limit)
+    using at most ``count`` members: one sweep over the sorted sizes and
+    limits, where the members needed grow by one per squad between them.
+    """
+    events = sorted([(size, 1) for size in sizes] + [(limit, -1) for limit in limits if limit is not None])
+    level = events[0][0]
+    needed = slope = 0
+    for position, delta in events:
+        if position > level:
+            if slope and needed + slope * (position - level) > count:
+                return level + (count - needed) // slope
+            needed += slope * (position - level)
+            level = position
+        slope += delta
+    return level + (count - needed) // slope if slope else level
@@ -1,5 +1,10 @@
-from .redis_connector import RedisConnector
+from .fake_server import FakeRedisServer
+from .redis_connector import ConnectionPool, Pipeline, RedisConnector, RedisError
 
 __all__ = [
+    "ConnectionPool",
+    "FakeRedisServer",
+    "Pipeline",
     "RedisConnector",
+    "RedisError",
 ]
@@ -0,0 +1,320 @@
+import fnmatch
+import queue
+import socket
+import threading
+import time
+
+
+class _Client:
+    def __init__(self, client_id, sock):
+        self.id = client_id
+        self.sock = sock
+        self.file = sock.makefile("rb")
+        self.db = 0
+        self.redirect = None
+        self.subscribed = False
+        self.queued = None  # commands buffered inside MULTI
+        # Replies go out from their own thread, so a client that pipelines
+        # more than a socket buffer of commands before reading cannot stall
+        # the server (Redis buffers output for the same reason)
+        self.outbox = queue.SimpleQueue()
+        threading.Thread(target=self._write_loop, daemon=True).start()
+
+    def write(self, data):
+        self.outbox.put(data)
+
+    def _write_loop(self):
+        while True:
+            data = self.outbox.get()
+            if data is None:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                return
+
+
+def _bulk(value):
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(items):
+    return b"*%d\r\n" % len(items) + b"".join(items)
+
+
+def _error(message):
+    return f"-ERR {message}\r\n".encode()
+
+
+OK = b"+OK\r\n"
+
+
+class FakeRedisServer:
+    """
+    A small Redis server for tests and local runs, with no network.
+
+    Each connect() creates a socket pair inside the process and serves RESP2
+    on the other end from a thread, so clients exercise their real wire
+    handling. It covers strings (with EX/PX expiry), sets, SCAN, MULTI/EXEC
+    and CLIENT TRACKING with REDIRECT invalidations. Pass ``server.connect``
+    as a RedisConnector's ``connection_factory``.
+    """
+
+    def __init__(self, password=None):
+        self.password = password
+        self.dbs = {}
+        self.expires = {}
+        self.commands = 0
+        self._clients = {}
+        self._tracking = {}  # (db, key) -> ids of clients to notify
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    def connect(self):
+        client_sock, server_sock = socket.socketpair()
+        with self._lock:
+            self._next_id += 1
+            client = _Client(self._next_id, server_sock)
+            self._clients[client.id] = client
+        threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+        return client_sock
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.sock.close()
+
+    # -- protocol -------------------------------------------------------------
+
+    def _serve(self, client):
+        authenticated = self.password is None
+        try:
+            while True:
+                args = self._read_command(client.file)
+                if args is None:
+                    break
+                name = args[0].upper().decode()
+                if not authenticated and name != "AUTH":
+                    client.write(b"-NOAUTH Authentication required.\r\n")
+                    continue
+                if name == "AUTH":
+                    authenticated = args[-1].decode() == self.password
+                    client.write(OK if authenticated else b"-WRONGPASS invalid password\r\n")
+                elif name == "MULTI":
+                    client.queued = []
+                    client.write(OK)
+                elif name == "DISCARD":
+                    client.queued = None
+                    client.write(OK)
+                elif name == "EXEC":
+                    if client.queued is None:
+                        client.write(_error("EXEC without MULTI"))
+                        continue
+                    queued, client.queued = client.queued, None
+                    with self._lock:
+                        replies = [self._execute(client, command) for command in queued]
+                    client.write(_array(replies))
+                elif client.queued is not None:
+                    client.queued.append(args)
+                    client.write(b"+QUEUED\r\n")
+                else:
+                    with self._lock:
+                        reply = self._execute(client, args)
+                    client.write(reply)
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(client.id, None)
+            client.write(None)
+            client.sock.close()
+
+    @staticmethod
+    def _read_command(file):
+        line = file.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(file.readline()[1:])
+            args.append(file.read(size + 2)[:-2])
+        return args
+
+    # -- commands -------------------------------------------------------------
+
+    def _db(self, client):
+        return self.dbs.setdefault(client.db, {})
+
+    def _alive(self, client, key):
+        deadline = self.expires.get((client.db, key))
+        if deadline is not None and deadline <= time.monotonic():
+            self._db(client).pop(key, None)
+            del self.expires[(client.db, key)]
+        return key in self._db(client)
+
+    def _read(self, client, key):
+        if client.redirect is not None:
+            self._tracking.setdefault((client.db, key), set()).add(client.redirect)
+        return self._db(client).get(key) if self._alive(client, key) else None
+
+    def _written(self, client, keys):
+        notify = {}
+        for key in keys:
+            for target in self._tracking.pop((client.db, key), ()):
+                notify.setdefault(target, []).append(key)
+        for target, changed in notify.items():
+            subscriber = self._clients.get(target)
+            if subscriber is not None and subscriber.subscribed:
+                subscriber.write(_array([_bulk(b"message"), _bulk(b"__redis__:invalidate"),
+                                         _array([_bulk(k) for k in changed])]))
+
+    def _execute(self, client, args):
+        self.commands += 1
+        name = args[0].upper().decode()
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return _error(f"unknown command '{name}'")
+        try:
+            return handler(client, *args[1:])
+        except (TypeError, ValueError):
+            return _error(f"wrong number of arguments or bad value for '{name}'")
+
+    def _cmd_ping(self, client):
+        return b"+PONG\r\n"
+
+    def _cmd_select(self, client, db):
+        client.db = int(db)
+        return OK
+
+    def _cmd_client(self, client, sub, *args):
+        sub = sub.upper()
+        if sub == b"ID":
+            return b":%d\r\n" % client.id
+        if sub == b"TRACKING":
+            on = args[0].upper() == b"ON"
+            options = [a.upper() for a in args[1:]]
+            if on and b"REDIRECT" in options:
+                client.redirect = int(args[1:][options.index(b"REDIRECT") + 1])
+            else:
+                client.redirect = client.id if on else None
+            return OK
+        return _error("unsupported CLIENT subcommand")
+
+    def _cmd_subscribe(self, client, *channels):
+        client.subscribed = True
+        return b"".join(_array([_bulk(b"subscribe"), _bulk(channel), b":%d\r\n" % (i + 1)])
+                        for i, channel in enumerate(channels))
+
+    def _cmd_get(self, client, key):
+        value = self._read(client, key)
+        if value is not None and not isinstance(value, bytes):
+            return b"-WRONGTYPE Operation against a key holding the wrong kind of value\r\n"
+        return _bulk(value)
+
+    def _cmd_mget(self, client, *keys):
+        values = [self._read(client, key) for key in keys]
+        return _array([_bulk(v if isinstance(v, bytes) else None) for v in values])
+
+    def _cmd_strlen(self, client, key):
+        value = self._read(client, key)
+        return b":%d\r\n" % len(value or b"")
+
+    def _cmd_set(self, client, key, value, *options):
+        options = [o.upper() if i % 2 == 0 else o for i, o in enumerate(options)]
+        self._db(client)[key] = value
+        self.expires.pop((client.db, key), None)
+        if b"EX" in options:
+            self.expires[(client.db, key)] = time.monotonic() + int(options[options.index(b"EX") + 1])
+        elif b"PX" in options:
+            self.expires[(client.db, key)] = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+        self._written(client, [key])
+        return OK
+
+    def _cmd_mset(self, client, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ValueError(pairs)
+        db = self._db(client)
+        for key, value in zip(pairs[::2], pairs[1::2]):
+            db[key] = value
+            self.expires.pop((client.db, key), None)
+        self._written(client, pairs[::2])
+        return OK
+
+    def _cmd_expire(self, client, key, seconds):
+        if not self._alive(client, key):
+            return b":0\r\n"
+        self.expires[(client.db, key)] = time.monotonic() + int(seconds)
+        return b":1\r\n"
+
+    def _cmd_del(self, client, *keys):
+        removed = [key for key in keys if self._alive(client, key)]
+        for key in removed:
+            del self._db(client)[key]
+            self.expires.pop((client.db, key), None)
+        self._written(client, removed)
+        return b":%d\r\n" % len(removed)
+
+    def _cmd_exists(self, client, *keys):
+        return b":%d\r\n" % sum(self._alive(client, key) for key in keys)
+
+    def _cmd_sadd(self, client, key, *members):
+        self._alive(client, key)
+        members_set = self._db(client).setdefault(key, set())
+        before = len(members_set)
+        members_set.update(members)
+        self._written(client, [key])
+        return b":%d\r\n" % (len(members_set) - before)
+
+    def _cmd_srem(self, client, key, *members):
+        if not self._alive(client, key):
+            return b":0\r\n"
+        members_set = self._db(client)[key]
+        before = len(members_set)
+        members_set.difference_update(members)
+        if not members_set:
+            del self._db(client)[key]
+        self._written(client, [key])
+        return b":%d\r\n" % (before - len(members_set))
+
+    def _cmd_smembers(self, client, key):
+        members = self._read(client, key) or set()
+        return _array([_bulk(m) for m in sorted(members)])
+
+    def _cmd_scard(self, client, key):
+        return b":%d\r\n" % len(self._read(client, key) or ())
+
+    def _cmd_scan(self, client, cursor, *options):
+        options = list(options)
+        pattern = b"*"
+        count = 10
+        for i in range(0, len(options) - 1, 2):
+            if options[i].upper() == b"MATCH":
+                pattern = options[i + 1]
+            elif options[i].upper() == b"COUNT":
+                count = int(options[i + 1])
+        keys = sorted(k for k in list(self._db(client)) if self._alive(client, k))
+        start = int(cursor)
+        page = keys[start:start + count]
+        following = start + count if start + count < len(keys) else 0
+        matched = [k for k in page if fnmatch.fnmatchcase(k.decode(errors="replace"), pattern.decode())]
+        return _array([_bulk(b"%d" % following), _array([_bulk(k) for k in matched])])
+
+    def _cmd_dbsize(self, client):
+        return b":%d\r\n" % sum(self._alive(client, k) for k in list(self._db(client)))
+
+    def _cmd_flushdb(self, client):
+        keys = list(self._db(client))
+        self._db(client).clear()
+        for key in keys:
+            self.expires.pop((client.db, key), None)
+        self._written(client, keys)
+        return OK
@@ -1,18 +1,444 @@
+import queue
+import socket
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import unquote, urlparse
+
+
+class RedisError(Exception):
+    pass
+
+
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, (int, float)):
+        return repr(value).encode("ascii")
+    raise TypeError(f"Cannot send {type(value).__name__} to Redis")
+
+
+def encode_command(args):
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = _to_bytes(arg)
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class Connection:
+    """One RESP2 connection. Replies are read in order, so commands can be pipelined."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.file = sock.makefile("rb")
+
+    def send(self, commands):
+        self.sock.sendall(b"".join(encode_command(args) for args in commands))
+
+    def read_reply(self):
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RedisError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            return self.file.read(size + 2)[:-2]
+        if kind == b"*":
+            count = int(rest)
+            if count < 0:
+                return None
+            return [self.read_reply() for _ in range(count)]
+        # The stream is out of step with the commands sent; the connection is unusable
+        raise ConnectionError(f"Unexpected reply from Redis: {line!r}")
+
+    def execute(self, *args):
+        self.send([args])
+        reply = self.read_reply()
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def close(self):
+        try:
+            # Wakes up a thread blocked reading this connection
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.file.close()
+        self.sock.close()
+
+
+class ConnectionPool:
+    """Up to ``max_connections`` reusable connections; callers block when all are in use."""
+
+    def __init__(self, factory, max_connections=10, on_connect=None):
+        self.factory = factory
+        self.max_connections = max_connections
+        self.on_connect = on_connect
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all = []
+
+    def _new(self):
+        connection = Connection(self.factory())
+        if self.on_connect:
+            self.on_connect(connection)
+        self._all.append(connection)
+        return connection
+
+    @contextmanager
+    def connection(self):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.max_connections
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    connection = self._new()
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                connection = self._idle.get()
+        reusable = False
+        try:
+            yield connection
+            reusable = True
+        except RedisError:
+            # An error reply (WRONGTYPE, READONLY, ...) was read in full, so
+            # the connection is still in step and can serve the next command
+            reusable = True
+            raise
+        finally:
+            if reusable:
+                self._idle.put(connection)
+            else:
+                # A socket error or an interrupted read leaves a reply half
+                # read; never hand that connection out again
+                connection.close()
+                with self._lock:
+                    self._created -= 1
+                    self._all.remove(connection)
+
+    def close(self):
+        for connection in self._all:
+            connection.close()
+        self._all = []
+        self._created = 0
+        self._idle = queue.LifoQueue()
+
+
+class Pipeline:
+    """
+    Commands buffered and sent in one write, with all replies read back in
+    one pass. With ``transaction=True`` they are wrapped in MULTI/EXEC and
+    applied atomically.
+    """
+
+    def __init__(self, connector, transaction=False):
+        self.connector = connector
+        self.transaction = transaction
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.commands = []
+
+    def execute_command(self, *args):
+        self.commands.append(args)
+        return self
+
+    def get(self, key):
+        return self.execute_command("GET", key)
+
+    def set(self, key, value, ex=None):
+        return self.execute_command("SET", key, value, *(("EX", ex) if ex else ()))
+
+    def delete(self, *keys):
+        return self.execute_command("DEL", *keys)
+
+    def mset(self, mapping):
+        return self.execute_command("MSET", *[part for item in mapping.items() for part in item])
+
+    def sadd(self, key, *members):
+        return self.execute_command("SADD", key, *members)
+
+    def srem(self, key, *members):
+        return self.execute_command("SREM", key, *members)
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        if not commands:
+            return []
+        written = [args for args in commands if args[0].upper() in self.connector.WRITE_COMMANDS]
+        if self.transaction:
+            commands = [("MULTI",)] + commands + [("EXEC",)]
+        with self.connector.pool.connection() as connection:
+            connection.send(commands)
+            replies = [connection.read_reply() for _ in commands]
+        for args in written:
+            self.connector._invalidate_local(args)
+        if self.transaction:
+            queued = replies[1:-1]
+            errors = [r for r in queued if isinstance(r, RedisError)]
+            if errors:
+                raise errors[0]
+            replies = replies[-1]
+            if replies is None:
+                raise RedisError("Transaction aborted")
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+
 class RedisConnector:
-    def __init__(self, host=None, port=None, db=None, **kwargs):
-        self.host = host
-        self.port = port
-        self.db = db
+    """
+    Redis client with a connection pool, pipelines and bulk MGET/MSET.
+
+    With ``client_cache=True``, GET/MGET results are kept in a bounded local
+    cache. The server is asked to track keys this client has read
+    (CLIENT TRACKING with REDIRECT to a dedicated invalidation connection),
+    and a background thread drops entries as soon as any client changes
+    them.
+
+    ``connection_factory`` returns a connected socket; it defaults to a TCP
+    connection to ``host``/``port`` and can be pointed at FakeRedisServer.
+    """
+
+    WRITE_COMMANDS = {"SET", "MSET", "DEL", "SADD", "SREM", "FLUSHDB", "EXPIRE"}
+
+    def __init__(self, host=None, port=None, db=None, password=None, url=None, max_connections=10,
+                 client_cache=False, cache_size=10000, connection_factory=None, timeout=10.0, **kwargs):
+        if url:
+            parsed = urlparse(url)
+            host = host or parsed.hostname
+            port = port or parsed.port
+            password = password or (unquote(parsed.password) if parsed.password else None)
+            if db is None and parsed.path.strip("/"):
+                db = int(parsed.path.strip("/"))
+        self.host = host or "localhost"
+        self.port = int(port or 6379)
+        self.db = int(db or 0)
+        self.password = password or None
+        self.timeout = timeout
+        self.connection_factory = connection_factory or self._tcp_connection
+        self.pool = ConnectionPool(self.connection_factory, max_connections, self._on_connect)
+        self.client_cache = client_cache
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._invalidations = 0
+        self._invalidation_connection = None
+        self._invalidation_client_id = None
+        self._invalidation_thread = None
+
+    def _tcp_connection(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _handshake(self, connection):
+        if self.password:
+            connection.execute("AUTH", self.password)
+        if self.db:
+            connection.execute("SELECT", self.db)
+
+    def _on_connect(self, connection):
+        self._handshake(connection)
+        if self._invalidation_client_id is not None:
+            connection.execute("CLIENT", "TRACKING", "ON", "REDIRECT", self._invalidation_client_id)
 
     def connect(self):
-        # Simulate a connection to Redis
-        print(f"Connected to Redis at {self.host}:{self.port}, DB: {self.db}")
+        if self.client_cache and self._invalidation_connection is None:
+            connection = Connection(self.connection_factory())
+            # Blocking reads here wait for invalidations, not for replies
+            connection.sock.settimeout(None)
+            self._handshake(connection)
+            self._invalidation_client_id = connection.execute("CLIENT", "ID")
+            connection.execute("SUBSCRIBE", "__redis__:invalidate")
+            self._invalidation_connection = connection
+            self._invalidation_thread = threading.Thread(target=self._invalidation_loop, daemon=True)
+            self._invalidation_thread.start()
+        self.ping()
+        return self
+
+    def close(self):
+        self.pool.close()
+        if self._invalidation_connection is not None:
+            self._invalidation_connection.close()
+            self._invalidation_connection = None
+            self._invalidation_client_id = None
+        self._clear_cache()
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- client-side cache --------------------------------------------------
+
+    def _invalidation_loop(self):
+        connection = self._invalidation_connection
+        while True:
+            try:
+                message = connection.read_reply()
+            except (ConnectionError, OSError, ValueError):
+                # Without invalidations the cache cannot be trusted
+                self.client_cache = False
+                self._clear_cache()
+                return
+            if not isinstance(message, list) or message[0] != b"message":
+                continue
+            keys = message[2]
+            with self._cache_lock:
+                self._invalidations += 1
+                if keys is None:
+                    self._cache.clear()
+                else:
+                    for key in keys:
+                        self._cache.pop(key, None)
+
+    def _clear_cache(self):
+        with self._cache_lock:
+            self._invalidations += 1
+            self._cache.clear()
+
+    def _cached(self, key):
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+        return False, None
+
+    def _remember(self, pairs, generation):
+        with self._cache_lock:
+            # An invalidation may have raced the reply; only cache if none did
+            if generation != self._invalidations:
+                return
+            for key, value in pairs:
+                self._cache[key] = value
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _invalidate_local(self, args):
+        if not self.client_cache:
+            return
+        command = args[0].upper()
+        if command == "FLUSHDB":
+            self._clear_cache()
+            return
+        if command == "MSET":
+            keys = args[1::2]
+        elif command in ("SET", "EXPIRE", "SADD", "SREM"):
+            keys = args[1:2]
+        else:
+            keys = args[1:]
+        with self._cache_lock:
+            self._invalidations += 1
+            for key in keys:
+                self._cache.pop(_to_bytes(key), None)
+
+    # -- commands -----------------------------------------------------------
+
+    def execute_command(self, *args):
+        with self.pool.connection() as connection:
+            reply = connection.execute(*args)
+        if args[0].upper() in self.WRITE_COMMANDS:
+            self._invalidate_local(args)
+        return reply
+
+    def pipeline(self, transaction=False):
+        return Pipeline(self, transaction)
+
+    def ping(self):
+        return self.execute_command("PING") == "PONG"
 
     def get(self, key):
-        # Simulate getting a value from Redis
-        print(f"Getting value for key: {key}")
-        return "value"
+        if self.client_cache:
+            hit, value = self._cached(_to_bytes(key))
+            if hit:
+                return value
+            generation = self._invalidations
+            value = self.execute_command("GET", key)
+            self._remember([(_to_bytes(key), value)], generation)
+            return value
+        return self.execute_command("GET", key)
+
+    def mget(self, keys):
+        keys = [_to_bytes(key) for key in keys]
+        if not keys:
+            return []
+        if not self.client_cache:
+            return self.execute_command("MGET", *keys)
+        results = {}
+        missing = []
+        for key in keys:
+            hit, value = self._cached(key)
+            if hit:
+                results[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            generation = self._invalidations
+            fetched = list(zip(missing, self.execute_command("MGET", *missing)))
+            self._remember(fetched, generation)
+            results.update(fetched)
+        return [results[key] for key in keys]
+
+    def set(self, key, value, ex=None):
+        return self.execute_command("SET", key, value, *(("EX", ex) if ex else ())) == "OK"
+
+    def mset(self, mapping):
+        if not mapping:
+            return True
+        return self.execute_command("MSET", *[part for item in mapping.items() for part in item]) == "OK"
+
+    def delete(self, *keys):
+        return self.execute_command("DEL", *keys) if keys else 0
+
+    def exists(self, *keys):
+        return self.execute_command("EXISTS", *keys)
+
+    def sadd(self, key, *members):
+        return self.execute_command("SADD", key, *members)
+
+    def srem(self, key, *members):
+        return self.execute_command("SREM", key, *members)
+
+    def smembers(self, key):
+        return set(self.execute_command("SMEMBERS", key))
+
+    def scard(self, key):
+        return self.execute_command("SCARD", key)
+
+    def scan_iter(self, match="*", count=1000):
+        cursor = b"0"
+        while True:
+            cursor, keys = self.execute_command("SCAN", cursor, "MATCH", match, "COUNT", count)
+            yield from keys
+            if cursor in (b"0", 0):
+                return
 
-    def set(self, key, value):
-        # Simulate setting a value in Redis
-        print(f"Setting value for key: {key} to {value}")
+    def flushdb(self):
+        return self.execute_command("FLUSHDB") == "OK"
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep every test out of the user's ~/.cache/janet and away from configured Redis servers."""
+    monkeypatch.setenv("JANET_CACHE_DIR", str(tmp_path / "janet-cache"))
+    for name in ("JANET_CACHE_REDIS", "JANET_CACHE_TTL", "JANET_CACHE_MAX_BYTES", "JANET_STATE_REDIS"):
+        monkeypatch.delenv(name, raising=False)
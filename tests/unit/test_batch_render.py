@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from janet.batch_render import expand_plan_dirs, output_name, render_batch
+
+PLAN = "plan:\n  preflight:\n    selector:\n      matchLabels:\n        phase: preflight\n"
+
+
+def test_expand_plan_dirs_globs_and_filters(tmp_path):
+    for name in ["b", "a", "empty"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "a" / "plan.yaml").write_text("phases: []\n")
+    (tmp_path / "b" / "plan.yaml").write_text("phases: []\n")
+
+    expected = [str(tmp_path / "a"), str(tmp_path / "b")]
+    assert expand_plan_dirs([str(tmp_path / "*")]) == expected
+    assert expand_plan_dirs([str(tmp_path / "a"), str(tmp_path / "a/"), str(tmp_path / "b")]) == expected
+    assert expand_plan_dirs([str(tmp_path / "empty")]) == []
+
+
+def test_output_name_is_flat_and_unique(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert output_name(os.path.join("plans", "web"), "json") == "plans__web.json"
+    assert output_name(os.path.join("plans", "web", "api"), "yaml") == "plans__web__api.yaml"
+    assert output_name(".", "json") == "plan.json"
+
+
+def test_colliding_output_names_are_rejected(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="a__b.json"):
+        render_batch([os.path.join("a", "b"), "a__b"], str(tmp_path / "out"), {})
+    assert not (tmp_path / "out").exists()
+
+
+def test_render_batch_renders_each_plan_in_the_pool(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for name in ("web", "api", "broken"):
+        (tmp_path / "plans" / name).mkdir(parents=True)
+        (tmp_path / "plans" / name / "plan.yaml").write_text(PLAN if name != "broken" else "- not a plan\n")
+    plan_dirs = expand_plan_dirs(["plans/*"])
+
+    results = render_batch(plan_dirs, str(tmp_path / "out"), {"no_cache": True}, jobs=2)
+    assert [(plan_dir, ok) for plan_dir, ok, _, _ in results] == [
+        (os.path.join("plans", "api"), True), (os.path.join("plans", "broken"), False), (os.path.join("plans", "web"), True)]
+    rendered = json.loads((tmp_path / "out" / "plans__web.json").read_text())
+    assert [doc["Id"] for doc in rendered] == ["preflight"]
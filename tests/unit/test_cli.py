@@ -2,16 +2,8 @@ import pytest
 from janet.cli import JanetCLI
 
 
-class DummyPhaseExecutor:
-    def __init__(self):
-        pass
-
-    def execute(self, phase_resource=None):
-        return True
-
-
 class DummyPlanRenderer:
-    def __init__(self, plan):
+    def __init__(self, plan, resources=None):
         self.plan = plan
 
     def render(self):
@@ -20,7 +12,6 @@ class DummyPlanRenderer:
 
 @pytest.fixture(autouse=True)
 def patch_dependencies(monkeypatch):
-    monkeypatch.setattr('janet.cli.PhaseExecutor', DummyPhaseExecutor)
     monkeypatch.setattr('janet.cli.PlanRenderer', DummyPlanRenderer)
 
 
@@ -38,3 +29,89 @@ def test_validate_plan(monkeypatch, tmp_path):
 
 def test_render_plan(monkeypatch, tmp_path):
     plan_file = tmp_path / "plan.yaml"
+
+
+def test_cli_import_is_lazy():
+    import subprocess
+    import sys
+
+    heavy = ('yaml', 'requests', 'jsonschema', 'meatball', 'asyncio', 'concurrent.futures', 'tracemalloc')
+    probe = (
+        "import sys; from janet.cli import JanetCLI; JanetCLI(); "
+        f"print(sorted(m for m in {heavy!r} if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_status_reports_nats_errors(monkeypatch, capsys):
+    from plantangenet.messaging import NATSConnector, NATSError
+    from janet.transport import EXIT_UNREACHABLE
+
+    async def refuse(self):
+        raise NATSError("NATS connect failed: -ERR 'Authorization Violation'")
+
+    monkeypatch.setattr(NATSConnector, "connect", refuse)
+    cli = JanetCLI({"nats": "nats://localhost:4222", "session": "ttt"})
+    assert cli.status_command() == EXIT_UNREACHABLE
+    assert "Authorization Violation" in capsys.readouterr().out
+
+
+def test_render_cache_is_opened_once_per_run(monkeypatch):
+    opened = []
+
+    class Cache:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def open_render_cache():
+        opened.append(Cache())
+        return opened[-1]
+
+    monkeypatch.setattr("janet.render_cache.open_render_cache", open_render_cache)
+    cli = JanetCLI({})
+    assert cli.open_render_cache() is cli.open_render_cache()
+    cli.close_render_cache()
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_ndjson_stdout_holds_only_documents(monkeypatch, tmp_path, capsys):
+    import json
+    import shutil
+    from pathlib import Path
+
+    from janet.plan_renderer import PlanRenderer
+
+    monkeypatch.setattr('janet.cli.PlanRenderer', PlanRenderer)
+    shutil.copytree(Path(__file__).resolve().parents[2] / "examples" / "tictactoe", tmp_path / "ttt")
+    (tmp_path / "ttt" / "zz_broken.yaml").write_text("kind: Squad\n---\nkind: [unclosed\n")
+    cli = JanetCLI({"resources": True, "no_cache": True, "format": "ndjson"})
+    cli.stream_rendered_plan(str(tmp_path / "ttt" / "plan.yaml"))
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert lines and all(isinstance(json.loads(line), dict) for line in lines)
+    assert "Skipping rest of" in captured.err
+
+
+def test_atomic_writes_keep_normal_file_modes(tmp_path):
+    import os
+    import stat
+    from janet.helpers import atomic_write_text
+
+    umask = os.umask(0o022)
+    try:
+        created = tmp_path / "rendered.json"
+        atomic_write_text(created, "[]")
+        assert stat.S_IMODE(created.stat().st_mode) == 0o644
+
+        existing = tmp_path / "shared.json"
+        existing.write_text("{}")
+        existing.chmod(0o664)
+        atomic_write_text(existing, "[]")
+        assert stat.S_IMODE(existing.stat().st_mode) == 0o664
+        assert existing.read_text() == "[]"
+    finally:
+        os.umask(umask)
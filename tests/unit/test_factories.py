@@ -0,0 +1,60 @@
+import pytest
+
+from plantangenet.factories import ArgumentValueFactory, FreshIdFactory, RandomSlugFactory
+from plantangenet.factories import bulk
+
+# Crockford's base32 digits, mapped onto the digits int(..., 32) reads
+_CROCKFORD = str.maketrans("0123456789ABCDEFGHJKMNPQRSTVWXYZ", "0123456789ABCDEFGHIJKLMNOPQRSTUV")
+
+
+def _decode_ulid(value):
+    assert len(value) == 26 and value[0] <= "7"
+    return int(value.translate(_CROCKFORD), 32)
+
+
+def test_bulk_ulids_are_valid_and_monotonic():
+    first = bulk.monotonic_ulids(3000)
+    second = bulk.monotonic_ulids(5)
+    values = [_decode_ulid(u) for u in first + second]
+    assert values == sorted(set(values))
+    assert values[:3000] == list(range(values[0], values[0] + 3000))
+
+
+def test_bulk_ulids_parse_as_ulids():
+    ulid = pytest.importorskip("ulid")
+    for value in bulk.monotonic_ulids(3):
+        assert int(ulid.ULID.from_str(value)) == _decode_ulid(value)
+    fresh = FreshIdFactory().generate({"game_id": {}})["game_id"]
+    assert _decode_ulid(fresh[len("VAR-"):]) == int(ulid.ULID.from_str(fresh[len("VAR-"):]))
+
+
+def test_fresh_ids_columns_and_environment_snapshot():
+    references = {"session_id": {"prefix": "SES-", "shellVar": "SESSION_ID"}, "game_id": {}}
+    ids = FreshIdFactory().generate_many(references, 4, environ={"SESSION_ID": "SES-fixed"})
+    assert ids["session_id"] == ["SES-fixed"] * 4
+    assert len(set(ids["game_id"])) == 4 and all(len(i) == 30 and i.startswith("VAR-") for i in ids["game_id"])
+
+    sample = FreshIdFactory().generate_many({"s": {"prefix": "S-"}}, 3, sample=True, environ={})
+    assert all(len(s) == 18 for s in sample["s"])
+
+
+def test_argument_values_match_the_per_call_path():
+    references = {"games": {"default": 100, "shellVar": "GAMES"}, "players": {"default": 1800}, "token": {}}
+    env = {"GAMES": "12"}
+    columns = ArgumentValueFactory().generate_many(references, 2, environ=env)
+    assert columns == {"games": ["12", "12"], "players": [1800, 1800], "token": [None, None]}
+    tokens = ArgumentValueFactory().generate_many({"token": {}}, 2, sample=True, environ={})["token"]
+    assert len(tokens[0]) == 32 and tokens[0] != tokens[1]
+
+
+def test_slugs_are_unique_within_a_batch():
+    pytest.importorskip("coolname")
+    slugs = RandomSlugFactory().generate_many({"name": {"chunks": 2}}, 500, environ={})["name"]
+    assert len(set(slugs)) == 500
+
+
+def test_unique_values_redraws_duplicates():
+    draws = iter("aabbc")
+    assert bulk.unique_values(lambda: next(draws), 3) == ["a", "b", "c"]
+    with pytest.raises(ValueError):
+        bulk.unique_values(lambda: "same", 2, max_attempts=10)
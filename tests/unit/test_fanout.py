@@ -0,0 +1,63 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from janet.fanout import format_results_table, load_endpoints_file, submit_many
+from janet.transport import PMPTransport, SubmitResult
+
+
+def _server(status, delay=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(delay)
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_port}"
+
+
+def test_slow_endpoint_does_not_hold_up_the_rest():
+    servers = [_server(200, delay=0.5), _server(200), _server(400)]
+    endpoints = [endpoint for _, endpoint in servers]
+    try:
+        with PMPTransport(max_retries=0) as transport:
+            results = submit_many(transport, endpoints, [{"Kind": "Phase", "Id": "setup"}], concurrency=3)
+    finally:
+        for httpd, _ in servers:
+            httpd.shutdown()
+            httpd.server_close()
+
+    assert [r.endpoint for r in results] == endpoints
+    assert [r.status_code for r in results] == [200, 200, 400]
+    assert results[0].elapsed >= 0.5
+    assert results[1].elapsed < 0.5
+
+    table = format_results_table(results).splitlines()
+    assert table[0].split() == ["ENDPOINT", "STATUS", "ATTEMPTS", "LATENCY", "RESULT"]
+    assert len(table) == 4
+
+
+def test_load_endpoints_file(tmp_path):
+    path = tmp_path / "endpoints.txt"
+    path.write_text("# regions\nhttp://us-east:3030\n\nhttp://eu-west:3030  # primary\n")
+    assert load_endpoints_file(path) == ["http://us-east:3030", "http://eu-west:3030"]
+
+
+def test_results_table_handles_blank_error_bodies():
+    results = [
+        SubmitResult("http://a", status_code=500, text="\n"),
+        SubmitResult("http://b", status_code=503, text="  \nbusy, retry later\n"),
+    ]
+    rows = format_results_table(results).splitlines()
+    assert rows[1].endswith("failed")
+    assert rows[2].endswith("busy, retry later")
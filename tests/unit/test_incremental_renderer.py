@@ -0,0 +1,96 @@
+from janet.incremental_renderer import IncrementalRenderer
+from janet.plan_loader import iter_documents, iter_plan_documents, safe_load
+from janet.plan_renderer import PlanRenderer
+from janet.watcher import PollingWatcher, create_watcher
+
+PLAN = """plan:
+  preflight:
+    selector:
+      matchLabels:
+        phase: preflight
+  setup:
+    selector:
+      matchLabels:
+        phase: setup
+"""
+
+
+def _load(path):
+    with open(path) as f:
+        return safe_load(f)
+
+
+def _full_render(tmp_path):
+    return PlanRenderer(_load(tmp_path / "plan.yaml"),
+                        iter_plan_documents(tmp_path, exclude=[tmp_path / "plan.yaml"])).render()
+
+
+def _write_plan_dir(tmp_path):
+    (tmp_path / "plan.yaml").write_text(PLAN)
+    (tmp_path / "a.yaml").write_text(
+        "kind: Redis\nmetadata:\n  labels:\n    phase: preflight\n")
+    (tmp_path / "b.yaml").write_text(
+        "kind: Squad\nmetadata:\n  labels:\n    phase: setup\n")
+
+
+def test_resource_change_rerenders_only_matching_phases(tmp_path):
+    _write_plan_dir(tmp_path)
+    renderer = IncrementalRenderer(tmp_path / "plan.yaml", _load, resources=True)
+    assert renderer.render() == _full_render(tmp_path)
+
+    (tmp_path / "b.yaml").write_text(
+        "kind: Squad\nmetadata:\n  labels:\n    phase: setup\n---\n"
+        "kind: Arena\nmetadata:\n  labels:\n    phase: setup\n")
+    manifest, phases = renderer.update([tmp_path / "b.yaml"])
+    assert phases == {"setup"}
+    assert manifest == _full_render(tmp_path)
+
+    (tmp_path / "a.yaml").unlink()
+    manifest, phases = renderer.update([tmp_path / "a.yaml"])
+    assert phases == {"preflight"}
+    assert manifest == _full_render(tmp_path)
+
+
+def test_plan_change_rerenders_only_changed_phases(tmp_path):
+    _write_plan_dir(tmp_path)
+    renderer = IncrementalRenderer(tmp_path / "plan.yaml", _load, resources=True)
+    renderer.render()
+
+    (tmp_path / "plan.yaml").write_text(PLAN + "    description: Set up the board.\n")
+    manifest, phases = renderer.update([tmp_path / "plan.yaml"])
+    assert phases == {"setup"}
+    assert manifest == _full_render(tmp_path)
+
+
+def test_watchers_report_changed_yaml(tmp_path):
+    watchers = [PollingWatcher(tmp_path, interval=0.01), create_watcher(tmp_path)]
+    try:
+        (tmp_path / "plan.yaml").write_text(PLAN)
+        (tmp_path / "notes.txt").write_text("ignored")
+        for watcher in watchers:
+            assert watcher.wait(timeout=2) == {(tmp_path / "plan.yaml").resolve()}
+            assert watcher.wait(timeout=0.05) == set()
+    finally:
+        for watcher in watchers:
+            watcher.close()
+
+
+def test_resources_in_a_multi_document_plan_are_kept(tmp_path):
+    def load_all(path):
+        return list(iter_documents(path))
+
+    def full_render():
+        return PlanRenderer(load_all(tmp_path / "plan.yaml"),
+                            iter_plan_documents(tmp_path, exclude=[tmp_path / "plan.yaml"])).render()
+
+    _write_plan_dir(tmp_path)
+    (tmp_path / "plan.yaml").write_text(
+        PLAN + "---\nkind: Config\nmetadata:\n  labels:\n    phase: setup\n")
+    renderer = IncrementalRenderer(tmp_path / "plan.yaml", load_all, resources=True)
+    assert renderer.render() == full_render()
+
+    (tmp_path / "plan.yaml").write_text(
+        PLAN + "---\nkind: Config\nmetadata:\n  labels:\n    phase: preflight\n")
+    manifest, phases = renderer.update([tmp_path / "plan.yaml"])
+    assert phases == {"preflight", "setup"}
+    assert manifest == full_render()
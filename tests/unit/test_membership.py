@@ -0,0 +1,85 @@
+import pytest
+
+from plantangenet.policy import Identity, MembershipGraph, Policy, PolicyEngine, Role, Statement
+
+
+def test_nested_roles_are_precomputed_and_updated_incrementally():
+    graph = MembershipGraph()
+    player, participant = Role("player", name="player"), Role("participant", name="participant")
+    graph.register_role(player)
+    graph.register_role(participant)
+    player.add_parent(participant)
+    graph.add_parent("game-1", "player")
+
+    alice = Identity("alice", roles=["game-1"])
+    graph.add_identity(alice)
+    assert alice.has_role("participant") and alice.has_role(player)
+    assert alice.get_roles() == ["game-1", "participant", "player"]
+    assert participant.has_identity(alice)
+    assert participant.get_identities() == ["alice"]
+
+    player.remove_parent(participant)
+    assert not alice.has_role("participant")
+    assert alice.has_role("player")
+    player.add_parent(participant)
+
+    alice.remove_role("game-1")
+    assert alice.get_roles() == []
+    assert not participant.has_identity(alice)
+
+    bob = Identity("bob")
+    participant.add_identity(bob)
+    assert bob.roles == ["participant"] and bob.has_role("participant") and not bob.has_role("player")
+    assert graph.count("participant") == 1
+
+
+def test_cycles_are_rejected():
+    graph = MembershipGraph()
+    graph.add_parent("a", "b")
+    graph.add_parent("b", "c")
+    with pytest.raises(ValueError, match="cycle"):
+        graph.add_parent("c", "a")
+
+
+def test_removed_identities_free_their_ids():
+    graph = MembershipGraph()
+    players = [Identity(f"p{i}", roles=["player"]) for i in range(3)]
+    for player in players:
+        graph.add_identity(player)
+    graph.remove_identity(players[1])
+    assert graph.identities("player") == ["p0", "p2"]
+    assert players[1]._membership is None
+
+    graph.add_identity(Identity("p3", roles=["player"]))
+    assert graph.add_identity("p3") == 1
+    assert sorted(graph.identities("player")) == ["p0", "p2", "p3"]
+
+
+def test_policy_roles_and_engine_use_nested_membership():
+    policy = Policy("ttt", roles=["owner"])
+    assert policy.has_role("owner") and not policy.has_role(Role("x", name="x"))
+
+    graph = MembershipGraph()
+    graph.add_parent("game-1", "player")
+    player = Identity("p", roles=["game-1"])
+    graph.add_identity(player)
+    engine = PolicyEngine([Statement("play", action="play", effect="allow",
+                                     condition=[{"roleSelector": {"roleBinding": "player"}}])])
+    assert engine.is_allowed(player, "play")
+    player.remove_role("game-1")
+    assert not engine.is_allowed(player, "play")
+
+
+def test_roles_without_a_name_are_known_by_their_id():
+    graph = MembershipGraph()
+    admin = Role("admin")
+    graph.register_role(admin)
+    alice = Identity("alice")
+    graph.add_identity(alice)
+    admin.add_identity(alice)
+    assert alice.roles == ["admin"] and alice.has_role(admin) and alice.has_role("admin")
+
+    policy = Policy("p", roles=[admin])
+    assert policy.has_role("admin") and policy.has_role(Role("admin"))
+    policy.remove_role(admin)
+    assert not policy.has_role(admin)
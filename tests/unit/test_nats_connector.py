@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from plantangenet.messaging import InProcessBroker, NATSConnector, NATSError
+from plantangenet.messaging.broker import subject_matches
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def _connector(broker, **kwargs):
+    return NATSConnector(url="nats://in-process:4222", open_connection=broker.open_connection,
+                         reconnect_wait=0.01, **kwargs)
+
+
+def test_subject_matching():
+    assert subject_matches("plan.session.*.state", "plan.session.abc.state")
+    assert subject_matches("plan.session.>", "plan.session.abc.events")
+    assert not subject_matches("plan.session.>", "plan.session")
+    assert not subject_matches("plan.*", "plan.session.abc")
+
+
+def test_batched_publish_and_session_start():
+    async def main():
+        broker = InProcessBroker()
+        async with _connector(broker) as server, _connector(broker) as client:
+            starts = await server.subscribe("plan.session.*.start")
+            events = await server.subscribe("plan.session.ttt.events")
+            for i in range(500):
+                await client.publish("plan.session.ttt.events", {"n": i})
+            await client.start_session("ttt", [{"Kind": "Phase", "Id": "setup"}], dry_run=True)
+
+            start = await starts.next_msg(timeout=1)
+            assert start.subject == "plan.session.ttt.start"
+            assert start.json() == {"manifest": [{"Kind": "Phase", "Id": "setup"}], "dryRun": True}
+            received = [(await events.next_msg(timeout=1)).json()["n"] for _ in range(500)]
+            assert received == list(range(500))
+        await broker.close()
+
+    _run(main())
+
+
+def test_get_state_and_diff_request_reply():
+    async def main():
+        broker = InProcessBroker()
+        async with _connector(broker) as server, _connector(broker) as client:
+            async def respond(msg):
+                kind = msg.subject.rsplit(".", 1)[1]
+                await server.publish(msg.reply, {"kind": kind, "request": msg.json()})
+
+            await server.subscribe("plan.session.ttt.get_state", respond)
+            await server.subscribe("plan.session.ttt.diff", respond)
+            await server.flush()
+
+            assert await client.get_state("ttt") == {"kind": "get_state", "request": {}}
+            assert (await client.diff("ttt", manifest=[]))["request"] == {"manifest": []}
+            with pytest.raises(asyncio.TimeoutError):
+                await client.request("plan.session.nobody.get_state", b"{}", timeout=0.05)
+        await broker.close()
+
+    _run(main())
+
+
+def test_reconnect_resubscribes_and_sends_buffered_messages():
+    async def main():
+        broker = InProcessBroker()
+        async with _connector(broker) as server, _connector(broker, max_reconnect_buffer=1024) as client:
+            sub = await server.subscribe("plan.session.ttt.log")
+            await server.flush()
+
+            await broker.disconnect_all()
+            while client.is_connected or server.is_connected:
+                await asyncio.sleep(0.001)
+            await client.publish("plan.session.ttt.log", b"while offline")
+            with pytest.raises(NATSError, match="buffer is full"):
+                await client.publish("plan.session.ttt.log", b"x" * 2048)
+
+            msg = await sub.next_msg(timeout=2)
+            assert msg.data == b"while offline"
+            assert client.reconnects == 1 and server.reconnects == 1
+        await broker.close()
+
+    _run(main())
+
+
+def test_slow_subscriber_drops_instead_of_stalling_the_connection():
+    async def main():
+        broker = InProcessBroker()
+        async with _connector(broker) as server, _connector(broker) as client:
+            sub = await server.subscribe("plan.session.ttt.state", max_pending=10)
+            other = await server.subscribe("plan.session.ttt.events")
+            await server.flush()
+            for i in range(200):
+                await client.publish("plan.session.ttt.state", {"n": i})
+            await client.publish("plan.session.ttt.events", b"after")
+            await client.flush()
+
+            # The lagging subscriber neither blocks other subscriptions nor flushes
+            assert (await other.next_msg(timeout=1)).data == b"after"
+            await server.flush(timeout=1)
+            assert sub.queue.qsize() == 10 and sub.dropped == 190
+            assert [(await sub.next_msg(timeout=1)).json()["n"] for _ in range(10)] == list(range(10))
+        await broker.close()
+
+    _run(main())
+
+
+def test_publish_requires_a_connection():
+    async def main():
+        connector = _connector(InProcessBroker())
+        with pytest.raises(NATSError, match="Not connected"):
+            await connector.publish("plan.session.ttt.events", b"early")
+        with pytest.raises(NATSError, match="Not connected"):
+            await connector.flush()
+
+    _run(main())
+
+
+def test_permission_errors_are_reported_without_reconnecting():
+    async def main():
+        broker = InProcessBroker(deny_subscribe=["plan.session.*.secrets"])
+        errors = []
+        async with _connector(broker, error_callback=errors.append) as client:
+            denied = await client.subscribe("plan.session.ttt.secrets")
+            allowed = await client.subscribe("plan.session.ttt.events")
+            await client.flush()
+
+            with pytest.raises(NATSError, match="Permissions Violation"):
+                await denied.next_msg(timeout=1)
+            assert denied.error is errors[0] and client.errors == errors
+            await client.publish("plan.session.ttt.events", b"still connected")
+            assert (await allowed.next_msg(timeout=1)).data == b"still connected"
+            assert client.reconnects == 0 and len(broker.clients) == 1
+        await broker.close()
+
+    _run(main())
+
+
+def test_fatal_errors_reconnect_and_close_the_old_connection():
+    async def main():
+        broker = InProcessBroker()
+        async with _connector(broker) as client:
+            sub = await client.subscribe("plan.session.ttt.events")
+            await client.flush()
+            old_writer = client._writer
+            broker.clients[0].writer.write(b"-ERR 'Stale Connection'\r\n")
+            while client.reconnects == 0 or not client.is_connected:
+                await asyncio.sleep(0.001)
+            await client.flush()
+            assert old_writer.is_closing()
+            # The broker sees the old socket closed, leaving only the new one
+            while len(broker.clients) != 1:
+                await asyncio.sleep(0.001)
+            await client.publish("plan.session.ttt.events", b"after")
+            assert (await sub.next_msg(timeout=1)).data == b"after"
+        await broker.close()
+
+    _run(main())
+
+
+def test_callback_errors_do_not_stop_delivery():
+    async def main():
+        broker = InProcessBroker()
+        received = []
+
+        def handle(msg):
+            received.append(msg.json())
+
+        async with _connector(broker) as server, _connector(broker) as client:
+            await server.subscribe("plan.session.ttt.state", handle)
+            await server.flush()
+            for payload in (b"not json", b'{"n": 1}'):
+                await client.publish("plan.session.ttt.state", payload)
+            await client.flush()
+            while not received:
+                await asyncio.sleep(0.001)
+            assert received == [{"n": 1}]
+            assert [type(e).__name__ for e in server.errors] == ["JSONDecodeError"]
+        await broker.close()
+
+    _run(main())
@@ -0,0 +1,70 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from janet.phase_executor import AsyncPhaseExecutor, backoff_delay, retry_policy
+from janet.phase_resource import PhaseResource
+
+
+def _phase(name, **spec):
+    return PhaseResource({"name": name, **spec})
+
+
+def test_retry_policy_and_backoff():
+    spec = {"retry": {"maxAttempts": "4", "backoff": "100ms", "maxBackoff": "1s", "jitter": "none"}}
+    assert retry_policy(spec) == (4, 0.1, 1, False)
+    assert [backoff_delay(n, 0.1, 0.3, jitter=False) for n in (1, 2, 3, 4)] == [0.1, 0.2, 0.3, 0.3]
+    assert 0 <= backoff_delay(5, 0.1, 0.3, rng=random.Random(1)) <= 0.3
+
+
+def test_retries_back_off_until_success():
+    delays = []
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+
+    async def flaky(phase, attempt):
+        return attempt == 3
+
+    executor = AsyncPhaseExecutor(attempt=flaky, sleep=fake_sleep)
+    phase = _phase("flaky", retry={"maxAttempts": "5", "backoff": "1s", "jitter": "none"},
+                   onSuccess={"spec": {"message": ["done"]}})
+    result = asyncio.run(executor.execute(phase))
+    assert result.success
+    assert delays == [1, 2]
+    assert result.logs[-1] == "done"
+
+
+def test_exhausted_retries_use_failure_handler():
+    async def never(phase, attempt):
+        return False
+
+    executor = AsyncPhaseExecutor(attempt=never, sleep=lambda s: asyncio.sleep(0))
+    phase = _phase("broken", retry={"maxAttempts": "2"},
+                   onFailure={"action": "continue", "spec": {"labels": {"mode": "defaults"}}})
+    result = asyncio.run(executor.execute(phase))
+    assert not result.success
+    assert result.labels == {"mode": "defaults"}
+
+
+def test_many_timeouts_share_one_loop():
+    phases = [_phase(f"p{i}", waitFor={"timeout": "100ms"}) for i in range(2000)]
+    started = time.perf_counter()
+    results = asyncio.run(AsyncPhaseExecutor().execute_all(phases))
+    assert all(r.success for r in results)
+    assert time.perf_counter() - started < 2
+
+
+def test_cancellation_interrupts_wait():
+    async def main():
+        task = asyncio.ensure_future(AsyncPhaseExecutor().execute(_phase("slow", waitFor={"timeout": "5m"})))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - started < 1
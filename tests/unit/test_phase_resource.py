@@ -0,0 +1,38 @@
+import json
+
+from janet.execution_result import ExecutionResult
+from janet.phase_resource import PhaseResource
+
+
+def _spec(name):
+    return {"name": name, "metadata": {"labels": {"".join(["ses", "sion"]): "".join(["tic", "tactoe"])}}}
+
+
+def test_resources_are_slotted_and_share_label_strings():
+    a, b = PhaseResource(_spec("a")), PhaseResource(_spec("b"))
+    assert not hasattr(a, "__dict__")
+    (key_a, value_a), = a.metadata["labels"].items()
+    (key_b, value_b), = b.metadata["labels"].items()
+    assert key_a is key_b and value_a is value_b
+
+
+def test_from_json_decodes_spec_on_first_use():
+    resource = PhaseResource.from_json("Phase", "a", json.dumps(_spec("a")), "hash")
+    assert resource._spec is None
+    assert resource.content_hash == "hash"
+    assert resource.name == "a"
+    assert resource._raw is None
+
+
+def test_repr_is_bounded():
+    resource = PhaseResource({"name": "big", "spec": {"items": list(range(10_000))}})
+    assert len(repr(resource)) < 200
+    assert len(repr(ExecutionResult(True, "ok", logs=["x" * 1000] * 100))) < 300
+
+
+def test_interning_does_not_modify_the_callers_spec():
+    spec = _spec("a")
+    labels = spec["metadata"]["labels"]
+    resource = PhaseResource(spec)
+    assert spec["metadata"]["labels"] is labels
+    assert resource.metadata["labels"] == labels
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from janet.execution_result import ExecutionResult
+from janet.phase_resource import PhaseResource
+from janet.phase_scheduler import PhaseScheduler
+from janet.plan_transformer import PlanTransformer
+
+
+class SleepyExecutor:
+    """Sleeps per phase and fails the phases named in ``failing``."""
+
+    def __init__(self, delay=0.05, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+        self.order = []
+
+    def execute(self, phase):
+        time.sleep(self.delay)
+        with self.lock:
+            self.order.append(phase.id)
+        success = phase.id not in self.failing
+        return ExecutionResult(success, f"ran {phase.id}")
+
+
+def _phase(name, waits=(), on_failure=None):
+    spec = {"name": name, "waitFor": {"phases": list(waits)}}
+    if on_failure:
+        spec["onFailure"] = {"action": on_failure}
+    return PhaseResource(spec)
+
+
+def test_independent_phases_overlap_and_dependents_wait():
+    phases = [_phase("a"), _phase("b"), _phase("c"), _phase("d", waits=["a", "b", "c"])]
+    executor = SleepyExecutor(delay=0.1)
+    started = time.perf_counter()
+    runs = PhaseScheduler(executor, max_workers=4).run(phases)
+    elapsed = time.perf_counter() - started
+
+    # Critical path is two phases deep, not four
+    assert elapsed < 0.35
+    assert executor.order[-1] == "d"
+    by_id = {run.phase.id: run for run in runs}
+    assert all(run.status == "succeeded" for run in runs)
+    assert by_id["d"].started >= max(by_id[x].finished for x in "abc")
+
+
+def test_failure_actions():
+    phases = [
+        _phase("soft", on_failure="continue"),
+        _phase("after-soft", waits=["soft"]),
+        _phase("plain"),
+        _phase("after-plain", waits=["plain"]),
+        _phase("beyond", waits=["after-plain"]),
+        _phase("free"),
+    ]
+    runs = PhaseScheduler(SleepyExecutor(0.01, failing={"soft", "plain"}), max_workers=2).run(phases)
+    assert {run.phase.id: run.status for run in runs} == {
+        "soft": "failed",
+        "after-soft": "succeeded",
+        "plain": "failed",
+        "after-plain": "skipped",
+        "beyond": "skipped",
+        "free": "succeeded",
+    }
+
+
+def test_raise_cancels_pending_phases():
+    phases = [_phase("boom", on_failure="raise"), _phase("next", waits=["boom"]), _phase("later", waits=["next"])]
+    runs = PhaseScheduler(SleepyExecutor(0.01, failing={"boom"}), max_workers=1).run(phases)
+    assert [run.status for run in runs] == ["failed", "cancelled", "cancelled"]
+    assert runs[1].started is None
+
+
+def test_cycles_are_rejected_before_running():
+    executor = SleepyExecutor(0)
+    with pytest.raises(ValueError, match="Circular dependency"):
+        PhaseScheduler(executor).run([_phase("a", waits=["b"]), _phase("b", waits=["a"])])
+    assert executor.order == []
+
+
+def test_apply_reports_timestamps(capsys):
+    desired = [_phase("setup"), _phase("play", waits=["setup"])]
+    transformer = PlanTransformer(desired, stored_state=[], environment_state=[])
+    transformer.apply(dry_run=True)
+    out = capsys.readouterr().out
+    assert out.index("name': 'setup'") < out.index("name': 'play'")
+    assert "succeeded" in out and "(dry-run: no changes made)" in out
+    assert [run.status for run in transformer.runs] == ["succeeded", "succeeded"]
@@ -0,0 +1,33 @@
+from janet.plan_loader import iter_plan_documents, iter_plan_files
+from janet.plan_renderer import PlanRenderer
+
+
+def test_iter_plan_documents_streams_every_file(tmp_path):
+    (tmp_path / "plan.yaml").write_text("plan:\n  setup:\n    selector:\n      matchLabels:\n        phase: setup\n")
+    (tmp_path / "a.yaml").write_text("kind: A\nmetadata:\n  labels:\n    phase: setup\n---\n---\nkind: B\n")
+    (tmp_path / "b.yml").write_text("kind: C\nmetadata:\n  labels:\n    phase: other\n")
+    (tmp_path / "notes.txt").write_text("kind: ignored\n")
+
+    files = [p.name for p in iter_plan_files(tmp_path, exclude=[tmp_path / "plan.yaml"])]
+    assert files == ["a.yaml", "b.yml"]
+
+    documents = iter_plan_documents(tmp_path, exclude=[tmp_path / "plan.yaml"])
+    assert [d["kind"] for d in documents] == ["A", "B", "C"]
+
+
+def test_broken_file_is_skipped(tmp_path, capsys):
+    (tmp_path / "a.yaml").write_text("kind: A\n---\nkind: *undefined\n")
+    (tmp_path / "b.yaml").write_text("kind: B\n")
+
+    assert [d["kind"] for d in iter_plan_documents(tmp_path)] == ["A", "B"]
+    assert "Skipping rest of" in capsys.readouterr().err
+
+
+def test_renderer_consumes_document_generator(tmp_path):
+    (tmp_path / "plan.yaml").write_text("plan:\n  setup:\n    selector:\n      matchLabels:\n        phase: setup\n")
+    (tmp_path / "squads.yaml").write_text(
+        "kind: Squad\nmetadata:\n  name: s1\n  labels:\n    phase: setup\n"
+        "---\nkind: Squad\nmetadata:\n  name: s2\n  labels:\n    phase: lazy\n")
+
+    rendered = PlanRenderer(iter_plan_documents(tmp_path)).render()
+    assert [r.get("Id") or r["metadata"]["name"] for r in rendered] == ["setup", "s1"]
@@ -0,0 +1,123 @@
+import pytest
+from janet.label_index import LabelIndex
+from janet.plan_renderer import PlanRenderer
+
+
+def _resource(name, **labels):
+    return {"kind": "Squad", "metadata": {"name": name, "labels": labels}}
+
+
+RESOURCES = [
+    _resource("arena", session="ttt", squad="arena"),
+    _resource("referee", session="ttt", squad="referee"),
+    _resource("player", session="ttt", squad="player", tier="gold"),
+    _resource("other", session="other", squad="player"),
+]
+
+
+def test_match_labels_intersects_postings():
+    index = LabelIndex(RESOURCES)
+    matched = index.select({"matchLabels": {"session": "ttt", "squad": "player"}})
+    assert [r["metadata"]["name"] for r in matched] == ["player"]
+
+
+def test_empty_selector_matches_nothing():
+    index = LabelIndex(RESOURCES)
+    assert index.select({}) == []
+    assert index.select({"matchLabels": {"session": "missing"}}) == []
+
+
+def test_match_expressions():
+    index = LabelIndex(RESOURCES)
+
+    def names(selector):
+        return [r["metadata"]["name"] for r in index.select(selector)]
+
+    assert names({"matchExpressions": [
+        {"key": "squad", "operator": "In", "values": ["arena", "referee"]}]}) == ["arena", "referee"]
+    assert names({"matchExpressions": [
+        {"key": "squad", "operator": "NotIn", "values": ["player"]}]}) == ["arena", "referee"]
+    assert names({"matchExpressions": [
+        {"key": "tier", "operator": "Exists"}]}) == ["player"]
+    assert names({
+        "matchLabels": {"squad": "player"},
+        "matchExpressions": [{"key": "tier", "operator": "DoesNotExist"}],
+    }) == ["other"]
+
+    with pytest.raises(ValueError):
+        index.select({"matchExpressions": [{"key": "squad", "operator": "Gt"}]})
+
+
+def test_render_legacy_plan_attaches_matched_resources():
+    manifests = [
+        {"plan": {
+            "setup": {"selector": {"matchLabels": {"session": "ttt"}}},
+        }},
+        *RESOURCES,
+    ]
+    rendered = PlanRenderer(manifests).render()
+    assert rendered[0]["Id"] == "setup"
+    assert [r["metadata"]["name"] for r in rendered[1:]] == ["arena", "referee", "player"]
+
+
+def test_phase_order_reads_both_dependency_keys():
+    renderer = PlanRenderer({"plan": {
+        "setup": {"waitFor": {"phases": ["initialization"]}},
+        "initialization": {"waitFor": {"dependsOn": "preflight"}},
+        "preflight": {},
+        "lazy": {},
+    }})
+    assert renderer.phase_waves() == [["preflight", "lazy"], ["initialization"], ["setup"]]
+    assert [p["Id"] for p in renderer.render()] == ["preflight", "lazy", "initialization", "setup"]
+    assert [p["Id"] for p in renderer.render(target_phase="initialization")] == ["preflight", "initialization"]
+
+
+def test_phases_array_is_ordered():
+    renderer = PlanRenderer({"phases": [
+        {"metadata": {"name": "setup"}, "spec": {"waitFor": {"phases": ["preflight"]}}},
+        {"metadata": {"name": "preflight"}, "spec": {}},
+    ]})
+    assert [p["Id"] for p in renderer.render()] == ["preflight", "setup"]
+    assert renderer.phase_waves() == [["preflight"], ["setup"]]
+
+
+def test_cycles_and_unknown_phases_are_reported():
+    cyclic = PlanRenderer({"plan": {
+        "a": {"waitFor": {"phases": ["c"]}},
+        "b": {"waitFor": {"phases": ["a"]}},
+        "c": {"waitFor": {"phases": ["b"]}},
+        "d": {},
+    }})
+    with pytest.raises(ValueError, match="Circular dependency detected"):
+        cyclic.render()
+
+    unknown = PlanRenderer({"plan": {"a": {"waitFor": {"phases": ["missing"]}}}})
+    with pytest.raises(ValueError, match="Unknown phase referenced: missing"):
+        unknown.render()
+
+
+def test_deep_chain_orders_without_recursion():
+    depth = 20_000
+    phases = {"phase-0": {}}
+    for i in range(1, depth):
+        phases[f"phase-{i}"] = {"waitFor": {"dependsOn": f"phase-{i - 1}"}}
+    # Declare in reverse so ordering has real work to do
+    renderer = PlanRenderer({"plan": dict(reversed(list(phases.items())))})
+    waves = renderer.phase_waves()
+    assert len(waves) == depth
+    assert waves[0] == ["phase-0"] and waves[-1] == [f"phase-{depth - 1}"]
+
+
+def test_iter_render_is_lazy_and_matches_render():
+    manifests = [
+        {"plan": {
+            "setup": {"selector": {"matchLabels": {"squad": "arena"}}},
+            "play": {"waitFor": {"phases": ["setup"]}, "selector": {"matchLabels": {"squad": "player"}}},
+        }},
+        *RESOURCES,
+    ]
+    renderer = PlanRenderer(manifests)
+    documents = renderer.iter_render()
+    assert next(documents)["Id"] == "setup"
+    assert next(documents)["metadata"]["name"] == "arena"
+    assert [next(documents)] + list(documents) == renderer.render()[2:]
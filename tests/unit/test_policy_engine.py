@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import yaml
+
+from plantangenet.policy import Identity, Policy, PolicyEngine, Statement
+
+STATEMENTS = Path(__file__).resolve().parents[2] / "examples" / "tictactoe" / "statements.yaml"
+
+
+def _example_statements():
+    with open(STATEMENTS) as f:
+        return [Statement.from_resource(doc) for doc in yaml.safe_load_all(f) if doc]
+
+
+def _game(status="inactive", game="game-1"):
+    return {"target": {"game": game, "status": status}, "self": {"resource": "game-1"}}
+
+
+def test_example_statements_are_evaluated():
+    engine = PolicyEngine(_example_statements(), allow_scripts=True)
+    owner = Identity("owner", name="owner", roles=["owner"])
+    player = Identity("p1", name="p1", roles=["player"])
+
+    assert engine.is_allowed(owner, "tictactoe.access")
+    assert not engine.is_allowed(player, "tictactoe.access")
+    assert engine.is_allowed(owner, "tictactoe.play", _game())
+    assert not engine.is_allowed(owner, "tictactoe.play", _game(game="game-2"))
+    assert engine.is_allowed(owner, "tictactoe.delete", _game("inactive"))
+    assert not engine.is_allowed(owner, "tictactoe.delete", _game("active"))
+    # The python scriptMatch statement allows it; the javascript one cannot run
+    decision = engine.evaluate(owner, "tictactoe.update", _game("inactive"))
+    assert decision and decision.statement.id == "allow-game-update"
+    assert not engine.is_allowed(owner, "tictactoe.update", _game("active"))
+    assert not engine.is_allowed(owner, "tictactoe.unknown")
+
+
+def test_deny_overrides_allow():
+    engine = PolicyEngine([
+        Statement("allow-all", action="game.*", effect="allow"),
+        Statement("deny-banned", action="game.play", effect="deny",
+                  condition=[{"roleSelector": {"roleBinding": "banned"}}]),
+    ])
+    assert engine.is_allowed(Identity("a", roles=[]), "game.play")
+    decision = engine.evaluate(Identity("b", roles=["banned"]), "game.play")
+    assert not decision and decision.statement.id == "deny-banned"
+    assert engine.is_allowed(Identity("b", roles=["banned"]), "game.watch")
+
+
+def test_decisions_are_cached_and_invalidated_by_policy_changes():
+    blocklist = [Statement(f"deny-{g}", action="play", effect="deny",
+                           condition=[{"valueMatch": {"key": "target.game", "value": f"game-{g}"}}])
+                 for g in range(2, 6)]
+    allow = Statement("allow", action="play", effect="allow", condition=[{"roleSelector": {"roleBinding": "player"}}])
+    policy = Policy("p", statements=blocklist + [allow])
+    engine = PolicyEngine(policies=[policy])
+    player = Identity("p1", roles=["player"])
+
+    assert engine.is_allowed(player, "play", _game(game="game-1"))
+    assert engine.is_allowed(player, "play", _game(game="game-1"))
+    assert engine.hits == 1
+    assert not engine.is_allowed(player, "play", _game(game="game-3"))
+
+    policy.add_statement(Statement("deny-1", action="play", effect="deny",
+                                   condition=[{"valueMatch": {"key": "target.game", "value": "game-1"}}]))
+    assert not engine.is_allowed(player, "play", _game(game="game-1"))
+    # Roles are part of the key, so a role change is never served a stale decision
+    assert engine.is_allowed(player, "play", _game(game="game-9"))
+    player.roles = ["spectator"]
+    assert not engine.is_allowed(player, "play", _game(game="game-9"))
+
+
+def test_statement_evaluate_checks_conditions():
+    statement = Statement("s", action="tictactoe.create", effect="allow",
+                          condition=[{"roleSelector": {"roleBinding": "owner"}}])
+    assert statement.evaluate({"identity": Identity("o", roles=["owner"])})
+    assert not statement.evaluate({"identity": Identity("p", roles=["player"])})
+    assert not statement.evaluate({})
+
+
+def test_scripts_only_run_when_allowed():
+    owner = Identity("owner", name="owner", roles=["owner"])
+    update = [s for s in _example_statements() if s.id == "allow-game-update"]
+    assert not PolicyEngine(update).is_allowed(owner, "tictactoe.update", _game("inactive"))
+    assert PolicyEngine(update, allow_scripts=True).is_allowed(owner, "tictactoe.update", _game("inactive"))
+
+    context = {"identity": owner, **_game("inactive")}
+    assert not update[0].evaluate(context)
+    assert update[0].evaluate(context, allow_scripts=True)
+
+
+def test_cache_min_predicates_skips_caching_simple_actions():
+    allow = Statement("allow", action="play", effect="allow", condition=[{"roleSelector": {"roleBinding": "player"}}])
+    player = Identity("p1", roles=["player"])
+    for min_predicates, hits in ((0, 1), (2, 0)):
+        engine = PolicyEngine([allow], cache_min_predicates=min_predicates)
+        assert engine.is_allowed(player, "play") and engine.is_allowed(player, "play")
+        assert engine.hits == hits
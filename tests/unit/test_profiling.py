@@ -0,0 +1,61 @@
+import json
+import sys
+
+import pytest
+
+from janet import profiling
+from janet.cli import JanetCLI
+from janet.profiling import Profiler, add_hook, remove_hook, span
+
+
+def test_spans_reach_hooks_only_while_registered():
+    assert span("idle") is span("other")  # shared no-op
+
+    seen = []
+    add_hook(seen.append)
+    try:
+        with span("outer", path="x"):
+            with span("inner"):
+                pass
+    finally:
+        remove_hook(seen.append)
+    with span("after"):
+        pass
+    assert [(s.name, s.depth) for s in seen] == [("inner", 1), ("outer", 0)]
+    assert seen[1].args == {"path": "x"} and seen[1].duration >= seen[0].duration
+    assert profiling._hooks == []
+
+
+def test_profiler_traces_memory_and_exports_chrome_events():
+    with Profiler() as profiler:
+        with span("janet render", "command"):
+            with span("render"):
+                blob = bytearray(4 * 1024 * 1024)
+            del blob
+            with span("serialize"):
+                pass
+
+    render = next(s for s in profiler.spans if s.name == "render")
+    root = next(s for s in profiler.spans if s.name == "janet render")
+    assert render.peak_bytes >= 4 * 1024 * 1024 and root.peak_bytes >= render.peak_bytes
+
+    events = profiler.to_chrome_trace()["traceEvents"]
+    assert [e["name"] for e in events] == ["janet render", "render", "serialize"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 and "peak_bytes" in e["args"] for e in events)
+    summary = profiler.summary()
+    assert summary.startswith("janet render ") and "render " in summary and "peak 4." in summary
+
+
+def test_profile_flag_writes_trace_even_when_the_command_fails(monkeypatch, tmp_path, capsys):
+    plan = tmp_path / "plan.yaml"
+    plan.write_text("foo: bar\n")
+    trace = tmp_path / "trace.json"
+    monkeypatch.setattr(sys, "argv", ["janet", "render", "-f", str(plan), "--no-cache",
+                                      "--profile", "--profile-output", str(trace)])
+    with pytest.raises(ValueError):  # not a renderable plan
+        JanetCLI().run()
+
+    events = {e["name"]: e for e in json.loads(trace.read_text())["traceEvents"]}
+    assert list(events)[:2] == ["janet render", "read"]
+    assert events["render"]["args"]["error"] == "ValueError"
+    assert "Profile: janet render" in capsys.readouterr().err
@@ -0,0 +1,146 @@
+import time
+
+import pytest
+
+from janet.phase_resource import PhaseResource
+from janet.plan_transformer import PlanTransformer
+from janet.render_cache import RedisRenderCache
+from janet.state_store import RedisStateStore
+from plantangenet.storage import FakeRedisServer, RedisConnector, RedisError
+
+
+@pytest.fixture
+def server():
+    server = FakeRedisServer()
+    yield server
+    server.close()
+
+
+def _connector(server, **kwargs):
+    return RedisConnector(connection_factory=server.connect, **kwargs).connect()
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_bulk_and_pipelined_commands(server):
+    with _connector(server) as redis:
+        assert redis.mset({"a": "1", "b": b"2"})
+        assert redis.mget(["a", "b", "missing"]) == [b"1", b"2", None]
+
+        with redis.pipeline() as pipe:
+            for i in range(2000):
+                pipe.set(f"k{i}", i)
+            assert len(pipe.execute()) == 2000
+        assert redis.get("k1999") == b"1999"
+
+        with redis.pipeline(transaction=True) as pipe:
+            pipe.sadd("s", "x", "y").srem("s", "x").get("a")
+            assert pipe.execute() == [2, 1, b"1"]
+        assert redis.smembers("s") == {b"y"}
+
+        with redis.pipeline(transaction=True) as pipe:
+            pipe.set("a", "3").execute_command("NOPE")
+            with pytest.raises(RedisError):
+                pipe.execute()
+
+
+def test_pool_reuses_and_bounds_connections(server):
+    with _connector(server, max_connections=2) as redis:
+        for _ in range(10):
+            redis.ping()
+        assert len(redis.pool._all) == 1
+        with redis.pool.connection(), redis.pool.connection():
+            assert len(redis.pool._all) == 2
+
+
+def test_error_replies_return_connections_to_the_pool(server):
+    with _connector(server, max_connections=2) as redis:
+        redis.sadd("members", "a")
+        for _ in range(5):
+            with pytest.raises(RedisError, match="WRONGTYPE"):
+                redis.get("members")
+        with pytest.raises(RedisError, match="WRONGTYPE"):
+            with redis.pipeline() as pipe:
+                pipe.get("members")
+                pipe.execute()
+        assert redis.ping()
+        assert len(redis.pool._all) <= 2
+
+
+def test_url_selects_database_and_authenticates():
+    server = FakeRedisServer(password="s3cret")
+    try:
+        redis = RedisConnector(url="redis://:s3cret@cache:6380/3", connection_factory=server.connect)
+        assert (redis.host, redis.port, redis.db) == ("cache", 6380, 3)
+        with redis.connect():
+            redis.set("k", "v", ex=60)
+        assert server.dbs[3][b"k"] == b"v"
+    finally:
+        server.close()
+
+
+def test_client_cache_is_invalidated_by_other_clients(server):
+    with _connector(server, client_cache=True) as reader, _connector(server) as writer:
+        writer.set("hot", "1")
+        assert reader.get("hot") == b"1"
+        commands = server.commands
+        assert reader.get("hot") == b"1"
+        assert reader.mget(["hot"]) == [b"1"]
+        assert server.commands == commands
+
+        writer.set("hot", "2")
+        _wait_for(lambda: b"hot" not in reader._cache)
+        assert reader.get("hot") == b"2"
+
+        # The client's own writes never serve a stale value
+        reader.set("hot", "3")
+        assert reader.get("hot") == b"3"
+
+
+def test_redis_state_store_shares_applied_plan(server):
+    def phase(name, timeout="1s"):
+        return PhaseResource({"name": name, "waitFor": {"timeout": timeout}})
+
+    with RedisStateStore(_connector(server), "demo") as store:
+        store.commit([phase("a"), phase("b"), phase("c")])
+        plan = PlanTransformer([phase("a"), phase("b", "2s"), phase("d")], store, []).diff_against_state()
+        store.apply_plan(plan)
+
+    with RedisStateStore(_connector(server), "demo") as store:
+        assert len(store) == 3
+        assert sorted(r.id for r in store) == ["a", "b", "d"]
+        assert store.get("Phase", "b").spec["waitFor"]["timeout"] == "2s"
+        assert store.get("Phase", "c") is None
+        assert store.hashes()[("Phase", "a")] == phase("a").content_hash
+    with RedisStateStore(_connector(server), "other") as store:
+        assert len(store) == 0
+
+
+def test_redis_render_cache(server):
+    cache = RedisRenderCache(_connector(server, client_cache=True), ttl=60)
+    manifest = [{"kind": "Phase", "name": "setup"}]
+    assert cache.get("abc") is None
+    cache.put("abc", manifest)
+    assert cache.get("abc") == manifest
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] > 0
+    assert cache.clear() == 1
+    assert cache.get("abc") is None
+
+
+def test_redis_render_cache_treats_error_replies_as_unavailable(server):
+    cache = RedisRenderCache(_connector(server), ttl=60)
+
+    def readonly(*args, **kwargs):
+        raise RedisError("READONLY You can't write against a read only replica.")
+
+    cache.connector.get = cache.connector.set = readonly
+    assert cache.get("abc") is None
+    with pytest.raises(OSError, match="READONLY"):
+        cache.put("abc", [])
+    cache.close()
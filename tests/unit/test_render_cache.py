@@ -0,0 +1,42 @@
+import os
+
+from janet.render_cache import RenderCache
+
+
+def test_key_depends_on_bytes_and_context(tmp_path):
+    plan = tmp_path / "plan.yaml"
+    plan.write_text("plan: {}\n")
+    context = {"plan_dir": str(tmp_path), "plan_file": "plan.yaml"}
+
+    key = RenderCache.compute_key([plan], context)
+    assert key == RenderCache.compute_key([plan], context)
+    assert key != RenderCache.compute_key([plan], {**context, "plan_file": "other.yaml"})
+    assert key != RenderCache.compute_key([plan], context, {"resources": True})
+
+    plan.write_text("plan: {setup: {}}\n")
+    assert key != RenderCache.compute_key([plan], context)
+
+
+def test_get_put_roundtrip(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    assert cache.get("abc") is None
+    cache.put("abc", [{"Kind": "Phase", "Id": "setup"}])
+    assert cache.get("abc") == [{"Kind": "Phase", "Id": "setup"}]
+    assert cache.stats()["entries"] == 1
+    assert cache.clear() == 1
+    assert cache.get("abc") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=10**6)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, ["x" * 100])
+        os.utime(tmp_path / f"{key}.json", (i, i))
+
+    # Reading "a" makes it the most recently used entry
+    cache.get("a")
+    cache.max_bytes = 2 * (tmp_path / "a.json").stat().st_size
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import janet
+from janet.schema_registry import SchemaNotFoundError, SchemaRegistry, default_schema_dir
+
+
+SQUAD = {
+    "apiVersion": "plantangenet.session/v1",
+    "kind": "Squad",
+    "metadata": {"name": "players", "phase": "lazy"},
+    "spec": {"session_id": "SES-1", "class": "example.Player/v1", "max_members": 1800},
+}
+
+
+def test_dispatches_by_api_version_and_kind(tmp_path):
+    registry = SchemaRegistry(bundle_path=tmp_path / "schemas.json")
+    assert registry.iter_errors(SQUAD) == []
+    assert registry.iter_errors({"apiVersion": "x/v1", "kind": "Unknown"}) is None
+    assert registry.iter_errors({"phases": []}) is None
+    assert registry.validator_for({"plan": {}}) is registry.plan_validator
+
+
+def test_reports_every_error_in_one_pass(tmp_path):
+    registry = SchemaRegistry(bundle_path=tmp_path / "schemas.json")
+    broken = {**SQUAD, "metadata": {"name": 1}, "spec": {}}
+    errors = registry.iter_errors(broken)
+    assert "metadata: 'phase' is a required property" in errors
+    assert "metadata/name: 1 is not of type 'string'" in errors
+    assert "spec: 'session_id' is a required property" in errors
+
+
+def test_bundle_is_reused_until_schemas_change(tmp_path):
+    schema_dir = tmp_path / "schemas"
+    (schema_dir / "demo" / "v1").mkdir(parents=True)
+    schema_file = schema_dir / "demo" / "v1" / "Thing.json"
+    schema_file.write_text(json.dumps({"type": "object", "required": ["spec"]}))
+    bundle = tmp_path / "bundle.json"
+
+    registry = SchemaRegistry(schema_dir, bundle)
+    assert registry.iter_errors({"apiVersion": "demo/v1", "kind": "Thing"}) == [
+        "<root>: 'spec' is a required property"]
+    assert bundle.exists()
+
+    # A stale bundle is ignored once the schema file changes
+    schema_file.write_text(json.dumps({"type": "object"}) + " ")
+    registry = SchemaRegistry(schema_dir, bundle)
+    assert registry.iter_errors({"apiVersion": "demo/v1", "kind": "Thing"}) == []
+
+
+def test_bundle_holds_only_schemas_and_a_missing_plan_schema_is_an_error(tmp_path):
+    schema_dir = tmp_path / "schemas"
+    (schema_dir / "demo" / "v1").mkdir(parents=True)
+    (schema_dir / "demo" / "v1" / "Thing.json").write_text(json.dumps({"type": "object"}))
+    bundle = tmp_path / "bundle.json"
+
+    registry = SchemaRegistry(schema_dir, bundle)
+    assert set(json.loads(bundle.read_text())) == {"version", "schema_dir", "files", "schemas"}
+    with pytest.raises(SchemaNotFoundError, match="plan.json"):
+        registry.plan_schema
+
+
+def test_default_schemas_ship_inside_the_package():
+    assert default_schema_dir() == Path(janet.__file__).parent / "schemas"
+    assert (default_schema_dir() / SchemaRegistry.PLAN_SCHEMA).is_file()
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+import yaml
+
+from janet import serializers
+from janet.serializers import dumps
+
+MANIFEST = [
+    {"Id": "setup", "Kind": "Phase", "Spec": {"retry": {"maxAttempts": "3"}, "labels": [], "extra": {}}},
+    {"kind": "Squad", "metadata": {"name": "arena", "labels": {"phase": "setup"}}, "spec": {"size": 2.5}},
+]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_matches_stdlib_with_or_without_orjson(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serializers, "orjson", None)
+    elif serializers.orjson is None:
+        pytest.skip("orjson not installed")
+    assert dumps(MANIFEST) == json.dumps(MANIFEST, indent=2).encode()
+    assert dumps(MANIFEST, compact=True) == json.dumps(MANIFEST, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_decodes_the_same_with_or_without_orjson(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serializers, "orjson", None)
+    elif serializers.orjson is None:
+        pytest.skip("orjson not installed")
+    data = {"name": "caf\u00e9", "big": 1e20, "small": 1e-7}
+    for compact in (False, True):
+        encoded = dumps(data, compact=compact)
+        assert json.loads(encoded) == data
+        assert "caf\u00e9".encode() in encoded
+
+
+def test_canonical_is_byte_stable():
+    reordered = [{k: v for k, v in reversed(list(doc.items()))} for doc in MANIFEST]
+    canonical = dumps(MANIFEST, "canonical")
+    assert canonical == dumps(reordered, "canonical")
+    assert b" " not in canonical and b"\n" not in canonical
+    assert json.loads(canonical) == MANIFEST
+
+
+def test_yaml_round_trips_and_compacts():
+    assert yaml.safe_load(dumps(MANIFEST, "yaml")) == MANIFEST
+    compact = dumps(MANIFEST, "yaml", compact=True)
+    assert yaml.safe_load(compact) == MANIFEST
+    assert compact.count(b"\n") == 1
+
+    with pytest.raises(ValueError, match="Unknown output format"):
+        dumps(MANIFEST, "xml")
+
+
+def test_ndjson_writes_one_document_per_line():
+    lines = dumps(MANIFEST, "ndjson").splitlines()
+    assert [json.loads(line) for line in lines] == MANIFEST
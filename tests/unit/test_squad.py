@@ -0,0 +1,74 @@
+import pytest
+
+from plantangenet.policy import Identity
+from plantangenet.session import Session, Squad, SquadFullError, assign_members
+
+
+def _squads(kind, count, capacity, session="ttt"):
+    return [Squad(f"{kind}-{i}", max_members=capacity, metadata={"labels": {"session": session, "squad": kind}})
+            for i in range(count)]
+
+
+def test_membership_and_capacity():
+    squad = Squad("s", name="arena", max_members=2)
+    alice = Identity("alice")
+    assert squad.add_member(alice)
+    assert not squad.add_member("alice")
+    assert squad.has_member("alice") and alice in squad and len(squad) == 1
+    squad.add_member("bob")
+    assert squad.is_full() and squad.available == 0
+    with pytest.raises(SquadFullError, match="arena is full"):
+        squad.add_member("carol")
+    assert squad.get_members() == [alice, "bob"]
+    assert squad.remove_member(alice) and not squad.remove_member(alice)
+
+
+def test_add_members_is_all_or_nothing():
+    squad = Squad("s", max_members=3)
+    squad.add_member("a")
+    with pytest.raises(SquadFullError):
+        squad.add_members(["b", "c", "d"])
+    assert squad.get_members() == ["a"]
+    assert squad.add_members(["a", "b", "b", "c"]) == 2
+    assert squad.remove_members(["a", "c", "x"]) == 2
+    assert squad.get_members() == ["b"]
+
+
+def test_balanced_assignment_through_session_selector():
+    session = Session("ttt", "ttt", None, None, {},
+                      {"players": {"selector": {"matchLabels": {"session": "ttt", "squad": "player"}}}})
+    players = _squads("player", 3, 4)
+    players[0].add_members(["p0", "p1", "p2"])
+    squads = players + _squads("arena", 3, 4) + _squads("player", 2, 4, session="other")
+    added = session.assign("players", [f"p{i}" for i in range(8)], squads)
+    assert added == {"player-1": 3, "player-2": 2}
+    assert [len(s) for s in players] == [3, 3, 2]
+    assert sum(len(s) for s in squads) == 8
+    assert session.assign("players", ["p0", "p7"], squads) == {}
+
+
+def test_assignment_levels_sizes_and_respects_limits():
+    squads = [Squad("a", max_members=2), Squad("b"), Squad("c", max_members=10)]
+    assign_members([f"m{i}" for i in range(9)], squads)
+    assert [len(s) for s in squads] == [2, 4, 3]
+
+
+def test_fill_assignment_and_capacity_check():
+    squads = _squads("player", 3, 2)
+    assert assign_members(["a", "b", "c"], squads, balance=False) == {"player-0": 2, "player-1": 1}
+    assert assign_members(["a", "d"], squads, balance=False) == {"player-1": 1}
+    with pytest.raises(SquadFullError, match="room for 2"):
+        assign_members(["x", "y", "z"], squads)
+    assert sum(len(s) for s in squads) == 4
+
+
+def test_plantangenet_does_not_import_janet():
+    import subprocess
+    import sys
+
+    probe = (
+        "import sys; import plantangenet.policy, plantangenet.session; "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] == 'janet'))"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
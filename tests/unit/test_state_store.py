@@ -0,0 +1,110 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from janet import phase_resource
+from janet.phase_resource import PhaseResource
+from janet.plan_transformer import PlanTransformer
+from janet.state_store import SQLiteStateStore, open_state_store
+
+
+EXAMPLE_STATE = Path(__file__).resolve().parents[2] / "examples" / "tictactoe" / ".plan_state.json"
+
+
+def _phase(name, timeout="1s"):
+    return PhaseResource({"name": name, "waitFor": {"timeout": timeout}})
+
+
+def test_sqlite_store_applies_only_changes(tmp_path):
+    with SQLiteStateStore(tmp_path / "state.db") as store:
+        store.commit([_phase("a"), _phase("b"), _phase("c")])
+        desired = [_phase("a"), _phase("b", timeout="2s"), _phase("d")]
+        plan = PlanTransformer(desired, store, []).diff_against_state()
+        assert [r.id for r in plan["add"]] == ["d"]
+        assert [d.id for _, d in plan["update"]] == ["b"]
+        assert [r.id for r in plan["delete"]] == ["c"]
+        store.apply_plan(plan)
+
+    with SQLiteStateStore(tmp_path / "state.db") as store:
+        assert len(store) == 3
+        assert store.get("Phase", "b").spec["waitFor"]["timeout"] == "2s"
+        assert store.get("Phase", "c") is None
+        assert store.hashes()[("Phase", "a")] == _phase("a").content_hash
+
+
+def test_failed_commit_leaves_state_untouched(tmp_path):
+    with SQLiteStateStore(tmp_path / "state.db") as store:
+        store.commit([_phase("a")])
+
+        class Broken(PhaseResource):
+            @property
+            def content_hash(self):
+                raise RuntimeError("boom")
+
+        try:
+            store.commit([_phase("b"), Broken({"name": "c"})], deletes=[("Phase", "a")])
+        except RuntimeError:
+            pass
+        assert [r.id for r in store] == ["a"]
+
+
+def test_json_state_is_imported_and_exported(tmp_path):
+    (tmp_path / ".plan_state.json").write_text(json.dumps({"resources": [{"name": "legacy"}]}))
+    with open_state_store(tmp_path) as store:
+        assert [r.id for r in store] == ["legacy"]
+        store.commit([_phase("new")])
+        store.export_json(tmp_path)
+
+    exported = json.loads((tmp_path / ".plan_state.json").read_text())
+    assert [r["resource"]["name"] for r in exported["resources"]] == ["legacy", "new"]
+    assert exported["resources"][1]["contentHash"] == _phase("new").content_hash
+    assert json.loads((tmp_path / ".plan_state.json.bak").read_text()) == {"resources": [{"name": "legacy"}]}
+
+    with open_state_store(tmp_path, backend="json") as store:
+        store.commit(deletes=[("Phase", "legacy")])
+        assert [r.id for r in store] == ["new"]
+
+
+def test_json_round_trip_keeps_hashes(tmp_path, monkeypatch):
+    with SQLiteStateStore(tmp_path / "a.db") as store:
+        store.commit([_phase("a"), _phase("b", timeout="2s")])
+        hashes = store.hashes()
+        store.export_json(tmp_path)
+
+    def no_rehash(spec):
+        raise AssertionError("re-hashed on import")
+    monkeypatch.setattr(phase_resource, "content_hash", no_rehash)
+    with SQLiteStateStore(tmp_path / "b.db") as store:
+        store.import_json(tmp_path)
+        assert store.hashes() == hashes
+
+
+def test_resources_without_an_id_are_rejected(tmp_path):
+    nameless = PhaseResource({"description": "no name"})
+    assert nameless.id is None
+    for store in (SQLiteStateStore(tmp_path / "state.db"), open_state_store(tmp_path, backend="json")):
+        with store:
+            with pytest.raises(ValueError, match="without an id"):
+                store.commit([_phase("a"), nameless])
+            assert store.get("Phase", None) is None
+            assert store.get("Phase", "None") is None
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_example_state_file_is_imported(tmp_path, backend):
+    shutil.copyfile(EXAMPLE_STATE, tmp_path / ".plan_state.json")
+    with open_state_store(tmp_path, backend=backend) as store:
+        assert sorted((r.kind, r.id) for r in store) == [("Session", "SES-123"), ("Squad", "SQ-456")]
+
+
+def test_failed_import_leaves_no_database_behind(tmp_path):
+    (tmp_path / ".plan_state.json").write_text(json.dumps([{"name": "a"}, "not a resource"]))
+    with pytest.raises(ValueError, match="list of resources"):
+        open_state_store(tmp_path)
+    assert not list(tmp_path.glob(".plan_state.db*"))
+
+    (tmp_path / ".plan_state.json").write_text(json.dumps([{"name": "a"}]))
+    with open_state_store(tmp_path) as store:
+        assert [r.id for r in store] == ["a"]
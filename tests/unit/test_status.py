@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from janet.status import PhaseStatusTable, StatusPoller, follow, follow_nats, parse_status_payload
+from plantangenet.messaging import InProcessBroker, NATSConnector
+
+
+def test_table_updates_incrementally():
+    table = PhaseStatusTable()
+    assert table.apply({"phaseId": "setup", "status": "running"})
+    assert not table.apply({"phaseId": "setup", "status": "running"})
+    assert table.apply_event({"phaseId": "setup", "event": "complete"})
+    assert table.apply({"phaseId": "play", "status": "failed", "updated": "2025-07-19T20:00:00Z"})
+    assert +table.counts == {"complete": 1, "failed": 1}
+    assert table.render(rows=1).splitlines()[0] == "2 phase(s) (complete: 1, failed: 1)"
+    assert table.render(rows=1).splitlines()[-1].startswith("play")
+
+    assert table.replace(parse_status_payload({"phases": {"play": "complete"}}))
+    assert list(table.phases) == ["play"] and +table.counts == {"complete": 1}
+
+
+def test_poller_uses_etags():
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests_seen.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps([{"phaseId": "setup", "status": "running"}]).encode()
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+    poller = StatusPoller(f"http://127.0.0.1:{httpd.server_port}")
+    try:
+        assert poller.poll() == [{"phaseId": "setup", "status": "running"}]
+        assert poller.poll() is None
+    finally:
+        poller.close()
+        httpd.shutdown()
+        httpd.server_close()
+    assert requests_seen == [None, '"v1"']
+
+
+def test_follow_nats_coalesces_bursts():
+    async def main():
+        broker = InProcessBroker()
+        draws = []
+        async with NATSConnector(open_connection=broker.open_connection) as runtime, \
+                NATSConnector(open_connection=broker.open_connection) as watcher:
+            async def reply_state(msg):
+                await runtime.publish(msg.reply, [{"phaseId": "preflight", "status": "complete"}])
+
+            await runtime.subscribe("plan.session.ttt.get_state", reply_state)
+            await runtime.flush()
+
+            table = PhaseStatusTable()
+            task = asyncio.ensure_future(follow(
+                lambda t, changed: follow_nats(watcher, "ttt", t, changed),
+                table, lambda t: draws.append(t.version), max_rate=5))
+            while not draws:
+                await asyncio.sleep(0.01)
+
+            for i in range(1000):
+                await runtime.publish("plan.session.ttt.state", {"phaseId": f"p{i}", "status": "running"})
+            await runtime.publish("plan.session.ttt.events", {"phaseId": "p0", "event": "fail"})
+            await runtime.flush()
+            while table.counts["failed"] != 1:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.3)
+            task.cancel()
+
+            assert len(table.phases) == 1001
+            # 1000 updates, but only a handful of redraws
+            assert 2 <= len(draws) <= 4
+        await broker.close()
+
+    asyncio.run(asyncio.wait_for(main(), 10))
+
+
+def test_follow_nats_marks_a_missing_snapshot():
+    async def main():
+        broker = InProcessBroker()
+        draws = []
+        async with NATSConnector(open_connection=broker.open_connection) as watcher:
+            table = PhaseStatusTable()
+            task = asyncio.ensure_future(follow(
+                lambda t, changed: follow_nats(watcher, "nobody", t, changed, snapshot_timeout=0.05),
+                table, lambda t: draws.append(t.render(rows=0))))
+            while not draws:
+                await asyncio.sleep(0.01)
+            task.cancel()
+        await broker.close()
+        assert draws == ["0 phase(s) [no snapshot: get_state timed out after 0.05s]"]
+
+    asyncio.run(asyncio.wait_for(main(), 10))
+
+
+def test_follow_nats_ignores_malformed_messages():
+    async def main():
+        broker = InProcessBroker()
+        async with NATSConnector(open_connection=broker.open_connection) as runtime, \
+                NATSConnector(open_connection=broker.open_connection) as watcher:
+            table = PhaseStatusTable()
+            task = asyncio.ensure_future(follow_nats(watcher, "ttt", table, asyncio.Event(),
+                                                     snapshot_timeout=0.01))
+            while table.note is None:
+                await asyncio.sleep(0.01)
+            for payload in (b"not json", b"[1, 2]", b'{"phaseId": "a", "status": "running"}'):
+                await runtime.publish("plan.session.ttt.state", payload)
+            await runtime.publish("plan.session.ttt.events", b"\xff")
+            await runtime.flush()
+            while "a" not in table.phases or table.malformed < 3:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            assert table.malformed == 3
+            assert "[3 malformed message(s) ignored]" in table.render(rows=0)
+        await broker.close()
+
+    asyncio.run(asyncio.wait_for(main(), 10))
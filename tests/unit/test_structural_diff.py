@@ -0,0 +1,78 @@
+from janet.phase_resource import PhaseResource
+from janet.plan_transformer import PlanTransformer
+from janet.structural_diff import content_hash, diff_patch
+
+
+def test_content_hash_ignores_key_order_but_not_values():
+    assert content_hash({"a": 1, "b": [1, {"c": 2}]}) == content_hash({"b": [1, {"c": 2}], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": "1"})
+    assert content_hash([1, 2]) != content_hash([2, 1])
+
+
+def test_diff_patch_reports_changed_fields_only():
+    old = {"retry": {"maxAttempts": "3"}, "labels": {"a/b": "x"}, "steps": [1, 2, 3], "gone": True}
+    new = {"retry": {"maxAttempts": "5"}, "labels": {"a/b": "x"}, "steps": [1, 9], "added": {"k": "v"}}
+    ops = {(op["op"], op["path"]) for op in diff_patch(old, new)}
+    assert ops == {
+        ("replace", "/retry/maxAttempts"),
+        ("replace", "/steps/1"),
+        ("remove", "/steps/2"),
+        ("remove", "/gone"),
+        ("add", "/added"),
+    }
+    assert diff_patch({"a~b/c": 1}, {"a~b/c": 2})[0]["path"] == "/a~0b~1c"
+
+
+def test_plan_diff_uses_stored_hashes_and_describes_patches():
+    stored = [
+        PhaseResource({"name": "same", "retry": {"maxAttempts": "1"}}),
+        PhaseResource({"name": "changed", "waitFor": {"timeout": "1s"}}),
+        PhaseResource({"name": "removed"}),
+    ]
+    state = [PhaseResource.from_state(r.to_state()) for r in stored]
+    desired = [
+        PhaseResource({"name": "same", "retry": {"maxAttempts": "1"}}),
+        PhaseResource({"name": "changed", "waitFor": {"timeout": "2s"}}),
+        PhaseResource({"name": "new"}),
+    ]
+    transformer = PlanTransformer(desired, state, [])
+    plan = transformer.diff_against_state()
+    assert [r.id for r in plan["add"]] == ["new"]
+    assert [c.id for c, _ in plan["update"]] == ["changed"]
+    assert [r.id for r in plan["delete"]] == ["removed"]
+    assert transformer.describe(plan).splitlines() == [
+        "+ Phase/new",
+        "~ Phase/changed",
+        '    ~ /waitFor/timeout: "1s" -> "2s"',
+        "- Phase/removed",
+    ]
+
+
+def test_root_hash_matches_tree():
+    import hashlib
+    from janet.structural_diff import merkle_tree
+    value = {"a": [1, 1.0, True, None, "1"], "b": {"c": {"d": []}}}
+    assert hashlib.blake2b(merkle_tree(value)[0], digest_size=16).hexdigest() == content_hash(value)
+    assert len({content_hash(v) for v in (1, 1.0, True, "1", None)}) == 3
+
+
+def test_numbers_that_compare_equal_are_not_changes():
+    assert content_hash({"timeout": 1, "on": True}) == content_hash({"timeout": 1.0, "on": 1})
+    assert content_hash({"timeout": 1}) != content_hash({"timeout": 1.5})
+    assert content_hash({1: "x"}) != content_hash({"1": "x"})
+    assert diff_patch({"retry": {"timeout": 1}}, {"retry": {"timeout": 1.0}}) == []
+
+    stored = [PhaseResource({"name": "a", "waitFor": {"timeout": 1}})]
+    desired = [PhaseResource({"name": "a", "waitFor": {"timeout": 1.0}})]
+    assert PlanTransformer(desired, stored, []).diff_against_state()["update"] == []
+
+
+def test_duplicate_desired_resources_are_deduplicated():
+    desired = [PhaseResource({"name": "a", "description": "first"}),
+               PhaseResource({"name": "new"}),
+               PhaseResource({"name": "a", "description": "last"}),
+               PhaseResource({"name": "new"})]
+    stored = [PhaseResource({"name": "a", "description": "first"})]
+    plan = PlanTransformer(desired, stored, []).diff_against_state()
+    assert [r.id for r in plan["add"]] == ["new"]
+    assert [(c.id, d.spec["description"]) for c, d in plan["update"]] == [("a", "last")]
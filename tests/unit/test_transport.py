@@ -0,0 +1,128 @@
+import gzip
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from janet.transport import (EXIT_CONFLICT, EXIT_ERROR, EXIT_OK, EXIT_REJECTED, EXIT_UNREACHABLE,
+                             PMPTransport, parse_retry_after)
+
+
+class ScriptedServer:
+    """Local PMP stand-in answering with a scripted list of (status, headers)."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                server.requests.append((self.path, dict(self.headers), json.loads(body)))
+                status, headers = server.responses.pop(0)
+                payload = b"ok"
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.endpoint = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.01,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+def test_retries_honour_retry_after(sleeps):
+    server = ScriptedServer([(503, {"Retry-After": "2"}), (409, {}), (200, {})])
+    try:
+        with PMPTransport(sleep=sleeps.append, backoff_base=0.01) as transport:
+            result = transport.submit(server.endpoint, [{"Kind": "Phase", "Id": "setup"}])
+    finally:
+        server.close()
+    assert result.exit_code == EXIT_OK
+    assert result.attempts == 3
+    assert sleeps[0] == 2
+    assert 0 <= sleeps[1] <= 0.02
+    path, headers, body = server.requests[0]
+    assert path == "/plan"
+    assert headers["Content-Type"] == "application/vnd.phase-manifest+json"
+    assert body == [{"Kind": "Phase", "Id": "setup"}]
+
+
+def test_client_errors_are_not_retried(sleeps):
+    server = ScriptedServer([(400, {})])
+    try:
+        result = PMPTransport(sleep=sleeps.append).submit(server.endpoint, [])
+    finally:
+        server.close()
+    assert result.exit_code == EXIT_REJECTED
+    assert result.attempts == 1
+    assert sleeps == []
+
+
+def test_conflict_exit_code_after_retries_exhausted(sleeps):
+    server = ScriptedServer([(409, {})] * 2)
+    try:
+        result = PMPTransport(max_retries=1, sleep=sleeps.append).submit(server.endpoint, [])
+    finally:
+        server.close()
+    assert result.exit_code == EXIT_CONFLICT
+    assert result.attempts == 2
+
+
+def test_large_manifests_are_gzipped(sleeps):
+    manifest = [{"Kind": "Phase", "Id": f"phase-{i}", "Spec": {"description": "x" * 100}} for i in range(200)]
+    server = ScriptedServer([(200, {})])
+    try:
+        result = PMPTransport(gzip_min_bytes=1024, sleep=sleeps.append).submit(server.endpoint, manifest)
+    finally:
+        server.close()
+    assert result.success
+    _, headers, body = server.requests[0]
+    assert headers["Content-Encoding"] == "gzip"
+    assert body == manifest
+
+
+def test_unreachable_server(sleeps):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    result = PMPTransport(max_retries=2, connect_timeout=0.5, sleep=sleeps.append).submit(
+        f"http://127.0.0.1:{port}", [])
+    assert result.exit_code == EXIT_UNREACHABLE
+    assert result.attempts == 3
+    assert len(sleeps) == 2
+
+
+def test_malformed_url_is_an_error_not_a_traceback(sleeps):
+    result = PMPTransport(sleep=sleeps.append).submit("localhost:3030", [])
+    assert result.exit_code == EXIT_ERROR
+    assert result.attempts == 1 and sleeps == []
+    assert "localhost:3030/plan" in str(result.error)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None